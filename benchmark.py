@@ -0,0 +1,51 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import logging
+import logging.config
+import time
+
+from ts2g.ts2gbenchmark import TS2GBENCHMARK
+from ts2g.ts2gbenchmarkconfig import TS2GBenchmarkConfig
+
+# Script to measure the conversion of a generated Subversion repository
+if __name__ == "__main__":
+    BENCHMARK_CONFIG = TS2GBenchmarkConfig("benchmark.json")
+    BENCHMARK_CONFIG.save()
+
+    # Setup logging for dealing with UTF-8, unfortunately not available for basicConfig
+    LOGGER_SETUP = logging.getLogger()
+    LOGGER_SETUP.setLevel(BENCHMARK_CONFIG.value_get("LOGGING", "loglevel").upper())
+    LOGGER_HANDLER = logging.FileHandler(BENCHMARK_CONFIG.value_get("LOGGING", "logfile"), "w", "utf-8")
+    LOGGER_HANDLER.setFormatter(logging.Formatter(BENCHMARK_CONFIG.value_get("LOGGING", "logstring")))
+    LOGGER_SETUP.addHandler(LOGGER_HANDLER)
+
+    process_start: float = time.time()
+    benchmark = TS2GBENCHMARK(BENCHMARK_CONFIG)
+    status = benchmark.process()
+    process_end: float = time.time()
+    process_duration: float = process_end - process_start
+    logging.info(f"benchmark result is [{status}] after [{process_duration:.2f}] seconds")
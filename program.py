@@ -31,18 +31,18 @@ import time
 from ts2g.ts2g import TS2G
 from ts2g.ts2gconfig import TS2GConfig
 
-TS2G_CONFIG = TS2GConfig("program.json")
-TS2G_CONFIG.save()
-
-# Setup logging for dealing with UTF-8, unfortunately not available for basicConfig
-LOGGER_SETUP = logging.getLogger()
-LOGGER_SETUP.setLevel(TS2G_CONFIG.value_get("LOGGING", "loglevel").upper())
-LOGGER_HANDLER = logging.FileHandler(TS2G_CONFIG.value_get("LOGGING", "logfile"), "w", "utf-8")
-LOGGER_HANDLER.setFormatter(logging.Formatter(TS2G_CONFIG.value_get("LOGGING", "logstring")))
-LOGGER_SETUP.addHandler(LOGGER_HANDLER)
-
 # Script to convert a Subversion repository to a git repository
 if __name__ == "__main__":
+    TS2G_CONFIG = TS2GConfig("program.json")
+    TS2G_CONFIG.save()
+
+    # Setup logging for dealing with UTF-8, unfortunately not available for basicConfig
+    LOGGER_SETUP = logging.getLogger()
+    LOGGER_SETUP.setLevel(TS2G_CONFIG.value_get("LOGGING", "loglevel").upper())
+    LOGGER_HANDLER = logging.FileHandler(TS2G_CONFIG.value_get("LOGGING", "logfile"), "w", "utf-8")
+    LOGGER_HANDLER.setFormatter(logging.Formatter(TS2G_CONFIG.value_get("LOGGING", "logstring")))
+    LOGGER_SETUP.addHandler(LOGGER_HANDLER)
+
     process_start: float = time.time()
     logging.info("debugFlag is set to [%s]", "{}".format(TS2G_CONFIG.value_get("LOGGING", "loglevel").upper()))
     converter = TS2G(TS2G_CONFIG)
@@ -0,0 +1,56 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import argparse
+import sys
+
+from ts2g.ts2grevmap import TS2GREVMAP
+
+# Script to look up the git commit of SVN revisions and the SVN revision of git commits
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Look up SVN revisions and git commits in the rev-map <project>.revmap of the workspace")
+    parser.add_argument("revmap", help="rev-map file, e.g. workspace/project.revmap")
+    parser.add_argument("queries", nargs="+", help="SVN revisions like 123 or r123, git SHAs with at least 4 hex digits")
+    parser.add_argument("--sha", action="store_true", help="treat all queries as SHAs, e.g. SHAs consisting of digits only")
+    parser.add_argument("--nearest", action="store_true", help="use the latest converted revision at or before a revision not converted")
+    arguments = parser.parse_args()
+
+    revmap = TS2GREVMAP(arguments.revmap)
+    missing: int = 0
+    for query in arguments.queries:
+        revision: str = query[1:] if query.lower().startswith("r") else query
+        if not arguments.sha and revision.isdigit() and len(query) < 40:
+            result = revmap.sha(int(revision), not arguments.nearest)
+            if None != result:
+                print("r{} {}".format(revision, result))
+        else:
+            result = revmap.revision(query)
+            if None != result:
+                print("r{} {}".format(result, query))
+        if None == result:
+            print("{} not found".format(query), file=sys.stderr)
+            missing += 1
+    sys.exit(1 if 0 < missing else 0)
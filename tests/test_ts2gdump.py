@@ -0,0 +1,98 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import git
+
+from ts2g.ts2g import TS2G
+from ts2g.ts2gbenchmarkrepo import TS2GBENCHMARKREPO
+from ts2g.ts2gconfig import TS2GConfig
+
+
+@unittest.skipIf(None == shutil.which("svnadmin") or None == shutil.which("svn"), "svn and svnadmin are not installed")
+class TestTS2GDUMP(unittest.TestCase):
+    """
+    Round trip tests comparing the dump engine with the checkout engine on a local repository
+    """
+
+    PARAMETERS: dict = {"binary_ratio": 0.2, "churn": 3, "depth": 2, "files": 60, "file_size": 256, "renames": 3, "revisions": 20, "seed": 1}
+
+    def setUp(self: object) -> None:
+        """Create repository with the generator of the benchmark"""
+        self.folder: str = tempfile.mkdtemp(prefix="ts2g-test-")
+        self.url: str = TS2GBENCHMARKREPO(self.folder, self.PARAMETERS).create()
+        self.assertTrue(self.url)
+
+    def tearDown(self: object) -> None:
+        """Remove repository and workspaces"""
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def convert(self: object, url: str, engine: str) -> str:
+        """Convert URL with an engine
+
+        Args:
+            url (str): URL to convert
+            engine (str): Name of engine
+
+        Returns:
+            str: SHA of tree of HEAD
+        """
+        workspace: str = os.path.join(self.folder, "run_{}_{}".format(engine, len(os.listdir(self.folder))))
+        configFile: str = workspace + ".json"
+        TS2GConfig(configFile).save()
+        with open(configFile, "r", encoding="utf-8") as configIn:
+            options: dict = json.load(configIn)
+        options["GIT"]["project"] = "roundtrip"
+        options["SVN"]["repositoryurl"] = url
+        options["SVN"]["usermap"] = ["{0} = {0}@example.com".format(author) for author in TS2GBENCHMARKREPO.AUTHORS]
+        options["TS2G"]["engine"] = engine
+        options["TS2G"]["workspace"] = workspace
+        with open(configFile, "w", encoding="utf-8") as configOut:
+            json.dump(options, configOut, indent=4)
+        converter: TS2G = TS2G(TS2GConfig(configFile))
+        self.assertTrue(converter.process())
+        repo: git.Repo = git.Repo(converter.githandler.projectFolder)
+        tree: str = repo.head.commit.tree.hexsha
+        repo.close()
+        return tree
+
+    def testRoundTrip(self: object) -> None:
+        """Both engines produce the same tree"""
+        self.assertEqual(self.convert(self.url, "checkout"), self.convert(self.url, "dump"))
+
+    def testRoundTripSubfolder(self: object) -> None:
+        """Files renamed into a subfolder are copied from outside of the converted path"""
+        url: str = self.url + "/dir0"
+        self.assertEqual(self.convert(url, "checkout"), self.convert(url, "dump"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import unittest
+
+from ts2g.ts2gfastimport import TS2GFASTIMPORT
+
+
+class TestTS2GFASTIMPORT(unittest.TestCase):
+    """
+    Tests of the commands written to git fast-import
+    """
+
+    def setUp(self: object) -> None:
+        """Create instance without a running git fast-import"""
+        self.fastimport: TS2GFASTIMPORT = TS2GFASTIMPORT(".git", None)
+
+    def testQuotePathPlain(self: object) -> None:
+        """Paths are always quoted, also with spaces and non-ASCII names"""
+        self.assertEqual('"a b/c.txt"', self.fastimport.quotePath("a b/c.txt"))
+        self.assertEqual('"ä/ö.txt"', self.fastimport.quotePath("ä/ö.txt"))
+
+    def testQuotePathSpecial(self: object) -> None:
+        """Quotes, backslashes and newlines are escaped in C style"""
+        self.assertEqual('"say \\"hi\\".txt"', self.fastimport.quotePath('say "hi".txt'))
+        self.assertEqual('"back\\\\slash"', self.fastimport.quotePath("back\\slash"))
+        self.assertEqual('"line\\nbreak"', self.fastimport.quotePath("line\nbreak"))
+
+    def testFileCommands(self: object) -> None:
+        """File commands contain the quoted path"""
+        self.assertEqual(b'M 100644 :1 "a b"\n', self.fastimport.fileModify("100644", ":1", "a b"))
+        self.assertEqual(b'D "a b"\n', self.fastimport.fileDelete("a b"))
+
+
+if __name__ == "__main__":
+    unittest.main()
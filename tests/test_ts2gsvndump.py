@@ -0,0 +1,241 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import io
+import unittest
+import zlib
+
+from ts2g.ts2gsvndump import TS2GSVNDUMP, svndiffApply, svndiffApplyStream
+
+
+def compress(section: bytes) -> bytes:
+    """Encode section of svndiff version 1, it is compressed only if that saves space
+
+    Args:
+        section (bytes): Plain section
+
+    Returns:
+        bytes: Encoded section
+    """
+    compressed: bytes = zlib.compress(section)
+    return number(len(section)) + (compressed if len(compressed) < len(section) else section)
+
+
+def number(value: int) -> bytes:
+    """Encode variable length integer of svndiff format
+
+    Args:
+        value (int): Number to encode
+
+    Returns:
+        bytes: Encoded number
+    """
+    encoded: list[int] = [value & 0x7F]
+    value >>= 7
+    while value:
+        encoded.append(0x80 | (value & 0x7F))
+        value >>= 7
+    return bytes(reversed(encoded))
+
+
+def window(sourceOffset: int, sourceLength: int, targetLength: int, instructions: bytes, newData: bytes, version: int = 0) -> bytes:
+    """Encode one svndiff window
+
+    Args:
+        sourceOffset (int): Offset of source view
+        sourceLength (int): Length of source view
+        targetLength (int): Length of target of window
+        instructions (bytes): Plain instruction section
+        newData (bytes): Plain new data section
+        version (int, optional): svndiff version, 1 compresses the sections. Defaults to 0.
+
+    Returns:
+        bytes: Encoded window
+    """
+    if 1 == version:
+        instructions = compress(instructions)
+        newData = compress(newData)
+    return number(sourceOffset) + number(sourceLength) + number(targetLength) + number(len(instructions)) + number(len(newData)) + instructions + newData
+
+
+def node(headers: str, properties: bytes = b"", text: bytes = None) -> bytes:
+    """Encode node record of dump stream
+
+    Args:
+        headers (str): Header lines without content lengths
+        properties (bytes, optional): Property block. Defaults to b"".
+        text (bytes, optional): Text content, None if there is none. Defaults to None.
+
+    Returns:
+        bytes: Encoded record
+    """
+    lengths: str = ""
+    if properties:
+        lengths += "Prop-content-length: {}\n".format(len(properties))
+    if None != text:
+        lengths += "Text-content-length: {}\n".format(len(text))
+    body: bytes = properties + (b"" if None == text else text)
+    if body:
+        lengths += "Content-length: {}\n".format(len(body))
+    return (headers + lengths + "\n").encode("utf-8") + body + b"\n\n"
+
+
+class TestSvndiffApply(unittest.TestCase):
+    """
+    Tests of applying svndiff deltas
+    """
+
+    def testEmptyDelta(self: object) -> None:
+        """Empty delta keeps the source"""
+        self.assertEqual(b"source", svndiffApply(b"", b"source"))
+
+    def testSourceCopyAndNewData(self: object) -> None:
+        """Copy from source view and new data are combined"""
+        # Copy 5 bytes at offset 0 of the view, then 4 bytes of new data
+        instructions: bytes = bytes([0x00 | 5]) + number(0) + bytes([0x80 | 4])
+        delta: bytes = b"SVN\0" + window(6, 5, 9, instructions, b" new")
+        self.assertEqual(b"world new", svndiffApply(delta, b"hello world"))
+
+    def testTargetCopyOverlapping(self: object) -> None:
+        """Copy from target may read the bytes it writes itself"""
+        instructions: bytes = bytes([0x80 | 2, 0x40 | 6]) + number(0)
+        delta: bytes = b"SVN\0" + window(0, 0, 8, instructions, b"ab")
+        self.assertEqual(b"abababab", svndiffApply(delta, b""))
+
+    def testSeveralWindows(self: object) -> None:
+        """Windows are appended, each with its own source view"""
+        first: bytes = window(0, 3, 3, bytes([0x00 | 3]) + number(0), b"")
+        second: bytes = window(3, 3, 4, bytes([0x00 | 3]) + number(0) + bytes([0x80 | 1]), b"!")
+        self.assertEqual(b"abcdef!", svndiffApply(b"SVN\0" + first + second, b"abcdef"))
+
+    def testLongInstructionLength(self: object) -> None:
+        """Length 0 in the instruction byte is followed by the length as number"""
+        data: bytes = b"x" * 100
+        instructions: bytes = bytes([0x80]) + number(len(data))
+        self.assertEqual(data, svndiffApply(b"SVN\0" + window(0, 0, len(data), instructions, data), b""))
+
+    def testCompressedSections(self: object) -> None:
+        """Sections of version 1 are compressed if that saves space, the short instructions are not"""
+        data: bytes = b"compressed " * 20
+        instructions: bytes = bytes([0x80]) + number(len(data))
+        self.assertEqual(data, svndiffApply(b"SVN\1" + window(0, 0, len(data), instructions, data, 1), b""))
+
+    def testUnsupportedFormat(self: object) -> None:
+        """Unknown svndiff versions are rejected"""
+        with self.assertRaises(ValueError):
+            svndiffApply(b"SVN\2", b"")
+
+    def testLengthMismatch(self: object) -> None:
+        """Window producing a different length than announced is rejected"""
+        with self.assertRaises(ValueError):
+            svndiffApply(b"SVN\0" + window(0, 0, 5, bytes([0x80 | 2]), b"ab"), b"")
+
+
+class TestTS2GSVNDUMP(unittest.TestCase):
+    """
+    Tests of reading records of a dump stream
+    """
+
+    def records(self: object, stream: bytes) -> list:
+        """Read all records of a dump stream, text content is left unread
+
+        Args:
+            stream (bytes): Dump stream
+
+        Returns:
+            list: Records of stream
+        """
+        return list(TS2GSVNDUMP(io.BytesIO(stream)).records())
+
+    def testPropertyDelta(self: object) -> None:
+        """Property delta contains properties set and deleted"""
+        properties: bytes = b"K 14\nsvn:executable\nV 1\n*\nD 13\nsvn:mime-type\nPROPS-END\n"
+        records = self.records(node("Node-path: trunk/run.sh\nNode-kind: file\nNode-action: change\nProp-delta: true\n", properties))
+        self.assertEqual(1, len(records))
+        self.assertTrue(records[0].isPropertyDelta())
+        self.assertEqual({"svn:executable": "*"}, records[0].properties)
+        self.assertEqual(["svn:mime-type"], records[0].propertiesDeleted)
+        self.assertEqual(-1, records[0].textLength)
+
+    def testPropertyValueWithNewline(self: object) -> None:
+        """Values are read by length, so they may contain newlines"""
+        properties: bytes = b"K 7\nsvn:log\nV 11\nline\nline 2\nPROPS-END\n"
+        records = self.records(node("Revision-number: 1\n", properties))
+        self.assertEqual("1", records[0].header("Revision-number"))
+        self.assertEqual({"svn:log": "line\nline 2"}, records[0].properties)
+
+    def testCopiedDirectory(self: object) -> None:
+        """Copied folder without content has headers only"""
+        stream: bytes = node("Node-path: trunk/copy\nNode-kind: dir\nNode-action: add\nNode-copyfrom-rev: 3\nNode-copyfrom-path: trunk/sub\n")
+        stream += node("Node-path: trunk/copy/x\nNode-kind: file\nNode-action: delete\n")
+        records = self.records(stream)
+        self.assertEqual(2, len(records))
+        self.assertEqual("trunk/sub", records[0].header("Node-copyfrom-path"))
+        self.assertEqual("3", records[0].header("Node-copyfrom-rev"))
+        self.assertIsNone(records[0].properties)
+        self.assertEqual(-1, records[0].textLength)
+        self.assertEqual("delete", records[1].header("Node-action"))
+
+    def testTextContent(self: object) -> None:
+        """Text is read in chunks, unread text is skipped"""
+        stream: bytes = node("Node-path: a\nNode-kind: file\nNode-action: add\n", b"PROPS-END\n", b"0123456789")
+        stream += node("Node-path: b\nNode-kind: file\nNode-action: add\nText-delta: true\n", text=b"skipped")
+        stream += node("Node-path: c\nNode-kind: file\nNode-action: add\n", text=b"last")
+        dump: TS2GSVNDUMP = TS2GSVNDUMP(io.BytesIO(stream))
+        dump.CHUNK_SIZE = 4
+        records = dump.records()
+        record = next(records)
+        self.assertEqual({}, record.properties)
+        self.assertEqual([b"0123", b"4567", b"89"], list(dump.readTextChunks()))
+        record = next(records)
+        self.assertTrue(record.isTextDelta())
+        record = next(records)
+        self.assertEqual("c", record.header("Node-path"))
+        self.assertEqual(b"last", dump.readText())
+        self.assertEqual([], list(records))
+
+    def testDeltaStreamed(self: object) -> None:
+        """Delta is applied while it is read from the dump stream"""
+        instructions: bytes = bytes([0x00 | 5]) + number(0) + bytes([0x80 | 1])
+        delta: bytes = b"SVN\0" + window(0, 5, 6, instructions, b"!") + window(5, 6, 6, bytes([0x00 | 6]) + number(0), b"")
+        stream: bytes = node("Node-path: a\nNode-kind: file\nNode-action: change\nText-delta: true\n", text=delta)
+        stream += node("Node-path: b\nNode-kind: file\nNode-action: delete\n")
+        dump: TS2GSVNDUMP = TS2GSVNDUMP(io.BytesIO(stream))
+        records = dump.records()
+        record = next(records)
+        target: io.BytesIO = io.BytesIO()
+        self.assertEqual(12, svndiffApplyStream(dump.readTextPart, record.textLength, io.BytesIO(b"hello world!"), target))
+        self.assertEqual(b"hello! world", target.getvalue())
+        self.assertEqual("b", next(records).header("Node-path"))
+
+    def testTruncatedStream(self: object) -> None:
+        """Missing bytes of a record are reported"""
+        with self.assertRaises(EOFError):
+            self.records(node("Node-path: a\nNode-kind: file\nNode-action: add\n", text=b"content")[:-6])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -24,16 +24,28 @@ SOFTWARE.
 ******************************************************************************
 """
 
+import array
 import logging
+import multiprocessing
 import os
-import dirsync
+import queue
+import threading
 import time
 
 from ts2g.ts2gconfig import TS2GConfig
+from ts2g.ts2gdump import TS2GDUMP
+from ts2g.ts2gexternals import TS2GEXTERNALS
+from ts2g.ts2gfilter import TS2GFILTER
 from ts2g.ts2ggit import TS2GGIT
+from ts2g.ts2gjournal import TS2GJOURNAL
+from ts2g.ts2gmetrics import TS2GMETRICS
 from ts2g.ts2gos import TS2GOS
+from ts2g.ts2gplan import TS2GPLAN
+from ts2g.ts2grevmap import TS2GREVMAP
 from ts2g.ts2gsvn import TS2GSVN
+from ts2g.ts2gsvnchange import TS2GSVNchange
 from ts2g.ts2gsvninfo import TS2GSVNinfo
+from ts2g.ts2gsync import TS2GSYNC
 
 
 class TS2G:
@@ -41,120 +53,808 @@ class TS2G:
     Class to control the process of the repository transformation
     """
 
-    def __init__(self: object, config: TS2GConfig) -> None:
+    def __init__(self: object, config: TS2GConfig, segment: str = None) -> None:
         """Default constructor
 
         Args:
             config (TS2GConfig): Config settings
+            segment (str, optional): Name of segment, its folders are placed below the segments folder of the workspace and of each role. Defaults to None.
         """
         self.config: TS2GConfig = config
-        self.oshandler: TS2GOS = TS2GOS(self.config.value_get("TS2G", "workspace"))
-        self.githandler: TS2GGIT = TS2GGIT(self.config, self.oshandler)
+        nested: str = ""
+        if None != segment:
+            nested = os.path.join("segments_" + self.config.value_get("GIT", "project"), segment)
+        roles: dict[str, str] = {role: self.config.value_get("TS2G", "workspace_" + role) for role in TS2GOS.ROLES}
+        self.oshandler: TS2GOS = TS2GOS(self.config.value_get("TS2G", "workspace"), roles, nested)
+        self.metrics: TS2GMETRICS = TS2GMETRICS(self.oshandler, self.config.value_get("GIT", "project"))
+        self.githandler: TS2GGIT = TS2GGIT(self.config, self.oshandler, self.metrics)
         self.svnhandler: TS2GSVN = TS2GSVN(self.config, self.oshandler)
+        self.pathfilter: TS2GFILTER = self.svnhandler.pathfilter
+        self.externals: TS2GEXTERNALS = TS2GEXTERNALS(self.config, self.oshandler, self.svnhandler)
+        self.journal: TS2GJOURNAL = TS2GJOURNAL(self.oshandler, self.githandler.gitRepositoryName())
+        self.revmap: TS2GREVMAP = TS2GREVMAP(self.oshandler.workspaceFolderGet(self.githandler.gitRepositoryName() + ".revmap"))
+        self.plan: bool = self.config.flag_get("TS2G", "plan")
+        self.planCalibration: int = int(self.config.value_get("TS2G", "plan_calibration"))
+        self.resume: bool = self.config.flag_get("TS2G", "resume")
+        self.mirror: bool = self.config.flag_get("TS2G", "mirror")
+        self.mirrorInterval: int = int(self.config.value_get("TS2G", "mirror_interval"))
+        self.continued: bool = False
+        self.pipelineDepth: int = int(self.config.value_get("TS2G", "pipeline_depth"))
+        self.segments: int = int(self.config.value_get("TS2G", "segments"))
+        if 1 < self.segments and self.externals.isActive():
+            logging.warning("Externals recorded as submodules require one segment, [segments] is ignored")
+            self.segments = 1
+        self.syncChanged: bool = "changed" == self.config.value_get("TS2G", "sync_mode").lower()
+        self.syncVerify: bool = self.config.flag_get("TS2G", "sync_verify")
+        self.workspaceMinFree: int = int(self.config.value_get("TS2G", "workspace_min_free"))
+        self.syncHardlink: bool = self.config.flag_get("TS2G", "sync_hardlink")
+        self.synchandler: TS2GSYNC = TS2GSYNC(self.oshandler, self.oshandler.workspaceFolderGet(self.githandler.gitRepositoryName() + ".syncindex.json"), self.syncHardlink)
+        self.svnhandler.planLoad(self.oshandler.workspaceFolderGet(self.githandler.gitRepositoryName() + ".plan.xml"))
         logging.debug("config [%s]", self.config)
 
-    def addRevisionToGit(self: object, repoNameGit: str, repoNameSvn: str, commitInfo: TS2GSVNinfo):
+    def addRevisionToGit(self: object, repoNameGit: str, repoNameSvn: str, commitInfo: TS2GSVNinfo, fullSync: bool = False) -> bool:
         """Sync SVN directory to GIT directory, do a "git add . && git commit -m "..." " on GIT directory
 
         Args:
             repoNameGit (str): Folder name of GIT destination directory
             repoNameSvn (str): Folder name of SVN source directory
             commitInfo (TS2GSVNinfo): SVN Commit info object
+            fullSync (bool, optional): Sync complete tree instead of changed paths only. Defaults to False.
+
+        Returns:
+            bool: False if the commit failed, otherwise True
         """
         # Create source and destination names for sync
         folder_src: str = self.oshandler.workspaceFolderGet(repoNameSvn)
-        folder_dst: str = self.oshandler.workspaceFolderGet(repoNameGit)
+        folder_dst: str = self.oshandler.workspaceRoleGet("worktree", repoNameGit)
 
-        # Move .git folder outside of repo
-        process_git_ext_start: float = time.time()
-        self.githandler.gitSpecialFolderBackup(repoNameGit)
-        process_git_ext_end: float = time.time()
-        process_git_ext_duration: float = process_git_ext_end - process_git_ext_start
-        logging.info(f"Save special dir [{self.githandler.FOLDER_GIT}] took [{process_git_ext_duration:.2f}] seconds")
+        # Move .git folder outside of repo, not required if it is located outside anyway
+        if not self.githandler.separateGitDir:
+            process_git_ext_start: float = time.time()
+            self.githandler.gitSpecialFolderBackup(repoNameGit)
+            process_git_ext_end: float = time.time()
+            process_git_ext_duration: float = process_git_ext_end - process_git_ext_start
+            logging.info(f"Save special dir [{self.githandler.FOLDER_GIT}] took [{process_git_ext_duration:.2f}] seconds")
+            self.metrics.record(commitInfo.revision, "git_backup", process_git_ext_duration)
 
         # Sync folders
         process_sync_start: float = time.time()
-        dirsync.sync(folder_src, folder_dst, "sync", verbose=False, exclude=[self.svnhandler.FOLDER_SVN], purge=True)
+        changedpaths: list[TS2GSVNchange] = None
+        if self.syncChanged and not fullSync:
+            changedpaths = commitInfo.changedpaths
+        if not self.syncChangedPaths(folder_src, folder_dst, changedpaths, commitInfo.revision) or self.syncVerify:
+            changedpaths = None
+            size: int = self.synchandler.sync(folder_src, folder_dst, [self.svnhandler.FOLDER_SVN, self.githandler.FOLDER_GIT], self.pathSkip(folder_src))
+            self.metrics.addBytes(commitInfo.revision, size)
         process_sync_stop: float = time.time()
         process_sync_duration: float = process_sync_stop - process_sync_start
         logging.info(f"Sync revision data took [{process_sync_duration:.2f}] seconds")
+        self.metrics.record(commitInfo.revision, "sync", process_sync_duration)
 
         # Move .git folder back to repo
-        process_git_int_start: float = time.time()
-        self.githandler.gitSpecialFolderRestore(repoNameGit)
-        process_git_int_end: float = time.time()
-        process_git_int_duration: float = process_git_int_end - process_git_int_start
-        logging.info(f"Restore special dir [{self.githandler.FOLDER_GIT}] took [{process_git_int_duration:.2f}] seconds")
+        if not self.githandler.separateGitDir:
+            process_git_int_start: float = time.time()
+            self.githandler.gitSpecialFolderRestore(repoNameGit)
+            process_git_int_end: float = time.time()
+            process_git_int_duration: float = process_git_int_end - process_git_int_start
+            logging.info(f"Restore special dir [{self.githandler.FOLDER_GIT}] took [{process_git_int_duration:.2f}] seconds")
+            self.metrics.record(commitInfo.revision, "git_restore", process_git_int_duration)
 
         # Do git add . and git commit -m message
         process_git_start: float = time.time()
-        self.githandler.gitRepositoryAdd(commitInfo)
+        result: bool = self.githandler.gitRepositoryAdd(commitInfo, changedpaths)
         process_git_end: float = time.time()
         process_git_duration: float = process_git_end - process_git_start
         logging.info(f"Add and commit to git took [{process_git_duration:.2f}] seconds")
+        return result
+
+    def commitRevision(self: object, repoNameGit: str, folder_src: str, commitInfo: TS2GSVNinfo, fullSync: bool) -> bool:
+        """Add revision to git and record it in the journal
+
+        A revision changing filtered paths only creates no commit, also if it is the
+        first one. So the first revision of a segment gives the same history as the
+        conversion of the whole range, the complete tree is synced with the next one.
+        A failed commit is raised, the journal keeps the previous revision for a resume.
+
+        Args:
+            repoNameGit (str): Folder name of GIT destination directory
+            folder_src (str): Folder containing the content of the revision
+            commitInfo (TS2GSVNinfo): SVN Commit info object
+            fullSync (bool): Sync complete tree instead of changed paths only
+
+        Returns:
+            bool: False if the revision changes filtered paths only, otherwise True
+        """
+        process_git_start: float = time.time()
+        committed: bool = not self.isFilteredOnly(commitInfo)
+        if not committed:
+            logging.info("Revision [%s] changes filtered paths only, no commit", "{}".format(commitInfo.revision))
+            self.journal.write(commitInfo.revision, self.githandler.gitHeadSha(), self.githandler.gitDirectoryPath(), self.svnhandler.getCheckoutName())
+        elif False == self.addRevisionToGit(repoNameGit, folder_src, commitInfo, fullSync):
+            raise RuntimeError("Commit of revision [{}] failed".format(commitInfo.revision))
+        else:
+            sha: str = self.githandler.gitHeadSha()
+            self.revmap.append(commitInfo.revision, sha)
+            self.journal.write(commitInfo.revision, sha, self.githandler.gitDirectoryPath(), self.svnhandler.getCheckoutName())
+        process_git_end: float = time.time()
+        process_git_duration: float = process_git_end - process_git_start
+        logging.info(f"Git actions took [{process_git_duration:.2f}] seconds")
+        return committed
+
+    def determineSkippedRevisions(self: object, revisions: array.array, revisionStart: int, revisionLast: int) -> list[int]:
+        """Determine revisions of range which are not converted
+
+        Args:
+            revisions (array.array): Ascending revisions to convert
+            revisionStart (int): First revision of range
+            revisionLast (int): Last revision of range
+
+        Returns:
+            list[int]: Revisions of range missing in revisions
+        """
+        skipped: list[int] = []
+        expected: int = revisionStart
+        for revision in revisions:
+            skipped.extend(range(expected, revision))
+            expected = revision + 1
+        skipped.extend(range(expected, revisionLast + 1))
+        return skipped
+
+    def fetchRevision(self: object, repoNameSvn: str, revisionNumber: int, firstRevision: bool) -> TS2GSVNinfo:
+        """Bring SVN checkout to revision and read revision information
+
+        Args:
+            repoNameSvn (str): Folder name of SVN checkout
+            revisionNumber (int): Revision to fetch
+            firstRevision (bool): True for the first revision of this run
+
+        Returns:
+            TS2GSVNinfo: SVN Commit info object
+        """
+        # SVN Checkout/update, a checkout left by an interrupted run is updated
+        process_svn_start: float = time.time()
+        checkout: bool = False
+        if firstRevision and (self.resume or self.mirror) and self.oshandler.workspaceFolderExists(repoNameSvn):
+            self.svnhandler.svnCleanup(repoNameSvn)
+            self.svnhandler.svnUpdateToRevision(repoNameSvn, revisionNumber)
+        elif firstRevision:
+            self.svnhandler.checkoutRevision(revisionNumber)
+            checkout = True
+        else:
+            self.svnhandler.svnUpdateToRevision(repoNameSvn, revisionNumber)
+        process_svn_end: float = time.time()
+        process_svn_duration: float = process_svn_end - process_svn_start
+        logging.info(f"SVN checkout/update took [{process_svn_duration:.2f}] seconds")
+        self.metrics.record(revisionNumber, "svn_update", process_svn_duration)
+
+        # Read SVN revision information
+        process_rev_start: float = time.time()
+        commitInfo: TS2GSVNinfo = self.svnhandler.getCommitInfo(repoNameSvn, revisionNumber)
+        process_rev_end: float = time.time()
+        process_rev_duration: float = process_rev_end - process_rev_start
+        logging.info(f"Reading SVN revision meta data took [{process_rev_duration:.2f}] seconds")
+        self.metrics.record(revisionNumber, "svn_log", process_rev_duration)
+
+        # Externals are converted in repositories of their own and recorded as submodules,
+        # checked out externals are not covered by the changed paths
+        if self.externals.isActive() or self.syncChanged:
+            process_ext_start: float = time.time()
+            self.externals.detect(self.oshandler.workspaceFolderGet(repoNameSvn), None if firstRevision else commitInfo.changedpaths)
+            pending: list[str] = self.externals.pending() if self.externals.isActive() else []
+            if pending and False == self.processExternals(pending):
+                raise RuntimeError("Conversion of externals of revision [{}] failed".format(revisionNumber))
+            if self.externals.isActive():
+                commitInfo.externals = self.externals.resolve(commitInfo)
+            process_ext_end: float = time.time()
+            process_ext_duration: float = process_ext_end - process_ext_start
+            logging.info(f"SVN externals took [{process_ext_duration:.2f}] seconds")
+            self.metrics.record(revisionNumber, "svn_externals", process_ext_duration)
+
+        # Folders added below folders with filtered content need their depth
+        if not checkout and self.pathfilter.isActive():
+            process_depth_start: float = time.time()
+            self.svnhandler.svnSparseUpdate(repoNameSvn, revisionNumber, commitInfo.changedpaths)
+            process_depth_end: float = time.time()
+            process_depth_duration: float = process_depth_end - process_depth_start
+            logging.info(f"SVN depth of added folders took [{process_depth_duration:.2f}] seconds")
+            self.metrics.record(revisionNumber, "svn_update", process_depth_duration)
+        return commitInfo
+
+    def formatRevisionRanges(self: object, revisions: list[int]) -> str:
+        """Format ascending revisions as compact list of ranges like 1-5, 7, 9-12
+
+        Args:
+            revisions (list[int]): Ascending revisions
+
+        Returns:
+            str: Compact list of ranges
+        """
+        ranges: list[str] = []
+        index: int = 0
+        while index < len(revisions):
+            end: int = index
+            while end + 1 < len(revisions) and revisions[end + 1] == revisions[end] + 1:
+                end += 1
+            ranges.append("{}".format(revisions[index]) if index == end else "{}-{}".format(revisions[index], revisions[end]))
+            index = end + 1
+        return ", ".join(ranges)
+
+    def isFilteredOnly(self: object, commitInfo: TS2GSVNinfo) -> bool:
+        """Check if a revision changes filtered paths only
+
+        Args:
+            commitInfo (TS2GSVNinfo): SVN Commit info object
+
+        Returns:
+            bool: True if all changed paths are filtered, False if some are left or they are unknown
+        """
+        return None != commitInfo.changedpaths and 0 == len(commitInfo.changedpaths)
+
+    def mirrorStart(self: object) -> int:
+        """Determine first revision to convert into an existing repo
+
+        The last converted revision is taken from the journal if it was written for
+        the current HEAD, otherwise from the commit messages of the history. If the
+        previous run finished with the same SVN checkout, the first revision is synced
+        by its changed paths only.
+
+        Returns:
+            int: First revision to convert, None on any failure
+        """
+        if False == self.githandler.gitRepositoryResume():
+            return None
+        head: str = self.githandler.gitHeadSha()
+        if not head:
+            return 1
+        checkpoint: dict = None
+        if self.journal.exists():
+            checkpoint = self.journal.read()
+        if None != checkpoint and head == checkpoint["sha"]:
+            revision: int = int(checkpoint["revision"])
+            repoNameSvn: str = self.svnhandler.getCheckoutName()
+            self.continued = checkpoint["finished"] and repoNameSvn == checkpoint["svncheckout"] and self.oshandler.workspaceFolderExists(repoNameSvn)
+        else:
+            revision, sha = self.githandler.gitHistoryRevision(self.svnhandler.revisionFromMessage)
+            if 0 == revision:
+                logging.error("No SVN revision found in history of [%s], enable [commit_msg_svn_nr] or [commit_msg_svn_trailer]", "{}".format(self.githandler.gitRepositoryName()))
+                return None
+            if sha != head:
+                logging.warning("HEAD [%s] has no SVN revision, use revision [%s] of commit [%s]", "{}".format(head), "{}".format(revision), "{}".format(sha))
+        logging.info("Mirror continues after revision [%s], commit [%s]", "{}".format(revision), "{}".format(head))
+        return revision + 1
+
+    def pathSkip(self: object, folder: str):
+        """Create check for paths left out by the path filter when copying from a folder
+
+        Args:
+            folder (str): Full os path of folder corresponding to the repository URL
+
+        Returns:
+            callable: Check called with full os path, None if no path is filtered
+        """
+        if not self.pathfilter.isActive():
+            return None
+        return lambda path: self.pathfilter.isExcluded(os.path.relpath(path, folder).replace(os.sep, "/"), os.path.isdir(path) and not os.path.islink(path))
 
     def process(self: object) -> bool:
         """Initialize and start conversion process
 
+        In mirror mode an existing repo is continued after its last converted revision.
+        With a poll interval new revisions are converted until the program is stopped.
+
         Returns:
             bool: False on any failure, otherwise true
         """
 
         try:
-            if False == self.oshandler.workspaceFolderCreate(""):
+            if False == self.oshandler.workspaceCheck(self.workspaceMinFree):
                 return False
+            if self.plan:
+                return self.processPlan()
 
-            if False == self.githandler.gitInitProjectRepository():
+            engine: str = self.config.value_get("TS2G", "engine").lower()
+            if self.svnhandler.isStandardLayout() and "dump" != engine:
+                # Branches and tags share one object store only in a single pass over the dump stream
+                logging.info("Standard layout of [%s] is converted with engine [dump]", "{}".format(self.svnhandler.getRepositoryUrl()))
+                engine = "dump"
+            if self.mirror and "dump" == engine:
+                logging.error("Mirror mode requires engine [checkout]")
                 return False
+            revisionStart: int = 1
+            if self.mirror and self.githandler.gitRepositoryExists():
+                revisionStart = self.mirrorStart()
+                if None == revisionStart:
+                    return False
+            elif self.resume and self.journal.exists() and "dump" != engine:
+                checkpoint: dict = self.journal.read()
+                if None == checkpoint:
+                    return False
+                if checkpoint["gitdir"] != self.githandler.gitDirectoryPath() and not checkpoint["finished"]:
+                    logging.error("Journal was written for git directory [%s], expected [%s]", "{}".format(checkpoint["gitdir"]), "{}".format(self.githandler.gitDirectoryPath()))
+                    return False
+                if False == self.githandler.gitRepositoryResume(checkpoint["sha"]):
+                    return False
+                revisionStart = int(checkpoint["revision"]) + 1
+                logging.info("Resume conversion after revision [%s], commit [%s]", "{}".format(checkpoint["revision"]), "{}".format(checkpoint["sha"]))
+            elif False == self.githandler.gitInitProjectRepository():
+                return False
+            else:
+                # Commits of a previous repository do not exist in the new one
+                self.revmap.delete()
+                self.synchandler.delete()
+
+            if "dump" == engine:
+                logging.info("Use engine [%s]", "{}".format(engine))
+                if self.externals.isActive():
+                    logging.warning("Engine [dump] records no externals, use engine [checkout] for submodules")
+                dumphandler: TS2GDUMP = TS2GDUMP(self.config, self.oshandler, self.githandler, self.svnhandler, self.revmap)
+                result: bool = dumphandler.process()
+                self.revmap.close()
+                self.githandler.gitFinalize()
+                self.svnhandler.session.cmd.logStatistics()
+                self.githandler.cmd.logStatistics()
+                return result
 
+            # The repo gets its final shape after every cycle, also if a cycle is interrupted
+            revisionNext: int = 0
+            try:
+                revisionNext = self.processCycle(revisionStart)
+            finally:
+                self.githandler.gitFinalize()
+            while 0 < revisionNext and self.mirror and 0 < self.mirrorInterval:
+                logging.info("Next mirror sync in [%s] seconds", "{}".format(self.mirrorInterval))
+                try:
+                    time.sleep(self.mirrorInterval)
+                except KeyboardInterrupt:
+                    logging.info("Mirror stopped")
+                    break
+                self.metrics.reset()
+                if False == self.githandler.gitRepositoryResume():
+                    return False
+                try:
+                    revisionNext = self.processCycle(revisionNext)
+                finally:
+                    self.githandler.gitFinalize()
+            if 0 == revisionNext:
+                return False
+        except Exception as ex:
+            logging.error("Exception [%s]", "{}".format(ex))
+            return False
+
+        return True
+
+    def processCycle(self: object, revisionStart: int) -> int:
+        """Convert all revisions from start revision up to the latest or limited revision
+
+        In mirror mode the SVN checkout is kept, so the next cycle continues with an update.
+
+        Args:
+            revisionStart (int): First revision to convert
+
+        Returns:
+            int: Next revision to convert, 0 on any failure
+        """
+        try:
             repoNameGit: str = self.githandler.gitRepositoryName()
             revisionLimit: int = int(self.config.value_get("SVN", "revision_limit"))
+            self.externals.reset()
 
             maxRevision: int = self.svnhandler.getMaxRevisionNumber()
+            if 0 == maxRevision:
+                logging.error("Cannot read head revision of [%s]", "{}".format(self.svnhandler.getRepositoryUrl()))
+                return 0
             logging.info("Max revision of [%s] is [%s], limited to [%s]", "{}".format(self.svnhandler.getRepositoryUrl()), "{}".format(maxRevision), "{}".format(revisionLimit))
+            if self.mirror and revisionStart > (min(maxRevision, revisionLimit) if 0 != revisionLimit else maxRevision):
+                logging.info("Mirror is up to date with revision [%s]", "{}".format(revisionStart - 1))
+                return revisionStart
 
-            repoNameSvn: str = ""
-            for revisionNumber in range(1, (maxRevision + 1)):
+            revisionLast: int = maxRevision
+            if 0 != revisionLimit and revisionLimit < maxRevision:
+                revisionLast = max(revisionStart, revisionLimit)
+                logging.info(f"Revision limit of [{revisionLimit}] applies, stop after revision [{revisionLast}]")
+
+            # Only revisions changing something below the repository URL are converted
+            revisions: array.array = self.svnhandler.getRevisionList(revisionStart, revisionLast)
+            revisionsSkipped: list[int] = self.determineSkippedRevisions(revisions, revisionStart, revisionLast)
+            logging.info("[%s] revisions to convert, [%s] revisions skipped", "{}".format(len(revisions)), "{}".format(len(revisionsSkipped)))
+
+            repoNameSvn: str = self.svnhandler.getCheckoutName()
+            if 0 == len(revisions):
+                logging.info("No revisions to convert")
+            elif 1 < self.segments and 1 == revisionStart:
+                if False == self.processSegments(revisions):
+                    return 0
+            else:
+                self.processRange(repoNameGit, repoNameSvn, revisions, maxRevision)
+
+            # Delete svn folder, a mirror continues with it
+            if not self.mirror and self.oshandler.workspaceFolderExists(repoNameSvn):
+                folder_svn: str = self.oshandler.workspaceFolderGet(repoNameSvn)
+                self.oshandler.workspaceFolderDelete(folder_svn)
+            if self.journal.exists():
+                checkpoint: dict = self.journal.read()
+                self.journal.write(checkpoint["revision"], checkpoint["sha"], self.githandler.gitDirectoryPath(), repoNameSvn, True)
+            self.revmap.close()
+            self.continued = True
+            self.metrics.finish()
+
+            logging.info("-" * 30)
+            logging.info("Summary: converted [%s] revisions of [%s]", "{}".format(len(revisions)), "{}".format(self.svnhandler.getRepositoryUrl()))
+            logging.info("Summary: skipped [%s] revisions not touching the repository URL [%s]", "{}".format(len(revisionsSkipped)), self.formatRevisionRanges(revisionsSkipped))
+            self.svnhandler.session.logStatistics()
+            self.synchandler.logStatistics()
+            self.externals.logStatistics()
+            self.svnhandler.session.cmd.logStatistics()
+            self.githandler.cmd.logStatistics()
+            summary: dict = self.metrics.reportWrite(self.svnhandler.session.latency)
+            if None != summary:
+                logging.info(f"Summary: [{summary['revisions_per_second']:.2f}] revisions/sec, [{summary['bytes_per_second']:.0f}] bytes/sec")
+                for stage, values in summary["stages"].items():
+                    logging.info(f"Summary: stage [{stage}] took [{values['total']:.2f}] seconds, p50 [{values['p50']:.3f}] p95 [{values['p95']:.3f}] p99 [{values['p99']:.3f}]")
+        except Exception as ex:
+            logging.error("Exception [%s]", "{}".format(ex))
+            return 0
+
+        return revisionLast + 1
+
+    def processExternals(self: object, urls: list[str]) -> bool:
+        """Convert externals using one process per external, each into a repository of its own
+
+        Args:
+            urls (list[str]): URLs of externals
+
+        Returns:
+            bool: False on any failure, otherwise true
+        """
+        arguments: list[tuple] = [(self.externals.configCreate(url), url) for url in urls]
+        self.externals.save()
+        process_start: float = time.time()
+        with multiprocessing.Pool(processes=min(self.externals.workers, len(arguments))) as pool:
+            results: list[tuple] = pool.map(processExternal, arguments)
+        process_end: float = time.time()
+        process_duration: float = process_end - process_start
+        logging.info(f"Conversion of [{len(arguments)}] externals took [{process_duration:.2f}] seconds")
+        result: bool = True
+        for url, (gitDirectory, revmapFile) in zip(urls, results):
+            if "" == gitDirectory:
+                logging.error("Conversion of external [%s] failed", "{}".format(url))
+                result = False
+            else:
+                self.externals.repositoryAdd(url, gitDirectory, revmapFile)
+        return result
+
+    def processPlan(self: object) -> bool:
+        """Read the history once and estimate the cost of the conversion instead of converting
+
+        The first revisions are converted in a calibration run below the segments
+        folder to measure the duration of the stages.
+
+        Returns:
+            bool: False on any failure, otherwise true
+        """
+        process_start: float = time.time()
+        planhandler: TS2GPLAN = TS2GPLAN(self.oshandler, self.svnhandler, self.githandler)
+        if False == planhandler.collect():
+            return False
+        revisions: array.array = array.array("L", planhandler.revisions[: self.planCalibration])
+        if self.svnhandler.isStandardLayout():
+            logging.warning("Standard layout is converted with engine [dump], no calibration run")
+        elif 0 < len(revisions):
+            calibrationBase: str = os.path.join("segments_" + self.githandler.gitRepositoryName(), "calibration")
+            self.oshandler.workspaceRolesDelete(calibrationBase)
+            converter: TS2G = TS2G(self.config, "calibration")
+            converter.svnhandler.planLoad(planhandler.logFile())
+            gitDirectory: str = converter.processSegment(revisions)
+            converter.metrics.finish()
+            self.oshandler.workspaceRolesDelete(calibrationBase)
+            if "" == gitDirectory:
+                logging.error("Calibration run failed")
+                return False
+            planhandler.estimate(converter.metrics.summary())
+        summary: dict = planhandler.reportWrite()
+        if None == summary:
+            return False
+        process_end: float = time.time()
+        process_duration: float = process_end - process_start
+        logging.info(f"Plan took [{process_duration:.2f}] seconds")
+        logging.info("-" * 30)
+        logging.info("Plan: [%s] revisions to convert, [%s] revisions skipped, [%s] bytes to copy", "{}".format(summary["revisions"]), "{}".format(summary["revisions_skipped"]), "{}".format(summary["bytes"]))
+        for largest in summary["largest_files"]:
+            logging.info("Plan: large file [%s] with [%s] bytes", "{}".format(largest["path"]), "{}".format(largest["bytes"]))
+        for author, count in summary["unmapped_authors"].items():
+            logging.warning("Plan: author [%s] of [%s] revisions not in usermap", "{}".format(author), "{}".format(count))
+        if None != summary["calibration"]:
+            logging.info(f"Plan: projected duration [{summary['calibration']['projected_seconds']:.0f}] seconds based on [{summary['calibration']['revisions']}] revisions")
+        return True
+
+    def processRange(self: object, repoNameGit: str, repoNameSvn: str, revisions: array.array, maxRevision: int) -> None:
+        """Convert list of revisions, pipelined if configured
+
+        Args:
+            repoNameGit (str): Folder name of GIT destination directory
+            repoNameSvn (str): Folder name of SVN checkout
+            revisions (array.array): Ascending revisions to convert
+            maxRevision (int): Maximum revision of repository
+        """
+        if 0 < self.pipelineDepth and self.syncChanged and self.syncVerify:
+            # The verifying full sync needs the SVN checkout at the revision being committed
+            logging.info("Sync verification converts revisions one after the other, [pipeline_depth] is ignored")
+            self.processRevisions(repoNameGit, repoNameSvn, revisions, maxRevision)
+        elif 0 < self.pipelineDepth and self.syncChanged:
+            self.processRevisionsPipelined(repoNameGit, repoNameSvn, revisions, maxRevision)
+        else:
+            self.processRevisions(repoNameGit, repoNameSvn, revisions, maxRevision)
+
+    def processRevisions(self: object, repoNameGit: str, repoNameSvn: str, revisions: array.array, maxRevision: int) -> None:
+        """Convert revisions one after the other
+
+        Args:
+            repoNameGit (str): Folder name of GIT destination directory
+            repoNameSvn (str): Folder name of SVN checkout
+            revisions (array.array): Ascending revisions to convert
+            maxRevision (int): Maximum revision of repository
+        """
+        revisionStart: int = revisions[0]
+        fullSync: bool = not self.continued
+        for revisionNumber in revisions:
+            process_start: float = time.time()
+            logging.info("-" * 30)
+            logging.info("Working on revision [%s/%s]", "{}".format(revisionNumber), "{}".format(maxRevision))
+            firstRevision: bool = revisionStart == revisionNumber
+
+            commitInfo: TS2GSVNinfo = self.fetchRevision(repoNameSvn, revisionNumber, firstRevision)
+            if self.commitRevision(repoNameGit, repoNameSvn, commitInfo, fullSync or self.externals.isCheckedOut()):
+                fullSync = False
+
+            process_end: float = time.time()
+            process_duration: float = process_end - process_start
+            logging.info(f"Revision [{revisionNumber}] transferred within [{process_duration:.2f}] seconds")
+            self.metrics.record(revisionNumber, "total", process_duration)
+
+    def processRevisionsPipelined(self: object, repoNameGit: str, repoNameSvn: str, revisions: array.array, maxRevision: int) -> None:
+        """Convert revisions while the SVN side already fetches the next revisions
+
+        A producer thread updates the SVN checkout and copies the changed paths of each
+        revision into one of pipeline_depth + 1 rotating staging folders. The committer
+        consumes the staged revisions strictly in revision order. A failure of the
+        producer is raised again by the committer after the revisions staged before.
+
+        Args:
+            repoNameGit (str): Folder name of GIT destination directory
+            repoNameSvn (str): Folder name of SVN checkout
+            revisions (array.array): Ascending revisions to convert
+            maxRevision (int): Maximum revision of repository
+        """
+        revisionStart: int = revisions[0]
+        stagingBase: str = "staging_" + repoNameGit
+        stagingFree: queue.Queue = queue.Queue()
+        for slot in range(self.pipelineDepth + 1):
+            stagingFree.put(self.oshandler.workspaceRoleGet("staging", os.path.join(stagingBase, "{}".format(slot))))
+        staged: queue.Queue = queue.Queue(maxsize=self.pipelineDepth)
+        stop: threading.Event = threading.Event()
+
+        def producer() -> None:
+            try:
+                fullSync: bool = not self.continued
+                for revisionNumber in revisions:
+                    folder_stage: str = stagingFree.get()
+                    if stop.is_set():
+                        return
+                    firstRevision: bool = revisionStart == revisionNumber
+                    commitInfo: TS2GSVNinfo = self.fetchRevision(repoNameSvn, revisionNumber, firstRevision)
+                    stagedFull: bool = self.stageRevision(self.oshandler.workspaceFolderGet(repoNameSvn), folder_stage, commitInfo, fullSync or self.externals.isCheckedOut())
+                    staged.put((revisionNumber, commitInfo, folder_stage, stagedFull))
+                    if not self.isFilteredOnly(commitInfo):
+                        fullSync = False
+            except Exception as ex:
+                logging.error("Exception [%s]", "{}".format(ex))
+                staged.put(ex)
+                return
+            staged.put(None)
+
+        worker: threading.Thread = threading.Thread(target=producer, name="svn-producer", daemon=True)
+        worker.start()
+        try:
+            while True:
+                item = staged.get()
+                if None == item:
+                    break
+                if isinstance(item, Exception):
+                    raise item
                 process_start: float = time.time()
+                revisionNumber, commitInfo, folder_stage, fullSync = item
                 logging.info("-" * 30)
-                logging.info("Working on revision [%s/%s]", "{}".format(revisionNumber), "{}".format(maxRevision))
-
-                # SVN Checkout/update
-                process_svn_start: float = time.time()
-                if 1 == revisionNumber:
-                    repoNameSvn = self.svnhandler.checkoutRevision(revisionNumber)
-                else:
-                    self.svnhandler.svnUpdateToRevision(repoNameSvn, revisionNumber)
-                process_svn_end: float = time.time()
-                process_svn_duration: float = process_svn_end - process_svn_start
-                logging.info(f"SVN checkout/update took [{process_svn_duration:.2f}] seconds")
-
-                # Read SVN revision information
-                process_rev_start: float = time.time()
-                commitInfo: TS2GSVNinfo = self.svnhandler.getCommitInfo(repoNameSvn, revisionNumber)
-                process_rev_end: float = time.time()
-                process_rev_duration: float = process_rev_end - process_rev_start
-                logging.info(f"Reading SVN revision meta data took [{process_rev_duration:.2f}] seconds")
-
-                # Add to git
-                process_git_start: float = time.time()
-                self.addRevisionToGit(repoNameGit, repoNameSvn, commitInfo)
-                process_git_end: float = time.time()
-                process_git_duration: float = process_git_end - process_git_start
-                logging.info(f"Git actions took [{process_git_duration:.2f}] seconds")
-
+                logging.info("Committing revision [%s/%s], [%s] staged", "{}".format(revisionNumber), "{}".format(maxRevision), "{}".format(staged.qsize()))
+                self.commitRevision(repoNameGit, folder_stage, commitInfo, fullSync)
+                stagingFree.put(folder_stage)
                 process_end: float = time.time()
                 process_duration: float = process_end - process_start
-                logging.info(f"Revision [{revisionNumber}] transferred within [{process_duration:.2f}] seconds")
-                if 0 != revisionLimit and revisionLimit <= revisionNumber:
-                    logging.info(f"Revision limit of [{revisionLimit}] reached, abort")
-                    break
+                logging.info(f"Revision [{revisionNumber}] committed within [{process_duration:.2f}] seconds")
+                self.metrics.record(revisionNumber, "total", process_duration)
+        finally:
+            stop.set()
+            stagingFree.put(None)
+            while worker.is_alive():
+                try:
+                    staged.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            worker.join()
+            self.oshandler.workspaceFolderDelete(self.oshandler.workspaceRoleGet("staging", stagingBase))
+
+    def processSegment(self: object, revisions: array.array) -> str:
+        """Convert segment of revisions into a repository of its own
 
-            # Delete svn folder
-            folder_svn: str = self.oshandler.workspaceFolderGet(repoNameSvn)
-            self.oshandler.workspaceFolderDelete(folder_svn)
+        The first revision of the segment is committed with the complete tree, so
+        each commit has the same tree as in a conversion of the whole range.
+
+        Args:
+            revisions (array.array): Ascending revisions of segment
+
+        Returns:
+            str: Full os path of .git folder of segment repository, empty on any failure
+        """
+        try:
+            if False == self.oshandler.workspaceCheck(0):
+                return ""
+            if False == self.githandler.gitInitProjectRepository():
+                return ""
+            maxRevision: int = self.svnhandler.getMaxRevisionNumber()
+            repoNameSvn: str = self.svnhandler.getCheckoutName()
+            logging.info("Convert segment [%s:%s] in [%s]", "{}".format(revisions[0]), "{}".format(revisions[-1]), "{}".format(self.oshandler.workspaceBaseGet()))
+            self.processRange(self.githandler.gitRepositoryName(), repoNameSvn, revisions, maxRevision)
+            self.oshandler.workspaceFolderDelete(self.oshandler.workspaceFolderGet(repoNameSvn))
+            self.githandler.gitRepositoryClose()
+            self.revmap.close()
         except Exception as ex:
             logging.error("Exception [%s]", "{}".format(ex))
+            return ""
+        return self.githandler.gitDirectoryPath()
+
+    def processSegments(self: object, revisions: array.array) -> bool:
+        """Convert revisions in segments using one process per segment, then stitch the histories
+
+        Args:
+            revisions (array.array): Ascending revisions to convert
+
+        Returns:
+            bool: False on any failure, otherwise true
+        """
+        count: int = min(self.segments, len(revisions))
+        size: int = (len(revisions) + count - 1) // count
+        segmentBase: str = "segments_" + self.githandler.gitRepositoryName()
+        arguments: list[tuple] = []
+        for index in range(0, len(revisions), size):
+            arguments.append((self.config, "{}".format(len(arguments)), revisions[index : index + size]))
+
+        process_start: float = time.time()
+        with multiprocessing.Pool(processes=len(arguments)) as pool:
+            results: list[tuple] = pool.map(processSegment, arguments)
+        gitDirectories: list[str] = [gitDirectory for gitDirectory, _ in results]
+        for _, metrics in results:
+            self.metrics.merge(metrics)
+        process_end: float = time.time()
+        process_duration: float = process_end - process_start
+        logging.info(f"Conversion of [{len(arguments)}] segments took [{process_duration:.2f}] seconds")
+        if "" in gitDirectories:
+            logging.error("Conversion of at least one segment failed")
+            return False
+
+        shaMap: dict[str, str] = {}
+        result: bool = self.githandler.gitSegmentsStitch(gitDirectories, shaMap)
+        if result:
+            for _, segment, _ in arguments:
+                segmentMap: TS2GREVMAP = TS2GREVMAP(self.oshandler.workspaceFolderGet(os.path.join(segmentBase, segment, self.githandler.gitRepositoryName() + ".revmap")))
+                for revision, sha in segmentMap.records():
+                    self.revmap.append(revision, shaMap[sha])
+            self.journal.write(revisions[-1], self.githandler.gitHeadSha(), self.githandler.gitDirectoryPath(), self.svnhandler.getCheckoutName())
+            self.githandler.gitCheckoutHead()
+            # The work tree was written by git, not by the sync
+            self.synchandler.delete()
+            self.oshandler.workspaceRolesDelete(segmentBase)
+        return result
+
+    def stageRevision(self: object, folder_svn: str, folder_stage: str, commitInfo: TS2GSVNinfo, fullSync: bool) -> bool:
+        """Copy content of revision from SVN checkout into staging folder
+
+        Args:
+            folder_svn (str): Full os path of SVN checkout
+            folder_stage (str): Full os path of staging folder
+            commitInfo (TS2GSVNinfo): SVN Commit info object
+            fullSync (bool): Stage complete tree instead of changed paths only
+
+        Returns:
+            bool: True if the complete tree was staged, otherwise False
+        """
+        process_stage_start: float = time.time()
+        self.oshandler.workspacePathDelete(folder_stage)
+        os.makedirs(folder_stage)
+        changedpaths: list[TS2GSVNchange] = commitInfo.changedpaths
+        skip = self.pathSkip(folder_svn)
+        if fullSync or None == changedpaths or any("" == change.path for change in changedpaths):
+            fullSync = True
+            stagehandler: TS2GSYNC = TS2GSYNC(self.oshandler, None, self.syncHardlink)
+            stagehandler.sync(folder_svn, folder_stage, [self.svnhandler.FOLDER_SVN, self.githandler.FOLDER_GIT], skip)
+        else:
+            for change in changedpaths:
+                path_src: str = os.path.join(folder_svn, change.path)
+                if "D" == change.action or not os.path.lexists(path_src) or (None != skip and skip(path_src)):
+                    continue
+                if os.path.isdir(path_src) and not os.path.islink(path_src) and "M" == change.action:
+                    continue
+                self.oshandler.workspacePathCopy(path_src, os.path.join(folder_stage, change.path), skip)
+        process_stage_end: float = time.time()
+        process_stage_duration: float = process_stage_end - process_stage_start
+        logging.info(f"Staging revision [{commitInfo.revision}] took [{process_stage_duration:.2f}] seconds")
+        self.metrics.record(commitInfo.revision, "staging", process_stage_duration)
+        return fullSync
+
+    def syncChangedPaths(self: object, folder_src: str, folder_dst: str, changedpaths: list[TS2GSVNchange], revision: int) -> bool:
+        """Sync only the paths changed by a revision from SVN directory to GIT directory
+
+        Args:
+            folder_src (str): Full os path of SVN source directory
+            folder_dst (str): Full os path of GIT destination directory
+            changedpaths (list[TS2GSVNchange]): Changed paths of revision
+            revision (int): Revision the bytes copied are accounted for
+
+        Returns:
+            bool: False if the changed paths are unknown and a full sync is required, otherwise True
+        """
+        if None == changedpaths:
+            return False
+        if any("" == change.path for change in changedpaths):
+            logging.info("Revision replaces repository folder itself, full sync required")
             return False
 
+        size: int = 0
+        skip = self.pathSkip(folder_src)
+        for change in changedpaths:
+            if change.action in ("D", "R"):
+                self.oshandler.workspacePathDelete(os.path.join(folder_dst, change.path))
+        for change in sorted(changedpaths, key=lambda change: change.path):
+            if "D" == change.action:
+                continue
+            path_src: str = os.path.join(folder_src, change.path)
+            if not os.path.lexists(path_src):
+                logging.debug("Changed path [%s] does not exist in checkout", "{}".format(change.path))
+                continue
+            if None != skip and skip(path_src):
+                continue
+            if os.path.isdir(path_src) and not os.path.islink(path_src) and "M" == change.action:
+                continue
+            size += self.oshandler.workspacePathCopy(path_src, os.path.join(folder_dst, change.path), skip)
+        logging.debug("Synced [%s] changed paths with [%s] bytes", "{}".format(len(changedpaths)), "{}".format(size))
+        self.metrics.addBytes(revision, size)
         return True
+
+
+def processExternal(arguments: tuple) -> tuple:
+    """Convert or continue the repository of one external, used as entry point of the worker processes
+
+    Args:
+        arguments (tuple): Config and URL of external
+
+    Returns:
+        tuple: Full os path of .git folder of repository, empty on any failure, and full os path of its rev-map
+    """
+    config, url = arguments
+    logging.info("Convert external [%s]", "{}".format(url))
+    converter: TS2G = TS2G(config)
+    if False == converter.process():
+        return "", ""
+    return os.path.join(converter.githandler.projectFolder, converter.githandler.FOLDER_GIT), converter.revmap.filename
+
+
+def processSegment(arguments: tuple) -> tuple:
+    """Convert one segment of revisions, used as entry point of the worker processes
+
+    Args:
+        arguments (tuple): Config, name and revisions of segment
+
+    Returns:
+        tuple: Full os path of .git folder of segment repository, empty on any failure, and collected metrics
+    """
+    config, segment, revisions = arguments
+    converter: TS2G = TS2G(config, segment)
+    return converter.processSegment(revisions), converter.metrics
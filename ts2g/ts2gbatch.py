@@ -0,0 +1,287 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import json
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import time
+import urllib.parse
+
+from ts2g.ts2g import TS2G
+from ts2g.ts2gbatchconfig import TS2GBatchConfig
+from ts2g.ts2gconfig import TS2GConfig
+from ts2g.ts2gos import TS2GOS
+
+
+class TS2GBATCH:
+    """
+    Class to convert the repositories listed in a manifest, each in a process of its own
+    """
+
+    def __init__(self: object, config: TS2GBatchConfig) -> None:
+        """Default constructor
+
+        Args:
+            config (TS2GBatchConfig): Batch settings
+        """
+        self.config: TS2GBatchConfig = config
+        self.workspace: str = os.path.abspath(self.config.value_get("BATCH", "workspace"))
+        self.manifestFile: str = self.config.value_get("BATCH", "manifest")
+        self.reportFile: str = self.config.value_get("BATCH", "report")
+        self.options: dict = self.config.value_get("BATCH", "options")
+        self.workers: int = max(1, int(self.config.value_get("BATCH", "workers")))
+        self.serverConnections: int = max(1, int(self.config.value_get("BATCH", "server_connections")))
+        self.results: dict[str, dict] = {}
+        self.started: float = 0.0
+        logging.debug("workspace [%s]", "{}".format(self.workspace))
+        logging.debug("workers [%s], server connections [%s]", "{}".format(self.workers), "{}".format(self.serverConnections))
+
+    def jobConfigWrite(self: object, job: dict) -> str:
+        """Write config file of a conversion with its own workspace and log file
+
+        Role folders are extended by the project, so conversions do not share them.
+
+        Args:
+            job (dict): Entry of manifest
+
+        Returns:
+            str: Full os path of config file
+        """
+        project: str = job["project"]
+        configFile: str = os.path.join(self.workspace, project + ".json")
+        if os.path.isfile(configFile):
+            os.remove(configFile)
+        TS2GConfig(configFile).save()
+        with open(configFile, "r", encoding="utf-8") as configIn:
+            options: dict = json.load(configIn)
+        for option, value in list(self.options.items()) + list(job.get("options", {}).items()):
+            section, key = option.split(".", 1)
+            options[section][key] = value
+        options["GIT"]["project"] = project
+        options["LOGGING"]["logfile"] = os.path.join(self.workspace, project + ".log")
+        options["SVN"]["repositoryurl"] = job["repositoryurl"]
+        options["TS2G"]["workspace"] = os.path.join(self.workspace, project)
+        for role in TS2GOS.ROLES:
+            if "" != options["TS2G"]["workspace_" + role]:
+                options["TS2G"]["workspace_" + role] = os.path.join(options["TS2G"]["workspace_" + role], project)
+        with open(configFile, "w", encoding="utf-8") as configOut:
+            json.dump(options, configOut, indent=4)
+        return configFile
+
+    def jobConnections(self: object, job: dict) -> int:
+        """Determine number of connections a conversion opens to its server, one per segment
+
+        Args:
+            job (dict): Entry of manifest
+
+        Returns:
+            int: Number of connections
+        """
+        segments = job.get("options", {}).get("TS2G.segments", self.options.get("TS2G.segments", 1))
+        return max(1, int(segments))
+
+    def jobFinish(self: object, job: dict, process: multiprocessing.Process, receiver, started: float) -> None:
+        """Collect result of a finished conversion, a process which died without result is a failure
+
+        Args:
+            job (dict): Entry of manifest
+            process (multiprocessing.Process): Finished process of conversion
+            receiver (multiprocessing.connection.Connection): Receiving end of the pipe of the result
+            started (float): Time the process was started
+        """
+        process.join()
+        measured: dict = {"result": False, "error": "Process exited with code [{}] without result".format(process.exitcode)}
+        try:
+            if receiver.poll():
+                measured = receiver.recv()
+        except (EOFError, OSError) as ex:
+            logging.error("Exception [%s]", "{}".format(ex))
+        receiver.close()
+        summary: dict = measured.get("metrics", {})
+        result: dict = {
+            "project": job["project"],
+            "repositoryurl": job["repositoryurl"],
+            "result": measured["result"],
+            "error": measured.get("error", "" if measured["result"] else "Conversion failed"),
+            "elapsed": time.time() - started,
+            "revisions": summary.get("revisions", 0),
+            "bytes": summary.get("bytes", 0),
+            "revisions_per_second": summary.get("revisions_per_second", 0.0),
+            "bytes_per_second": summary.get("bytes_per_second", 0.0),
+            "log": os.path.join(self.workspace, job["project"] + ".log"),
+        }
+        self.results[job["project"]] = result
+        if result["result"]:
+            logging.info(f"Project [{job['project']}] converted [{result['revisions']}] revisions in [{result['elapsed']:.2f}] seconds")
+        else:
+            logging.error("Project [%s] failed [%s], see [%s]", "{}".format(job["project"]), "{}".format(result["error"]), "{}".format(result["log"]))
+
+    def jobServer(self: object, job: dict) -> str:
+        """Determine server of repository, the connections are limited per server
+
+        Args:
+            job (dict): Entry of manifest
+
+        Returns:
+            str: Host and port of URL, empty for local repositories
+        """
+        return urllib.parse.urlsplit(job["repositoryurl"]).netloc.lower()
+
+    def manifestRead(self: object) -> list[dict]:
+        """Read manifest, an invalid entry is reported as failed conversion
+
+        Returns:
+            list[dict]: Valid entries with keys repositoryurl, project and options, None on any failure
+        """
+        try:
+            with open(self.manifestFile, "r", encoding="utf-8") as manifest:
+                entries: list = json.load(manifest)
+        except Exception as ex:
+            logging.error("Exception [%s]", "{}".format(ex))
+            return None
+        jobs: list[dict] = []
+        for index, entry in enumerate(entries):
+            error: str = ""
+            if not isinstance(entry, dict) or not entry.get("repositoryurl") or not entry.get("project"):
+                error = "Keys [repositoryurl] and [project] required"
+            elif os.path.basename(entry["project"]) != entry["project"]:
+                error = "Project must be a plain folder name"
+            elif any(entry["project"] == job["project"] for job in jobs):
+                error = "Project listed twice"
+            if "" == error:
+                jobs.append(entry)
+                continue
+            project: str = entry.get("project", "") if isinstance(entry, dict) else ""
+            logging.error("Manifest entry [%s] [%s] invalid [%s]", "{}".format(index), "{}".format(project), "{}".format(error))
+            self.results["#{}".format(index)] = {"project": project, "repositoryurl": "", "result": False, "error": error}
+        logging.info("[%s] repositories in manifest [%s]", "{}".format(len(jobs)), "{}".format(self.manifestFile))
+        return jobs
+
+    def process(self: object) -> bool:
+        """Convert all repositories of the manifest, a failure does not stop the others
+
+        At most workers conversions run at the same time and at most
+        server_connections connections are opened to one server. A conversion
+        which needs more connections than allowed runs alone on its server.
+
+        Returns:
+            bool: True if all repositories were converted, otherwise False
+        """
+        os.makedirs(self.workspace, exist_ok=True)
+        self.started = time.time()
+        jobs: list[dict] = self.manifestRead()
+        if None == jobs:
+            return False
+        context = multiprocessing.get_context("spawn")
+        pending: list[dict] = list(jobs)
+        running: dict[int, tuple] = {}
+        connections: dict[str, int] = {}
+        while 0 < len(pending) or 0 < len(running):
+            for job in list(pending):
+                if len(running) >= self.workers:
+                    break
+                server: str = self.jobServer(job)
+                needed: int = self.jobConnections(job)
+                if 0 < connections.get(server, 0) and connections[server] + needed > self.serverConnections:
+                    continue
+                pending.remove(job)
+                connections[server] = connections.get(server, 0) + needed
+                configFile: str = self.jobConfigWrite(job)
+                receiver, sender = context.Pipe(duplex=False)
+                process = context.Process(target=batchConversion, args=(configFile, sender), name=job["project"])
+                process.start()
+                sender.close()
+                running[process.sentinel] = (job, process, receiver, time.time())
+                logging.info("Start project [%s] of [%s], [%s] running, [%s] pending", "{}".format(job["project"]), "{}".format(job["repositoryurl"]), "{}".format(len(running)), "{}".format(len(pending)))
+            for sentinel in multiprocessing.connection.wait(list(running)):
+                job, process, receiver, started = running.pop(sentinel)
+                connections[self.jobServer(job)] -= self.jobConnections(job)
+                self.jobFinish(job, process, receiver, started)
+            self.reportWrite(len(pending) + len(running))
+        summary: dict = self.reportWrite(0)
+        if None != summary:
+            logging.info(f"Summary: [{summary['succeeded']}] converted, [{summary['failed']}] failed, [{summary['revisions']}] revisions in [{summary['elapsed']:.2f}] seconds, [{summary['revisions_per_second']:.2f}] revisions/sec")
+        return all(result["result"] for result in self.results.values())
+
+    def reportWrite(self: object, pending: int) -> dict:
+        """Write aggregate status and throughput of all conversions atomically
+
+        Args:
+            pending (int): Number of conversions not finished yet
+
+        Returns:
+            dict: Report, None on any failure
+        """
+        try:
+            elapsed: float = time.time() - self.started
+            results: list[dict] = list(self.results.values())
+            revisions: int = sum(result.get("revisions", 0) for result in results)
+            report: dict = {
+                "elapsed": elapsed,
+                "succeeded": sum(1 for result in results if result["result"]),
+                "failed": sum(1 for result in results if not result["result"]),
+                "pending": pending,
+                "revisions": revisions,
+                "bytes": sum(result.get("bytes", 0) for result in results),
+                "revisions_per_second": revisions / elapsed if 0 < elapsed else 0.0,
+                "results": results,
+            }
+            reportTemp: str = self.reportFile + ".tmp"
+            with open(reportTemp, "w", encoding="utf-8") as reportOut:
+                json.dump(report, reportOut, indent=4)
+            os.replace(reportTemp, self.reportFile)
+            return report
+        except Exception as ex:
+            logging.error("Exception [%s]", "{}".format(ex))
+        return None
+
+
+def batchConversion(configFile: str, sender) -> None:
+    """Run one conversion, used as entry point of the batch processes
+
+    Args:
+        configFile (str): Full os path of config file of conversion
+        sender (multiprocessing.connection.Connection): Sending end of the pipe of the result
+    """
+    config: TS2GConfig = TS2GConfig(configFile)
+    logger = logging.getLogger()
+    logger.setLevel(config.value_get("LOGGING", "loglevel").upper())
+    handler = logging.FileHandler(config.value_get("LOGGING", "logfile"), "w", "utf-8")
+    handler.setFormatter(logging.Formatter(config.value_get("LOGGING", "logstring")))
+    logger.addHandler(handler)
+
+    measured: dict = {"result": False}
+    try:
+        converter: TS2G = TS2G(config)
+        measured["result"] = converter.process()
+        measured["metrics"] = converter.metrics.summary()
+    except Exception as ex:
+        logging.error("Exception [%s]", "{}".format(ex))
+        measured["error"] = "{}".format(ex)
+    sender.send(measured)
+    sender.close()
@@ -0,0 +1,50 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../vendor/MDO/MDO/"))
+
+from MDO import MDO
+
+
+class TS2GBatchConfig(MDO):
+    """
+    Contains dynamic settings of the TS2G batch conversion
+    """
+
+    def setup(self: object) -> None:
+        """Config options used for converting the repositories of a manifest."""
+        self.add("BATCH", "manifest", "batch.manifest.json")
+        self.add("BATCH", "options", {"SVN.user": "<enter user here>", "SVN.password": "<enter password here>"})
+        self.add("BATCH", "report", "batch.report.json")
+        self.add("BATCH", "server_connections", 2)
+        self.add("BATCH", "workers", 4)
+        self.add("BATCH", "workspace", "./batch")
+        self.add("LOGGING", "logfile", "batch.log")
+        self.add("LOGGING", "loglevel", "info")
+        self.add("LOGGING", "logstring", "%(asctime)s | %(levelname)s | %(filename)s:%(lineno)s:%(funcName)s | %(message)s")
@@ -0,0 +1,278 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import time
+
+import git
+
+from ts2g.ts2g import TS2G
+from ts2g.ts2gbenchmarkconfig import TS2GBenchmarkConfig
+from ts2g.ts2gbenchmarkrepo import TS2GBENCHMARKREPO
+from ts2g.ts2gconfig import TS2GConfig
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+class TS2GBENCHMARK:
+    """
+    Class to run the conversion variants against a generated SVN repository and record the results
+    """
+
+    PROJECT = "benchmark"
+
+    def __init__(self: object, config: TS2GBenchmarkConfig) -> None:
+        """Default constructor
+
+        Args:
+            config (TS2GBenchmarkConfig): Benchmark settings
+        """
+        self.config: TS2GBenchmarkConfig = config
+        self.workspace: str = os.path.abspath(self.config.value_get("BENCHMARK", "workspace"))
+        self.resultsFile: str = self.config.value_get("BENCHMARK", "results")
+        self.parameters: dict = {key: self.config.value_get("REPOSITORY", key) for key in TS2GBENCHMARKREPO.PARAMETERS}
+        logging.debug("workspace [%s]", "{}".format(self.workspace))
+        logging.debug("parameters [%s]", "{}".format(self.parameters))
+
+    def codeVersion(self: object) -> str:
+        """Determine commit of the converter code being benchmarked
+
+        Returns:
+            str: SHA of HEAD, with suffix -dirty for local modifications, empty if unknown
+        """
+        try:
+            repo: git.Repo = git.Repo(os.path.dirname(os.path.realpath(__file__)), search_parent_directories=True)
+            version: str = repo.head.commit.hexsha
+            if repo.is_dirty():
+                version += "-dirty"
+            repo.close()
+            return version
+        except Exception as ex:
+            logging.warning("Version of code unknown [%s]", "{}".format(ex))
+        return ""
+
+    def process(self: object) -> bool:
+        """Generate the repository, run all variants and append the results
+
+        Returns:
+            bool: False on any failure, otherwise true
+        """
+        try:
+            os.makedirs(self.workspace, exist_ok=True)
+            url: str = TS2GBENCHMARKREPO(self.workspace, self.parameters).create()
+            if not url:
+                return False
+
+            runs: list[dict] = []
+            variants: dict[str, dict] = self.config.value_get("BENCHMARK", "variants")
+            for variant, overrides in variants.items():
+                run: dict = self.runVariant(variant, overrides, url)
+                self.runCompare(run)
+                runs.append(run)
+
+            trees: set[str] = {run["head_tree"] for run in runs if run["result"]}
+            if 1 < len(trees):
+                logging.warning("Variants produced different trees [%s]", ", ".join(sorted(trees)))
+            return self.resultsAppend(runs) and all(run["result"] for run in runs)
+        except Exception as ex:
+            logging.error("Exception [%s]", "{}".format(ex))
+        return False
+
+    def resultsAppend(self: object, runs: list[dict]) -> bool:
+        """Append runs to the results file, which keeps the runs of all benchmarks
+
+        Args:
+            runs (list[dict]): Results of this benchmark
+
+        Returns:
+            bool: False on any failure, otherwise true
+        """
+        try:
+            results: list[dict] = self.resultsRead()
+            results.extend(runs)
+            resultsTemp: str = self.resultsFile + ".tmp"
+            with open(resultsTemp, "w", encoding="utf-8") as resultsOut:
+                json.dump(results, resultsOut, indent=4)
+            os.replace(resultsTemp, self.resultsFile)
+            logging.info("Results of [%s] runs appended to [%s]", "{}".format(len(runs)), "{}".format(self.resultsFile))
+        except Exception as ex:
+            logging.error("Exception [%s]", "{}".format(ex))
+            return False
+        return True
+
+    def resultsRead(self: object) -> list[dict]:
+        """Read results of previous benchmarks
+
+        Returns:
+            list[dict]: Previous runs, empty if there are none
+        """
+        if not os.path.isfile(self.resultsFile):
+            return []
+        with open(self.resultsFile, "r", encoding="utf-8") as resultsIn:
+            return json.load(resultsIn)
+
+    def runCompare(self: object, run: dict) -> None:
+        """Log throughput compared to the last run of the same variant and repository
+
+        Args:
+            run (dict): Result of this run
+        """
+        previous: list[dict] = [entry for entry in self.resultsRead() if entry["variant"] == run["variant"] and entry["repository"] == run["repository"] and entry["result"]]
+        if not previous or not run["result"] or 0 == previous[-1]["revisions_per_second"]:
+            return
+        ratio: float = run["revisions_per_second"] / previous[-1]["revisions_per_second"]
+        logging.info(f"Variant [{run['variant']}] runs at [{ratio:.2f}] times the throughput of commit [{previous[-1]['commit']}]")
+
+    def runConfigWrite(self: object, variant: str, overrides: dict, url: str, workspace: str) -> str:
+        """Write config file of a conversion run
+
+        Args:
+            variant (str): Name of variant
+            overrides (dict): Options like "TS2G.engine" and their values
+            url (str): URL of repository to convert
+            workspace (str): Full os path of workspace of the run
+
+        Returns:
+            str: Full os path of config file
+        """
+        configFile: str = os.path.join(self.workspace, "run_{}.json".format(variant))
+        if os.path.isfile(configFile):
+            os.remove(configFile)
+        TS2GConfig(configFile).save()
+        with open(configFile, "r", encoding="utf-8") as configIn:
+            options: dict = json.load(configIn)
+        options["GIT"]["project"] = TS2GBENCHMARK.PROJECT
+        options["LOGGING"]["logfile"] = os.path.join(self.workspace, "run_{}.log".format(variant))
+        options["SVN"]["repositoryurl"] = url
+        options["SVN"]["user"] = "benchmark"
+        options["SVN"]["password"] = "benchmark"
+        options["SVN"]["usermap"] = ["{0} = {0}@example.com".format(author) for author in TS2GBENCHMARKREPO.AUTHORS]
+        options["TS2G"]["workspace"] = workspace
+        for option, value in overrides.items():
+            section, key = option.split(".", 1)
+            options[section][key] = value
+        with open(configFile, "w", encoding="utf-8") as configOut:
+            json.dump(options, configOut, indent=4)
+        return configFile
+
+    def runVariant(self: object, variant: str, overrides: dict, url: str) -> dict:
+        """Convert repository in a fresh process with the options of a variant
+
+        Args:
+            variant (str): Name of variant
+            overrides (dict): Options like "TS2G.engine" and their values
+            url (str): URL of repository to convert
+
+        Returns:
+            dict: Result of run
+        """
+        workspace: str = os.path.join(self.workspace, "run_{}".format(variant))
+        shutil.rmtree(workspace, ignore_errors=True)
+        configFile: str = self.runConfigWrite(variant, overrides, url, workspace)
+        logging.info("Run variant [%s] with [%s]", "{}".format(variant), "{}".format(overrides))
+        with multiprocessing.get_context("spawn").Pool(processes=1) as pool:
+            measured: dict = pool.apply(runConversion, (configFile,))
+        run: dict = {
+            "commit": self.codeVersion(),
+            "label": self.config.value_get("BENCHMARK", "label"),
+            "timestamp": time.time(),
+            "variant": variant,
+            "overrides": overrides,
+            "repository": self.parameters,
+            "revisions_per_second": self.parameters["revisions"] / measured["elapsed"] if 0 < measured["elapsed"] else 0.0,
+        }
+        run.update(measured)
+        logging.info(
+            f"Variant [{variant}] result [{run['result']}] took [{run['elapsed']:.2f}] seconds, [{run['revisions_per_second']:.2f}] revisions/sec, peak RSS [{run['peak_rss_kb']}] KB, read [{run['read_bytes']}] written [{run['write_bytes']}] bytes"
+        )
+        shutil.rmtree(workspace, ignore_errors=True)
+        return run
+
+
+def runConversion(configFile: str) -> dict:
+    """Run one conversion, used as entry point of the benchmark process
+
+    The process is spawned for each run, so peak RSS and disk I/O belong to
+    this conversion including the svn and git processes it started.
+
+    Args:
+        configFile (str): Full os path of config file of run
+
+    Returns:
+        dict: Result, elapsed time, peak RSS, disk I/O, tree of HEAD and metrics summary
+    """
+    config: TS2GConfig = TS2GConfig(configFile)
+    logger = logging.getLogger()
+    logger.setLevel(config.value_get("LOGGING", "loglevel").upper())
+    handler = logging.FileHandler(config.value_get("LOGGING", "logfile"), "w", "utf-8")
+    handler.setFormatter(logging.Formatter(config.value_get("LOGGING", "logstring")))
+    logger.addHandler(handler)
+
+    process_start: float = time.time()
+    converter: TS2G = TS2G(config)
+    result: bool = converter.process()
+    process_end: float = time.time()
+
+    # Resource usage is not available on Windows, it is reported as 0 there
+    peakRss: int = 0
+    readBytes: int = 0
+    writeBytes: int = 0
+    if None != resource:
+        usageSelf = resource.getrusage(resource.RUSAGE_SELF)
+        usageChildren = resource.getrusage(resource.RUSAGE_CHILDREN)
+        peakRss = max(usageSelf.ru_maxrss, usageChildren.ru_maxrss)
+        readBytes = (usageSelf.ru_inblock + usageChildren.ru_inblock) * 512
+        writeBytes = (usageSelf.ru_oublock + usageChildren.ru_oublock) * 512
+    if os.path.isfile("/proc/self/io"):
+        with open("/proc/self/io", "r", encoding="utf-8") as counters:
+            values: dict[str, str] = dict(line.split(": ", 1) for line in counters.read().splitlines())
+        readBytes = int(values["read_bytes"])
+        writeBytes = int(values["write_bytes"])
+
+    headTree: str = ""
+    try:
+        repo: git.Repo = git.Repo(converter.githandler.projectFolder)
+        headTree = repo.head.commit.tree.hexsha
+        repo.close()
+    except Exception as ex:
+        logging.error("Exception [%s]", "{}".format(ex))
+
+    return {
+        "result": result,
+        "elapsed": process_end - process_start,
+        "peak_rss_kb": peakRss,
+        "read_bytes": readBytes,
+        "write_bytes": writeBytes,
+        "head_tree": headTree,
+        "metrics": converter.metrics.summary(),
+    }
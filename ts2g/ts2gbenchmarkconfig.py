@@ -0,0 +1,56 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../vendor/MDO/MDO/"))
+
+from MDO import MDO
+
+
+class TS2GBenchmarkConfig(MDO):
+    """
+    Contains dynamic settings of the TS2G benchmark
+    """
+
+    def setup(self: object) -> None:
+        """Config options used for generating the SVN repository and running the conversions."""
+        self.add("BENCHMARK", "label", "")
+        self.add("BENCHMARK", "results", "benchmark.results.json")
+        self.add("BENCHMARK", "variants", {"checkout": {"TS2G.engine": "checkout"}, "dump": {"TS2G.engine": "dump"}})
+        self.add("BENCHMARK", "workspace", "./benchmark")
+        self.add("LOGGING", "logfile", "benchmark.log")
+        self.add("LOGGING", "loglevel", "info")
+        self.add("LOGGING", "logstring", "%(asctime)s | %(levelname)s | %(filename)s:%(lineno)s:%(funcName)s | %(message)s")
+        self.add("REPOSITORY", "binary_ratio", 0.1)
+        self.add("REPOSITORY", "churn", 10)
+        self.add("REPOSITORY", "depth", 3)
+        self.add("REPOSITORY", "files", 500)
+        self.add("REPOSITORY", "file_size", 4096)
+        self.add("REPOSITORY", "renames", 1)
+        self.add("REPOSITORY", "revisions", 200)
+        self.add("REPOSITORY", "seed", 1)
@@ -0,0 +1,275 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import datetime
+import hashlib
+import json
+import logging
+import os
+import random
+import shutil
+import subprocess
+import time
+
+
+class TS2GBENCHMARKREPO:
+    """
+    Class to generate a reproducible SVN repository for benchmarks with svnadmin
+    """
+
+    AUTHORS: tuple = ("alice", "bob", "carol")
+    FOLDER_ROOT = "trunk"
+    PARAMETERS: tuple = ("binary_ratio", "churn", "depth", "files", "file_size", "renames", "revisions", "seed")
+
+    def __init__(self: object, folder: str, parameters: dict) -> None:
+        """Default constructor
+
+        Args:
+            folder (str): Full os path of folder the repositories are created in
+            parameters (dict): Size of repository, keys as in PARAMETERS
+        """
+        self.parameters: dict = {key: parameters[key] for key in TS2GBENCHMARKREPO.PARAMETERS}
+        key: str = hashlib.sha1(json.dumps(self.parameters, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+        self.repositoryPath: str = os.path.join(folder, "repo_" + key)
+        self.random: random.Random = random.Random(self.parameters["seed"])
+        self.folders: list[str] = []
+        self.files: dict[str, bytes] = {}
+
+    def create(self: object) -> str:
+        """Create repository unless it was created before with the same parameters
+
+        Returns:
+            str: URL of the folder containing all files, empty on any failure
+        """
+        url: str = "file://" + os.path.abspath(self.repositoryPath).replace(os.sep, "/") + "/" + TS2GBENCHMARKREPO.FOLDER_ROOT
+        parameterFile: str = os.path.join(self.repositoryPath, "ts2g-parameters.json")
+        if os.path.isfile(parameterFile):
+            logging.info("Reuse repository [%s]", "{}".format(self.repositoryPath))
+            return url
+        try:
+            process_start: float = time.time()
+            shutil.rmtree(self.repositoryPath, ignore_errors=True)
+            os.makedirs(os.path.dirname(self.repositoryPath), exist_ok=True)
+            subprocess.run(["svnadmin", "create", self.repositoryPath], check=True)
+            dumpFile: str = self.repositoryPath + ".dump"
+            with open(dumpFile, "wb") as dump:
+                self.writeDump(dump)
+            with open(dumpFile, "rb") as dump:
+                subprocess.run(["svnadmin", "load", "--quiet", self.repositoryPath], stdin=dump, check=True)
+            os.remove(dumpFile)
+            with open(parameterFile, "w", encoding="utf-8") as parameters:
+                json.dump(self.parameters, parameters, indent=4)
+            process_end: float = time.time()
+            process_duration: float = process_end - process_start
+            logging.info(f"Creation of repository [{self.repositoryPath}] took [{process_duration:.2f}] seconds")
+        except Exception as ex:
+            logging.error("Exception [%s]", "{}".format(ex))
+            return ""
+        return url
+
+    def contentCreate(self: object, binary: bool) -> bytes:
+        """Create content of a new file
+
+        Args:
+            binary (bool): True for random bytes, otherwise lines of text
+
+        Returns:
+            bytes: Content of file
+        """
+        size: int = max(1, int(self.random.expovariate(1.0 / self.parameters["file_size"])))
+        if binary:
+            return self.random.randbytes(size)
+        lines: list[str] = []
+        length: int = 0
+        while length < size:
+            line: str = "line {} value {}\n".format(len(lines), self.random.getrandbits(32))
+            lines.append(line)
+            length += len(line)
+        return "".join(lines).encode("utf-8")
+
+    def contentModify(self: object, content: bytes, binary: bool) -> bytes:
+        """Modify a part of the content of a file
+
+        Args:
+            content (bytes): Current content
+            binary (bool): True for random bytes, otherwise lines of text
+
+        Returns:
+            bytes: Modified content
+        """
+        if binary:
+            offset: int = self.random.randrange(0, len(content))
+            return content[:offset] + self.random.randbytes(min(64, len(content) - offset)) + content[offset + 64 :]
+        lines: list[bytes] = content.splitlines(keepends=True)
+        index: int = self.random.randrange(0, len(lines))
+        lines[index] = "changed {}\n".format(self.random.getrandbits(32)).encode("utf-8")
+        return b"".join(lines)
+
+    def folderCreate(self: object) -> list[str]:
+        """Create random folder structure below the root folder
+
+        Returns:
+            list[str]: Folders in order of creation, parents first
+        """
+        folders: list[str] = [TS2GBENCHMARKREPO.FOLDER_ROOT]
+        count: int = max(1, self.parameters["files"] // 20)
+        for index in range(count):
+            parent: str = self.random.choice(folders)
+            if parent.count("/") >= self.parameters["depth"]:
+                parent = TS2GBENCHMARKREPO.FOLDER_ROOT
+            folders.append("{}/dir{}".format(parent, index))
+        return folders
+
+    def isBinary(self: object, path: str) -> bool:
+        """Check if file was created with binary content
+
+        Args:
+            path (str): Path of file
+
+        Returns:
+            bool: True for binary file
+        """
+        return path.endswith(".bin")
+
+    def writeDump(self: object, dump) -> None:
+        """Write all revisions as SVN dump stream
+
+        Revision 1 imports the folders and files, each further revision modifies
+        churn files and renames renames files.
+
+        Args:
+            dump (io.BufferedWriter): Binary stream to write to
+        """
+        dump.write(b"SVN-fs-dump-format-version: 2\n\n")
+        dump.write("UUID: {}\n\n".format(self.random.randbytes(16).hex()).encode("utf-8"))
+        self.writeRevision(dump, 0, {"svn:date": self.writeDate(0)})
+
+        self.folders = self.folderCreate()
+        self.writeRevision(dump, 1, self.writeRevisionProperties(1, "Import"))
+        for folder in self.folders:
+            self.writeNode(dump, {"Node-path": folder, "Node-kind": "dir", "Node-action": "add"}, {})
+        for index in range(self.parameters["files"]):
+            binary: bool = self.random.random() < self.parameters["binary_ratio"]
+            path: str = "{}/file{}.{}".format(self.random.choice(self.folders), index, "bin" if binary else "txt")
+            self.files[path] = self.contentCreate(binary)
+            self.writeNode(dump, {"Node-path": path, "Node-kind": "file", "Node-action": "add"}, {"svn:mime-type": "application/octet-stream"} if binary else {}, self.files[path])
+
+        for revision in range(2, self.parameters["revisions"] + 1):
+            self.writeRevision(dump, revision, self.writeRevisionProperties(revision, "Change {}".format(revision)))
+            paths: list[str] = sorted(self.files)
+            changed: list[str] = self.random.sample(paths, min(len(paths), self.parameters["churn"]))
+            for path in changed:
+                self.files[path] = self.contentModify(self.files[path], self.isBinary(path))
+                self.writeNode(dump, {"Node-path": path, "Node-kind": "file", "Node-action": "change"}, None, self.files[path])
+            # Renamed files are copied from the previous revision, so they must be unchanged in this one
+            unchanged: list[str] = sorted(set(paths).difference(changed))
+            for path in self.random.sample(unchanged, min(len(unchanged), self.parameters["renames"])):
+                target: str = "{}/{}".format(self.random.choice(self.folders), "renamed{}_{}".format(revision, path.rpartition("/")[2]))
+                if target in self.files:
+                    continue
+                self.files[target] = self.files.pop(path)
+                self.writeNode(dump, {"Node-path": target, "Node-kind": "file", "Node-action": "add", "Node-copyfrom-rev": "{}".format(revision - 1), "Node-copyfrom-path": path}, None)
+                self.writeNode(dump, {"Node-path": path, "Node-action": "delete"}, None)
+
+    def writeDate(self: object, revision: int) -> str:
+        """Create fixed date of revision, one hour after the previous one
+
+        Args:
+            revision (int): Revision number
+
+        Returns:
+            str: Date in SVN format
+        """
+        date: datetime.datetime = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc) + datetime.timedelta(hours=revision)
+        return date.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+    def writeNode(self: object, dump, headers: dict[str, str], properties: dict[str, str], text: bytes = None) -> None:
+        """Write node record to dump stream
+
+        Args:
+            dump (io.BufferedWriter): Binary stream to write to
+            headers (dict[str, str]): Node headers without the length headers
+            properties (dict[str, str]): Properties of node, None to keep them unchanged
+            text (bytes, optional): Full text of file. Defaults to None.
+        """
+        propertyBlock: bytes = b""
+        if None != properties:
+            propertyBlock = self.writeProperties(properties)
+            headers["Prop-content-length"] = "{}".format(len(propertyBlock))
+        if None != text:
+            headers["Text-content-length"] = "{}".format(len(text))
+            headers["Text-content-md5"] = hashlib.md5(text).hexdigest()
+        if None != properties or None != text:
+            headers["Content-length"] = "{}".format(len(propertyBlock) + (len(text) if None != text else 0))
+        for key, value in headers.items():
+            dump.write("{}: {}\n".format(key, value).encode("utf-8"))
+        dump.write(b"\n")
+        dump.write(propertyBlock)
+        if None != text:
+            dump.write(text)
+        dump.write(b"\n\n")
+
+    def writeProperties(self: object, properties: dict[str, str]) -> bytes:
+        """Serialize properties in dump format
+
+        Args:
+            properties (dict[str, str]): Properties
+
+        Returns:
+            bytes: Property block including PROPS-END
+        """
+        block: bytearray = bytearray()
+        for key, value in properties.items():
+            keyRaw: bytes = key.encode("utf-8")
+            valueRaw: bytes = value.encode("utf-8")
+            block += b"K %d\n%s\nV %d\n%s\n" % (len(keyRaw), keyRaw, len(valueRaw), valueRaw)
+        block += b"PROPS-END\n"
+        return bytes(block)
+
+    def writeRevision(self: object, dump, revision: int, properties: dict[str, str]) -> None:
+        """Write revision record to dump stream
+
+        Args:
+            dump (io.BufferedWriter): Binary stream to write to
+            revision (int): Revision number
+            properties (dict[str, str]): Revision properties
+        """
+        propertyBlock: bytes = self.writeProperties(properties)
+        dump.write("Revision-number: {}\nProp-content-length: {}\nContent-length: {}\n\n".format(revision, len(propertyBlock), len(propertyBlock)).encode("utf-8"))
+        dump.write(propertyBlock)
+        dump.write(b"\n")
+
+    def writeRevisionProperties(self: object, revision: int, message: str) -> dict[str, str]:
+        """Create revision properties with author, date and log message
+
+        Args:
+            revision (int): Revision number
+            message (str): Log message
+
+        Returns:
+            dict[str, str]: Revision properties
+        """
+        return {"svn:author": TS2GBENCHMARKREPO.AUTHORS[revision % len(TS2GBENCHMARKREPO.AUTHORS)], "svn:date": self.writeDate(revision), "svn:log": message}
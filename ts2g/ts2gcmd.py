@@ -0,0 +1,275 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import logging
+import subprocess
+import tempfile
+import threading
+import time
+
+from ts2g.ts2gconfig import TS2GConfig
+
+
+class TS2GCMD:
+    """
+    Class to run external commands like svn or git
+
+    Commands are given as argument vector, so no argument is ever split at a space.
+    The output is streamed line by line, a command without any output for the
+    configured timeout is killed. A failed command is retried with an increasing
+    delay, every process is reaped and the latency and exit status per operation
+    are recorded.
+    """
+
+    BACKOFF = 1.0
+    STDERR_TAIL = 1000
+
+    def __init__(self: object, config: TS2GConfig, name: str) -> None:
+        """Default constructor
+
+        Args:
+            config (TS2GConfig): Config options
+            name (str): Name of command family used in log messages, e.g. svn
+        """
+        self.name: str = name
+        self.timeout: float = float(config.value_get("TS2G", "command_timeout"))
+        self.retries: int = int(config.value_get("TS2G", "command_retries"))
+        self.statistics: dict[str, list] = {}
+        self.background: dict[subprocess.Popen, tuple] = {}
+
+    def attempt(self: object, cmdArgs: list[str], status: dict):
+        """Run command once and yield its output
+
+        The exit code, a timeout and the end of the error output are stored in
+        status. If the caller stops reading, the process is killed and reaped.
+
+        Args:
+            cmdArgs (list[str]): Argument vector
+            status (dict): Receives returncode, timeout, stderr and duration
+
+        Yields:
+            bytes: Line of standard output
+        """
+        logging.debug("Run [%s]", "{}".format(self.commandLine(cmdArgs)))
+        start: float = time.time()
+        status.update({"returncode": None, "timeout": False, "stderr": "", "duration": 0.0})
+        with tempfile.TemporaryFile() as stderr:
+            proc = subprocess.Popen(cmdArgs, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=stderr)
+            activity: list[float] = [start]
+            done: threading.Event = threading.Event()
+            if 0 < self.timeout:
+                threading.Thread(target=self.watchdog, args=(proc, activity, done, status), daemon=True).start()
+            try:
+                for line in proc.stdout:
+                    activity[0] = time.time()
+                    yield line
+                proc.wait()
+            finally:
+                done.set()
+                if None == proc.poll():
+                    proc.kill()
+                proc.stdout.close()
+                status["returncode"] = proc.wait()
+                status["duration"] = time.time() - start
+                stderr.seek(0)
+                status["stderr"] = stderr.read().decode("utf-8", "replace")[-self.STDERR_TAIL :].strip()
+
+    def commandLine(self: object, cmdArgs: list[str]) -> str:
+        """Format argument vector for log messages without password
+
+        Args:
+            cmdArgs (list[str]): Argument vector
+
+        Returns:
+            str: Command line
+        """
+        masked: list[str] = list(cmdArgs)
+        for index, arg in enumerate(cmdArgs[:-1]):
+            if "--password" == arg:
+                masked[index + 1] = "***"
+        return " ".join(masked)
+
+    def failure(self: object, cmdArgs: list[str], status: dict) -> str:
+        """Describe failed command
+
+        Args:
+            cmdArgs (list[str]): Argument vector
+            status (dict): Status of attempt
+
+        Returns:
+            str: Message with exit code or timeout and error output
+        """
+        reason: str = "exit code [{}]".format(status["returncode"])
+        if status["timeout"]:
+            reason = "timeout after [{:.0f}] seconds without output".format(self.timeout)
+        return "{} failed with {} [{}]".format(self.commandLine(cmdArgs), reason, status["stderr"])
+
+    def lines(self: object, cmdArgs: list[str], operation: str, recover=None):
+        """Run command and yield its output line by line
+
+        The command is retried only as long as no line was yielded.
+
+        Args:
+            cmdArgs (list[str]): Argument vector
+            operation (str): Name of operation for statistics
+            recover (callable, optional): Called before a retry, e.g. to clean up. Defaults to None.
+
+        Yields:
+            bytes: Line of standard output
+        """
+        for attempt in range(self.retries + 1):
+            status: dict = {}
+            yielded: bool = False
+            for line in self.attempt(cmdArgs, status):
+                yielded = True
+                yield line
+            if self.record(operation, status):
+                return
+            if yielded or attempt == self.retries:
+                raise RuntimeError(self.failure(cmdArgs, status))
+            self.retry(cmdArgs, status, attempt, recover)
+
+    def logStatistics(self: object) -> None:
+        """Log number of calls, latency and failures per operation"""
+        for operation in sorted(self.statistics):
+            calls, total, maximum, failures, timeouts = self.statistics[operation]
+            logging.info(f"Command [{self.name}] [{operation}] calls [{calls}] took [{total:.2f}] seconds, max [{maximum:.3f}], failures [{failures}], timeouts [{timeouts}]")
+
+    def reap(self: object, proc: subprocess.Popen, wait: bool = True) -> int:
+        """Collect exit status of a process created by start
+
+        Args:
+            proc (subprocess.Popen): Process created by start
+            wait (bool, optional): Wait for the process, otherwise only check. Defaults to True.
+
+        Returns:
+            int: Exit code, None if the process is still running
+        """
+        if wait:
+            proc.wait()
+        if None == proc.poll():
+            return None
+        cmdArgs, operation, start, stderr = self.background.pop(proc)
+        status: dict = {"returncode": proc.returncode, "timeout": False, "duration": time.time() - start}
+        stderr.seek(0)
+        status["stderr"] = stderr.read().decode("utf-8", "replace")[-self.STDERR_TAIL :].strip()
+        stderr.close()
+        if not self.record(operation, status):
+            logging.error(self.failure(cmdArgs, status))
+        return proc.returncode
+
+    def record(self: object, operation: str, status: dict) -> bool:
+        """Add latency and exit status of a call to the statistics of its operation
+
+        Args:
+            operation (str): Name of operation
+            status (dict): Status of call
+
+        Returns:
+            bool: True if the call succeeded, otherwise False
+        """
+        succeeded: bool = 0 == status["returncode"] and not status["timeout"]
+        counter: list = self.statistics.setdefault(operation, [0, 0.0, 0.0, 0, 0])
+        counter[0] += 1
+        counter[1] += status["duration"]
+        counter[2] = max(counter[2], status["duration"])
+        counter[3] += 0 if succeeded else 1
+        counter[4] += 1 if status["timeout"] else 0
+        return succeeded
+
+    def retry(self: object, cmdArgs: list[str], status: dict, attempt: int, recover=None) -> None:
+        """Wait before the next attempt of a failed command
+
+        Args:
+            cmdArgs (list[str]): Argument vector
+            status (dict): Status of failed attempt
+            attempt (int): Number of failed attempt, starting with 0
+            recover (callable, optional): Called before the retry. Defaults to None.
+        """
+        delay: float = self.BACKOFF * 2**attempt
+        logging.warning(f"Retry in [{delay:.0f}] seconds: {self.failure(cmdArgs, status)}")
+        time.sleep(delay)
+        if None != recover:
+            recover()
+
+    def run(self: object, cmdArgs: list[str], operation: str, recover=None, output: bool = True) -> bytes:
+        """Run command and return its output
+
+        The output is collected per attempt, so the command is retried on any failure.
+
+        Args:
+            cmdArgs (list[str]): Argument vector
+            operation (str): Name of operation for statistics
+            recover (callable, optional): Called before a retry, e.g. to clean up. Defaults to None.
+            output (bool, optional): False to discard the output, e.g. progress lines. Defaults to True.
+
+        Returns:
+            bytes: Standard output of command
+        """
+        for attempt in range(self.retries + 1):
+            status: dict = {}
+            lines: list[bytes] = []
+            for line in self.attempt(cmdArgs, status):
+                if output:
+                    lines.append(line)
+            if self.record(operation, status):
+                return b"".join(lines)
+            if attempt == self.retries:
+                raise RuntimeError(self.failure(cmdArgs, status))
+            self.retry(cmdArgs, status, attempt, recover)
+
+    def start(self: object, cmdArgs: list[str], operation: str, **kwargs) -> subprocess.Popen:
+        """Start command in the background, its exit status is collected by reap
+
+        Args:
+            cmdArgs (list[str]): Argument vector
+            operation (str): Name of operation for statistics
+            kwargs: Additional arguments of subprocess.Popen like stdin or stdout
+
+        Returns:
+            subprocess.Popen: Started process
+        """
+        logging.debug("Start [%s]", "{}".format(self.commandLine(cmdArgs)))
+        kwargs.setdefault("stdin", subprocess.DEVNULL)
+        stderr = tempfile.TemporaryFile()
+        proc = subprocess.Popen(cmdArgs, stderr=stderr, **kwargs)
+        self.background[proc] = (cmdArgs, operation, time.time(), stderr)
+        return proc
+
+    def watchdog(self: object, proc: subprocess.Popen, activity: list[float], done: threading.Event, status: dict) -> None:
+        """Kill process without output for the configured timeout
+
+        Args:
+            proc (subprocess.Popen): Process to watch
+            activity (list[float]): Time of the latest output
+            done (threading.Event): Set when the process is finished
+            status (dict): Receives the timeout flag
+        """
+        while not done.wait(min(self.timeout, 1.0)):
+            if self.timeout < time.time() - activity[0]:
+                status["timeout"] = True
+                proc.kill()
+                return
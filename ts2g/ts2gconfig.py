@@ -37,16 +37,78 @@ class TS2GConfig(MDO):
     Contains dynamic settings of TS2G
     """
 
+    def flag_get(self: object, section: str, key: str) -> bool:
+        """Interpret config option as yes/no flag
+
+        Args:
+            section (str): Section of option
+            key (str): Name of option
+
+        Returns:
+            bool: True if value starts with y, j or 1, otherwise False
+        """
+        flag_raw: str = "{}".format(self.value_get(section, key)).lower()
+        return 0 < len(flag_raw) and flag_raw[0] in ("y", "j", "1")
+
+    def list_get(self: object, section: str, key: str) -> list:
+        """Interpret config option as list, a single value is accepted too
+
+        Args:
+            section (str): Section of option
+            key (str): Name of option
+
+        Returns:
+            list: Values of option
+        """
+        value = self.value_get(section, key)
+        if isinstance(value, (list, tuple)):
+            return list(value)
+        return [value]
+
     def setup(self: object) -> None:
         """Config options used for transforming SVN repo into GIT repo."""
+        self.add("GIT", "commit_builder", "tree")
         self.add("GIT", "commit_msg_svn_nr", "yes")
+        self.add("GIT", "commit_msg_svn_trailer", "no")
+        self.add("GIT", "hash_cache_size", 200000)
+        self.add("GIT", "layout", "separate")
+        self.add("GIT", "lfs_patterns", [])
+        self.add("GIT", "lfs_threshold", 0)
+        self.add("GIT", "maintenance_loose_bytes", 0)
+        self.add("GIT", "maintenance_loose_objects", 10000)
         self.add("GIT", "project", "<enter project name here>")
+        self.add("GIT", "submodule_url", "../{name}.git")
         self.add("LOGGING", "logfile", "program.log")
         self.add("LOGGING", "loglevel", "info")
         self.add("LOGGING", "logstring", "%(asctime)s | %(levelname)s | %(filename)s:%(lineno)s:%(funcName)s | %(message)s")
+        self.add("SVN", "backend", "auto")
+        self.add("SVN", "exclude", [])
+        self.add("SVN", "externals", "checkout")
+        self.add("SVN", "externals_workers", 4)
+        self.add("SVN", "include", [])
+        self.add("SVN", "layout", "single")
+        self.add("SVN", "log_chunk_size", 1000)
         self.add("SVN", "revision_limit", 0)
         self.add("SVN", "password", "<enter password here>")
         self.add("SVN", "repositoryurl", "<enter svn url here>")
         self.add("SVN", "user", "<enter user here>")
         self.add("SVN", "usermap", ["username = email"])
+        self.add("TS2G", "command_retries", 2)
+        self.add("TS2G", "command_timeout", 3600)
+        self.add("TS2G", "engine", "checkout")
+        self.add("TS2G", "mirror", "no")
+        self.add("TS2G", "mirror_interval", 0)
+        self.add("TS2G", "pipeline_depth", 0)
+        self.add("TS2G", "plan", "no")
+        self.add("TS2G", "plan_calibration", 20)
+        self.add("TS2G", "resume", "no")
+        self.add("TS2G", "segments", 1)
+        self.add("TS2G", "sync_hardlink", "no")
+        self.add("TS2G", "sync_mode", "changed")
+        self.add("TS2G", "sync_verify", "no")
         self.add("TS2G", "workspace", "./workspace")
+        self.add("TS2G", "workspace_gitdir", "")
+        self.add("TS2G", "workspace_min_free", 512)
+        self.add("TS2G", "workspace_staging", "")
+        self.add("TS2G", "workspace_svn", "")
+        self.add("TS2G", "workspace_worktree", "")
@@ -0,0 +1,648 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import bisect
+import logging
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+import urllib.request
+
+from ts2g.ts2gconfig import TS2GConfig
+from ts2g.ts2gfastimport import TS2GFASTIMPORT
+from ts2g.ts2gfilter import TS2GFILTER
+from ts2g.ts2ggit import TS2GGIT
+from ts2g.ts2glfs import TS2GLFS
+from ts2g.ts2gos import TS2GOS
+from ts2g.ts2grevmap import TS2GREVMAP
+from ts2g.ts2gsvn import TS2GSVN
+from ts2g.ts2gsvndump import TS2GSVNDUMP, TS2GSVNDUMPRecord, svndiffApplyStream
+from ts2g.ts2gsvninfo import TS2GSVNinfo
+
+
+class TS2GDUMP:
+    """
+    Class to convert a SVN dump stream directly into a git repository using git fast-import
+    """
+
+    FOLDER_BRANCHES = "branches"
+    FOLDER_TAGS = "tags"
+    FOLDER_TRUNK = "trunk"
+    MODE_EXECUTABLE = "100755"
+    MODE_FILE = "100644"
+    MODE_SYMLINK = "120000"
+    MODE_TREE = "040000"
+
+    def __init__(self: object, config: TS2GConfig, oshandler: TS2GOS, githandler: TS2GGIT, svnhandler: TS2GSVN, revmap: TS2GREVMAP = None) -> None:
+        """Default constructor
+
+        Args:
+            config (TS2GConfig): Config options
+            oshandler (TS2GOS): Encapsulated file system operations
+            githandler (TS2GGIT): Encapsulated git operations
+            svnhandler (TS2GSVN): Encapsulated SVN operations
+            revmap (TS2GREVMAP, optional): Receives the commit of each revision imported on the main branch. Defaults to None.
+        """
+        self.config: TS2GConfig = config
+        self.oshandler: TS2GOS = oshandler
+        self.githandler: TS2GGIT = githandler
+        self.svnhandler: TS2GSVN = svnhandler
+        self.revmap: TS2GREVMAP = revmap
+        self.revmapMarks: list[tuple[int, int]] = []
+        self.branch: str = self.githandler.gitHeadRef()
+        self.fastimport: TS2GFASTIMPORT = TS2GFASTIMPORT(self.githandler.gitDirectoryPath(), self.githandler.cmd)
+        self.prefix: str = ""
+        self.pathsRelative: bool = False
+        self.standardLayout: bool = self.svnhandler.isStandardLayout()
+        self.pathfilter: TS2GFILTER = self.svnhandler.pathfilter
+        self.commitCount: int = 0
+        self.commitRevisions: dict[str, list[int]] = {}
+        self.commitMarks: dict[str, list[int]] = {}
+        self.commitInfo: TS2GSVNinfo = None
+        self.commands: dict[str, list[bytes]] = {}
+        self.pending: dict[str, dict[str, tuple[str, str, str]]] = {}
+        self.lfs: TS2GLFS = self.githandler.lfs
+        self.lfsAttributes: dict[str, bytes] = {}
+        self.lfsPaths: dict[str, set[str]] = {}
+
+    def blobWrite(self: object, ref: str, path: str, length: int, chunks) -> str:
+        """Write content of file as blob, large files are stored in LFS and a pointer is written instead
+
+        Args:
+            ref (str): Ref of branch
+            path (str): Path relative to branch
+            length (int): Total length of content
+            chunks: Iterable providing the content as bytes
+
+        Returns:
+            str: Mark of blob as dataref
+        """
+        lfsPaths: set[str] = self.lfsPaths.setdefault(ref, set())
+        if self.lfs.isActive() and self.lfs.isLfs(path, length):
+            lfsPaths.add(path)
+            return ":{}".format(self.fastimport.blobData(self.lfs.objectStoreChunks(chunks)))
+        lfsPaths.discard(path)
+        return ":{}".format(self.fastimport.blob(length, chunks))
+
+    def branchCreate(self: object, ref: str, sourceRef: str, sourceRevision: int) -> bool:
+        """Create ref pointing to the commit of another ref, used for a copy of a whole branch
+
+        Args:
+            ref (str): Ref to create
+            sourceRef (str): Ref the branch is copied from
+            sourceRevision (int): Revision the branch is copied from
+
+        Returns:
+            bool: False if the source has no commit at that revision, otherwise True
+        """
+        mark: int = self.commitMark(sourceRef, sourceRevision)
+        if None == mark:
+            return False
+        self.fastimport.reset(ref, ":{}".format(mark))
+        self.commitRecord(ref, self.commitInfo.revision, mark)
+        self.lfsPaths[ref] = set(self.lfsPaths.get(sourceRef, set()))
+        self.lfsAttributes.pop(ref, None)
+        logging.info("Revision [%s] creates [%s] from [%s@%s]", "{}".format(self.commitInfo.revision), "{}".format(ref), "{}".format(sourceRef), "{}".format(sourceRevision))
+        return True
+
+    def branchDelete(self: object, ref: str) -> None:
+        """Delete ref, its history is kept as ref named with @ and the last revision
+
+        Older revisions of the branch stay available as copy source.
+
+        Args:
+            ref (str): Ref to delete
+        """
+        mark: int = self.commitMark(ref, self.commitInfo.revision - 1)
+        if None != mark:
+            self.fastimport.reset("{}@{}".format(ref, self.commitInfo.revision - 1), ":{}".format(mark))
+        self.fastimport.reset(ref)
+        self.commitRecord(ref, self.commitInfo.revision, None)
+        self.commands.pop(ref, None)
+        self.pending.pop(ref, None)
+        logging.info("Revision [%s] deletes [%s]", "{}".format(self.commitInfo.revision), "{}".format(ref))
+
+    def branchSplit(self: object, path: str) -> tuple[str, str]:
+        """Split path relative to converted folder into ref and path inside of the branch
+
+        Without the standard layout, the converted folder is the branch.
+
+        Args:
+            path (str): Path relative to converted folder
+
+        Returns:
+            tuple[str, str]: Ref and path relative to branch, (None, None) if path is not inside of a branch
+        """
+        if not self.standardLayout:
+            return self.branch, path
+        parts: list[str] = path.split("/", 2)
+        if self.FOLDER_TRUNK == parts[0]:
+            return self.branch, "/".join(parts[1:])
+        if 2 <= len(parts) and self.FOLDER_BRANCHES == parts[0]:
+            return "refs/heads/" + parts[1], "/".join(parts[2:])
+        if 2 <= len(parts) and self.FOLDER_TAGS == parts[0]:
+            return "refs/tags/" + parts[1], "/".join(parts[2:])
+        return None, None
+
+    def commitMark(self: object, ref: str, revision: int) -> int:
+        """Determine mark of the last commit of a ref made at or before revision
+
+        Args:
+            ref (str): Ref of branch
+            revision (int): SVN revision
+
+        Returns:
+            int: Mark of commit, None if there is none or the branch was deleted
+        """
+        revisions: list[int] = self.commitRevisions.get(ref, [])
+        index: int = bisect.bisect_right(revisions, revision)
+        if 0 == index:
+            return None
+        return self.commitMarks[ref][index - 1]
+
+    def commitPending(self: object) -> None:
+        """Write one commit per ref for the changes collected of the current revision"""
+        if None == self.commitInfo:
+            return
+        for ref, commands in self.commands.items():
+            if not commands:
+                continue
+            actor = self.githandler.gitGetActor(self.commitInfo.author)
+            author: str = "{} <{}>".format(actor.name, actor.email)
+            date: int = int(self.commitInfo.date.timestamp())
+            if self.lfs.isActive():
+                self.lfsAttributesSet(ref, commands)
+            mark: int = self.fastimport.commit(ref, author, date, self.commitInfo.commitmsg, commands)
+            self.commitRecord(ref, self.commitInfo.revision, mark)
+            if self.branch == ref:
+                self.revmapMarks.append((self.commitInfo.revision, mark))
+            self.commitCount += 1
+            logging.info("Revision [%s] imported on [%s]", "{}".format(self.commitInfo.revision), "{}".format(ref))
+        if not any(self.commands.values()):
+            logging.debug("Revision [%s] contains no changes, skipped", "{}".format(self.commitInfo.revision))
+        self.commitInfo = None
+        self.commands = {}
+        self.pending = {}
+
+    def commitRecord(self: object, ref: str, revision: int, mark: int) -> None:
+        """Remember commit of a ref for later lookups by revision
+
+        Args:
+            ref (str): Ref of branch
+            revision (int): SVN revision
+            mark (int): Mark of commit, None if the branch is deleted
+        """
+        revisions: list[int] = self.commitRevisions.setdefault(ref, [])
+        marks: list[int] = self.commitMarks.setdefault(ref, [])
+        if revisions and revision == revisions[-1]:
+            marks[-1] = mark
+            return
+        revisions.append(revision)
+        marks.append(mark)
+
+    def deltaSource(self: object, entry: tuple[str, str, str]):
+        """Open content of a file as source of a delta, LFS pointers are resolved to their objects
+
+        Content exceeding CHUNK_SIZE is spooled to a temporary file.
+
+        Args:
+            entry (tuple[str, str, str]): Mode, type and dataref of file, None if there is no previous content
+
+        Returns:
+            Seekable binary stream positioned at the start of the content
+        """
+        source = tempfile.SpooledTemporaryFile(max_size=TS2GSVNDUMP.CHUNK_SIZE)
+        if None == entry:
+            return source
+        if self.MODE_SYMLINK == entry[0]:
+            source.write(b"link ")
+        for chunk in self.fastimport.catBlobChunks(entry[2]):
+            source.write(chunk)
+        if self.lfs.isActive() and source.tell() <= self.lfs.POINTER_MAX_SIZE:
+            source.seek(0)
+            objectPath: str = self.lfs.pointerObject(source.read())
+            if objectPath:
+                source.close()
+                return open(objectPath, "rb")
+        source.seek(0)
+        return source
+
+    def determineDumpCommand(self: object) -> list[str]:
+        """Build command creating the dump stream
+
+        Local repositories are dumped with svnadmin, remote ones with svnrdump.
+
+        Returns:
+            list[str]: Argument vector of dump command
+        """
+        revisionLimit: int = int(self.config.value_get("SVN", "revision_limit"))
+        revisionRange: str = "0:HEAD" if 0 == revisionLimit else "0:{}".format(revisionLimit)
+        root: str = self.svnhandler.getRepositoryRoot()
+        if root.startswith("file://"):
+            self.pathsRelative = False
+            rootPath: str = urllib.request.url2pathname(urllib.parse.urlparse(root).path)
+            return ["svnadmin", "dump", "--quiet", "-r", revisionRange, rootPath]
+        self.pathsRelative = True
+        return [
+            "svnrdump",
+            "dump",
+            "--quiet",
+            "--non-interactive",
+            "--no-auth-cache",
+            "--username",
+            self.config.value_get("SVN", "user"),
+            "--password",
+            self.config.value_get("SVN", "password"),
+            "-r",
+            revisionRange,
+            self.svnhandler.getRepositoryUrl(),
+        ]
+
+    def determineMode(self: object, properties: dict[str, str]) -> str:
+        """Determine git file mode from SVN properties
+
+        Args:
+            properties (dict[str, str]): SVN properties of file
+
+        Returns:
+            str: Git file mode
+        """
+        if "svn:special" in properties:
+            return self.MODE_SYMLINK
+        if "svn:executable" in properties:
+            return self.MODE_EXECUTABLE
+        return self.MODE_FILE
+
+    def determineModeProperties(self: object, mode: str) -> dict[str, str]:
+        """Determine SVN properties relevant for git from git file mode
+
+        Args:
+            mode (str): Git file mode
+
+        Returns:
+            dict[str, str]: SVN properties
+        """
+        if self.MODE_SYMLINK == mode:
+            return {"svn:special": "*"}
+        if self.MODE_EXECUTABLE == mode:
+            return {"svn:executable": "*"}
+        return {}
+
+    def entryCommitted(self: object, ref: str, revision: int, path: str) -> tuple[str, str, str]:
+        """Look up path in the last commit of a ref made at or before revision
+
+        Args:
+            ref (str): Ref of branch
+            revision (int): SVN revision
+            path (str): Path relative to branch
+
+        Returns:
+            tuple[str, str, str]: Mode, type and SHA of path, None if path is missing
+        """
+        mark: int = self.commitMark(ref, revision)
+        if None == mark:
+            return None
+        return self.fastimport.ls(":{}".format(mark), path)
+
+    def entryCurrent(self: object, ref: str, path: str) -> tuple[str, str, str]:
+        """Look up path in the state of a ref including the changes of the current revision
+
+        Args:
+            ref (str): Ref of branch
+            path (str): Path relative to branch
+
+        Returns:
+            tuple[str, str, str]: Mode, type and dataref of path, None if path is missing
+        """
+        pending: dict[str, tuple[str, str, str]] = self.pending.get(ref, {})
+        if path in pending:
+            return pending[path]
+        parts: list[str] = path.split("/")
+        for index in range(len(parts) - 1, 0, -1):
+            parent: str = "/".join(parts[:index])
+            if parent not in pending:
+                continue
+            entry: tuple[str, str, str] = pending[parent]
+            if None == entry or self.MODE_TREE != entry[0]:
+                return None
+            return self.fastimport.ls(entry[2], "/".join(parts[index:]))
+        return self.entryCommitted(ref, self.commitInfo.revision, path)
+
+    def entryDelete(self: object, ref: str, path: str) -> None:
+        """Delete path from current revision of a ref
+
+        Args:
+            ref (str): Ref of branch
+            path (str): Path relative to branch
+        """
+        pending: dict[str, tuple[str, str, str]] = self.pending.setdefault(ref, {})
+        for pendingPath in [p for p in pending if p.startswith(path + "/")]:
+            del pending[pendingPath]
+        pending[path] = None
+        self.commands.setdefault(ref, []).append(self.fastimport.fileDelete(path))
+        lfsPaths: set[str] = self.lfsPaths.get(ref, set())
+        for lfsPath in [p for p in lfsPaths if p == path or p.startswith(path + "/")]:
+            lfsPaths.discard(lfsPath)
+
+    def entryMaterialize(self: object, ref: str, path: str, kind: str, url: str, revision: int) -> tuple[str, str, str]:
+        """Read a copy source which is not part of the import from the repository and set it as content of path
+
+        Files of a copied folder are left out if the path filter excludes them.
+
+        Args:
+            ref (str): Ref of branch
+            path (str): Path relative to branch, empty for the root folder
+            kind (str): Kind of copy source, file or dir
+            url (str): URL of copy source
+            revision (int): Revision of copy source
+
+        Returns:
+            tuple[str, str, str]: Mode, type and dataref of a copied file, None for a folder
+        """
+        session = self.svnhandler.session
+        files: list[str] = [""]
+        depth: str = "empty"
+        if "dir" == kind:
+            files = [entryPath for entryPath, entryKind, _ in session.list(url, revision) if "file" == entryKind]
+            depth = "infinity"
+        properties: dict[str, dict[str, str]] = {}
+        for name in ["svn:executable", "svn:special"]:
+            for propertyUrl, value in session.propget(name, url, depth, revision).items():
+                properties.setdefault(propertyUrl[len(url) :].strip("/"), {})[name] = value
+        entry: tuple[str, str, str] = None
+        for filePath in files:
+            target: str = "/".join(filter(None, [path, filePath]))
+            if self.pathfilter.isExcluded(target, False):
+                continue
+            data: bytes = session.cat("/".join(filter(None, [url, urllib.parse.quote(filePath)])), revision)
+            mode: str = self.determineMode(properties.get(urllib.parse.quote(filePath), {}))
+            if self.MODE_SYMLINK == mode:
+                data = data[5:] if data.startswith(b"link ") else data
+                dataref: str = ":{}".format(self.fastimport.blobData(data))
+            else:
+                dataref: str = self.blobWrite(ref, target, len(data), [data])
+            self.entrySet(ref, target, mode, dataref)
+            entry = (mode, "blob", dataref)
+        logging.info("Revision [%s] reads [%s] files of [%s@%s] from the repository", "{}".format(self.commitInfo.revision), "{}".format(len(files)), "{}".format(url), "{}".format(revision))
+        return None if "dir" == kind else entry
+
+    def entrySet(self: object, ref: str, path: str, mode: str, dataref: str) -> None:
+        """Set content of path in current revision of a ref
+
+        Args:
+            ref (str): Ref of branch
+            path (str): Path relative to branch, empty for the root folder
+            mode (str): Git file mode
+            dataref (str): Mark or SHA of content
+        """
+        kind: str = "tree" if self.MODE_TREE == mode else "blob"
+        self.pending.setdefault(ref, {})[path] = (mode, kind, dataref)
+        self.commands.setdefault(ref, []).append(self.fastimport.fileModify(mode, dataref, path))
+
+    def lfsAttributesSet(self: object, ref: str, commands: list[bytes]) -> None:
+        """Add file command writing .gitattributes if the LFS files of a ref changed
+
+        Args:
+            ref (str): Ref of branch
+            commands (list[bytes]): File commands of next commit of ref
+        """
+        attributes: bytes = self.lfs.attributes(self.lfsPaths.get(ref, set()))
+        if attributes == self.lfsAttributes.get(ref):
+            return
+        commands.append(self.fastimport.fileModify(self.MODE_FILE, ":{}".format(self.fastimport.blobData(attributes)), self.lfs.ATTRIBUTES))
+        self.lfsAttributes[ref] = attributes
+
+    def lfsPathsCopy(self: object, sourceRef: str, sourcePath: str, ref: str, path: str) -> None:
+        """Take LFS files of a copied file or folder over to the copy
+
+        Args:
+            sourceRef (str): Ref of branch copied from
+            sourcePath (str): Path relative to source branch
+            ref (str): Ref of branch copied to
+            path (str): Path relative to branch
+        """
+        sourcePaths: set[str] = self.lfsPaths.get(sourceRef, set())
+        lfsPaths: set[str] = self.lfsPaths.setdefault(ref, set())
+        for lfsPath in list(sourcePaths):
+            if lfsPath == sourcePath:
+                lfsPaths.add(path)
+            elif not sourcePath or lfsPath.startswith(sourcePath + "/"):
+                lfsPaths.add("/".join(filter(None, [path, lfsPath[len(sourcePath) :].strip("/")])))
+
+    def process(self: object) -> bool:
+        """Convert the whole repository using the dump stream
+
+        Returns:
+            bool: False on any failure, otherwise true
+        """
+        self.prefix = self.svnhandler.getRepositoryPrefix()
+        if not self.svnhandler.getRepositoryRoot():
+            return False
+        cmdArgs: list[str] = self.determineDumpCommand()
+        logging.info("Read dump stream of [%s]", "{}".format(self.svnhandler.getRepositoryUrl()))
+
+        process_start: float = time.time()
+        proc = self.svnhandler.session.cmd.start(cmdArgs, cmdArgs[0], stdout=subprocess.PIPE)
+        self.fastimport.start()
+        try:
+            dump: TS2GSVNDUMP = TS2GSVNDUMP(proc.stdout)
+            for record in dump.records():
+                if "Revision-number" in record.headers:
+                    self.commitPending()
+                    self.processRevision(record)
+                elif "Node-path" in record.headers:
+                    self.processNode(dump, record)
+            self.commitPending()
+        finally:
+            proc.stdout.close()
+            dumpResult: int = self.svnhandler.session.cmd.reap(proc)
+            importResult: bool = self.fastimport.finish()
+        process_end: float = time.time()
+        process_duration: float = process_end - process_start
+        refs: int = len([ref for ref, marks in self.commitMarks.items() if None != marks[-1]])
+        logging.info(f"Dump stream with [{self.commitCount}] commits on [{refs}] refs imported within [{process_duration:.2f}] seconds")
+
+        if 0 != dumpResult:
+            logging.error("Dump command failed with exit code [%s]", "{}".format(dumpResult))
+            return False
+        if not importResult:
+            return False
+        if None != self.revmap:
+            marks: dict[int, str] = self.fastimport.marks()
+            for revision, mark in self.revmapMarks:
+                self.revmap.append(revision, marks[mark])
+        if None != self.commitMark(self.branch, sys.maxsize):
+            self.githandler.gitCheckoutHead()
+        return True
+
+    def processNode(self: object, dump: TS2GSVNDUMP, record: TS2GSVNDUMPRecord) -> None:
+        """Convert node record of dump stream into file commands
+
+        Args:
+            dump (TS2GSVNDUMP): Dump stream the record belongs to
+            record (TS2GSVNDUMPRecord): Node record
+        """
+        if None == self.commitInfo:
+            return
+        path: str = self.relativePath(record.header("Node-path"))
+        if not path:
+            return
+        ref, path = self.branchSplit(path)
+        if None == ref:
+            logging.debug("Path [%s] is outside of the branches, skipped", "{}".format(record.header("Node-path")))
+            return
+        if self.pathfilter.isExcluded(path, "file" != record.header("Node-kind")):
+            logging.debug("Path [%s] is excluded by the path filter, skipped", "{}".format(record.header("Node-path")))
+            return
+        action: str = record.header("Node-action")
+        kind: str = record.header("Node-kind")
+
+        if "delete" == action or "replace" == action:
+            if not path:
+                self.branchDelete(ref)
+            else:
+                self.entryDelete(ref, path)
+            if "delete" == action:
+                return
+
+        copyEntry: tuple[str, str, str] = None
+        copyUrl: str = None
+        if "Node-copyfrom-path" in record.headers:
+            copyPath: str = self.relativePath(record.header("Node-copyfrom-path"))
+            copyRevision: int = int(record.header("Node-copyfrom-rev"))
+            copyRef: str = None
+            if None != copyPath:
+                copyRef, copyPath = self.branchSplit(copyPath)
+            # The dump stream has no content of sources which are not imported
+            if None == copyRef:
+                logging.debug("Copy source [%s] of [%s] is outside of converted path", "{}".format(record.header("Node-copyfrom-path")), "{}".format(record.header("Node-path")))
+                copyUrl = self.sourceUrl(record.header("Node-copyfrom-path"))
+            elif self.pathfilter.isExcluded(copyPath, "file" != record.header("Node-kind")):
+                logging.debug("Copy source [%s] of [%s] is excluded by the path filter", "{}".format(record.header("Node-copyfrom-path")), "{}".format(record.header("Node-path")))
+                copyUrl = self.sourceUrl(record.header("Node-copyfrom-path"))
+            elif not path and not copyPath and self.branchCreate(ref, copyRef, copyRevision):
+                return
+            else:
+                copyEntry = self.entryCommitted(copyRef, copyRevision, copyPath)
+
+        if "dir" == kind:
+            if not path:
+                self.lfsPaths[ref] = set()
+                self.lfsAttributes.pop(ref, None)
+            if None != copyUrl:
+                self.entryMaterialize(ref, path, kind, copyUrl, copyRevision)
+            elif None != copyEntry and self.MODE_TREE == copyEntry[0]:
+                self.entrySet(ref, path, self.MODE_TREE, copyEntry[2])
+                self.lfsPathsCopy(copyRef, copyPath, ref, path)
+            return
+        if not path:
+            return
+
+        if None != copyUrl:
+            copyEntry = self.entryMaterialize(ref, path, kind, copyUrl, copyRevision)
+        baseEntry: tuple[str, str, str] = copyEntry
+        if None == baseEntry and "change" == action:
+            baseEntry = self.entryCurrent(ref, path)
+
+        properties: dict[str, str] = {} if None == baseEntry else self.determineModeProperties(baseEntry[0])
+        if None != record.properties:
+            if not record.isPropertyDelta():
+                properties = {}
+            properties.update(record.properties)
+            for name in record.propertiesDeleted:
+                properties.pop(name, None)
+        mode: str = self.determineMode(properties)
+
+        if 0 > record.textLength:
+            if None != baseEntry:
+                self.entrySet(ref, path, mode, baseEntry[2])
+            if None != copyEntry:
+                self.lfsPathsCopy(copyRef, copyPath, ref, path)
+            return
+
+        if record.isTextDelta():
+            with self.deltaSource(baseEntry) as source, tempfile.SpooledTemporaryFile(max_size=TS2GSVNDUMP.CHUNK_SIZE) as target:
+                length: int = svndiffApplyStream(dump.readTextPart, record.textLength, source, target)
+                target.seek(0)
+                if self.MODE_SYMLINK == mode:
+                    data: bytes = target.read()
+                    data = data[5:] if data.startswith(b"link ") else data
+                    self.entrySet(ref, path, mode, ":{}".format(self.fastimport.blobData(data)))
+                else:
+                    self.entrySet(ref, path, mode, self.blobWrite(ref, path, length, iter(lambda: target.read(TS2GSVNDUMP.CHUNK_SIZE), b"")))
+        elif self.MODE_SYMLINK == mode:
+            data: bytes = dump.readText()
+            data = data[5:] if data.startswith(b"link ") else data
+            self.entrySet(ref, path, mode, ":{}".format(self.fastimport.blobData(data)))
+        else:
+            self.entrySet(ref, path, mode, self.blobWrite(ref, path, record.textLength, dump.readTextChunks()))
+
+    def processRevision(self: object, record: TS2GSVNDUMPRecord) -> None:
+        """Start collecting changes of a new revision
+
+        Args:
+            record (TS2GSVNDUMPRecord): Revision record
+        """
+        revision: int = int(record.header("Revision-number"))
+        properties: dict[str, str] = {} if None == record.properties else record.properties
+        if 0 == revision or "svn:date" not in properties:
+            return
+        self.commitInfo = self.svnhandler.createCommitInfoFromValues(properties.get("svn:author"), properties["svn:date"], properties.get("svn:log"), revision)
+        logging.debug(self.commitInfo)
+
+    def relativePath(self: object, path: str) -> str:
+        """Convert path of dump stream into path relative to converted folder
+
+        Args:
+            path (str): Path as given in dump stream
+
+        Returns:
+            str: Relative path, empty for converted folder itself, None if outside of converted folder
+        """
+        path = path.strip("/")
+        if not self.prefix:
+            return path
+        if path == self.prefix:
+            return ""
+        if path.startswith(self.prefix + "/"):
+            return path[len(self.prefix) + 1 :]
+        if self.pathsRelative:
+            return path
+        return None
+
+    def sourceUrl(self: object, path: str) -> str:
+        """Convert path of dump stream into URL, e.g. of a copy source
+
+        Args:
+            path (str): Path as given in dump stream
+
+        Returns:
+            str: URL of path
+        """
+        base: str = self.svnhandler.getRepositoryUrl() if self.pathsRelative else self.svnhandler.getRepositoryRoot()
+        return "/".join(filter(None, [base.rstrip("/"), urllib.parse.quote(path.strip("/"))]))
@@ -0,0 +1,384 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import bisect
+import copy
+import json
+import logging
+import os
+import posixpath
+import re
+import shlex
+import urllib.parse
+
+import git
+
+from ts2g.ts2gconfig import TS2GConfig
+from ts2g.ts2gos import TS2GOS
+from ts2g.ts2grevmap import TS2GREVMAP
+from ts2g.ts2gsvn import TS2GSVN
+from ts2g.ts2gsvnchange import TS2GSVNchange
+from ts2g.ts2gsvninfo import TS2GSVNinfo
+
+
+class TS2GEXTERNALS:
+    """
+    Class to detect svn:externals of the checkout and to record them as git submodules
+
+    The definitions are read from the properties of the SVN checkout. Checked out
+    externals are not covered by the changed paths of a revision, as submodules
+    the checkout is updated without them. Each external URL is converted once per cycle into
+    a repository of its own, a mirror kept in the workspace across runs. The commit
+    of a pinned or current revision is looked up in the rev-map of that repository.
+    """
+
+    PROPERTY = "svn:externals"
+
+    def __init__(self: object, config: TS2GConfig, oshandler: TS2GOS, svnhandler: TS2GSVN) -> None:
+        """Default constructor
+
+        Args:
+            config (TS2GConfig): Config options
+            oshandler (TS2GOS): Encapsulated os functions
+            svnhandler (TS2GSVN): Subversion operations of the parent repository
+        """
+        self.config: TS2GConfig = config
+        self.oshandler: TS2GOS = oshandler
+        self.svnhandler: TS2GSVN = svnhandler
+        self.active: bool = "submodule" == self.config.value_get("SVN", "externals").lower()
+        self.workers: int = max(1, int(self.config.value_get("SVN", "externals_workers")))
+        self.urlTemplate: str = self.config.value_get("GIT", "submodule_url")
+        self.base: str = "externals_" + self.config.value_get("GIT", "project")
+        self.namesFile: str = self.oshandler.workspaceFolderGet(self.base + ".json")
+        self.names: dict[str, str] = {}
+        if self.active and os.path.isfile(self.namesFile):
+            with open(self.namesFile, "r", encoding="utf-8") as names:
+                self.names = json.load(names)
+        self.definitions: dict[str, list[tuple[str, str, int]]] = {}
+        self.repositories: dict[str, tuple[str, TS2GREVMAP]] = {}
+        self.commits: dict[str, tuple[list[int], list[str]]] = {}
+        self.resolved: dict[tuple, str] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def configCreate(self: object, url: str) -> TS2GConfig:
+        """Create config of the conversion of an external, it continues the mirror of a previous run
+
+        Args:
+            url (str): URL of external
+
+        Returns:
+            TS2GConfig: Config options
+        """
+        config: TS2GConfig = copy.deepcopy(self.config)
+        config.add("GIT", "project", self.nameGet(url))
+        config.add("SVN", "exclude", [])
+        config.add("SVN", "externals", "checkout")
+        config.add("SVN", "include", [])
+        config.add("SVN", "layout", "single")
+        config.add("SVN", "repositoryurl", url)
+        config.add("SVN", "revision_limit", 0)
+        config.add("TS2G", "engine", "checkout")
+        config.add("TS2G", "mirror", "yes")
+        config.add("TS2G", "mirror_interval", 0)
+        config.add("TS2G", "plan", "no")
+        config.add("TS2G", "resume", "no")
+        config.add("TS2G", "segments", 1)
+        config.add("TS2G", "workspace", self.oshandler.workspaceFolderGet(self.base))
+        for role in TS2GOS.ROLES:
+            if "" != self.config.value_get("TS2G", "workspace_" + role):
+                config.add("TS2G", "workspace_" + role, os.path.join(self.config.value_get("TS2G", "workspace_" + role), self.base))
+        return config
+
+    def definitionsDelete(self: object, folder: str) -> None:
+        """Forget definitions of a folder and of all folders below
+
+        Args:
+            folder (str): Folder relative to repository URL
+        """
+        for path in [path for path in self.definitions if path == folder or path.startswith(folder + "/")]:
+            del self.definitions[path]
+
+    def definitionsParse(self: object, folder: str, value: str) -> list[tuple[str, str, int]]:
+        """Parse value of svn:externals of a folder, old and new format are accepted
+
+        Args:
+            folder (str): Folder having the property, relative to repository URL
+            value (str): Value of property
+
+        Returns:
+            list[tuple[str, str, int]]: Path relative to repository URL, absolute URL and pinned revision, None if not pinned
+        """
+        definitions: list[tuple[str, str, int]] = []
+        for line in value.splitlines():
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                tokens: list[str] = shlex.split(line)
+            except ValueError:
+                tokens = line.split()
+            revision: int = None
+            words: list[str] = []
+            index: int = 0
+            while index < len(tokens):
+                if "-r" == tokens[index] and index + 1 < len(tokens) and tokens[index + 1].isdigit():
+                    revision = int(tokens[index + 1])
+                    index += 2
+                    continue
+                if re.fullmatch(r"-r\d+", tokens[index]):
+                    revision = int(tokens[index][2:])
+                else:
+                    words.append(tokens[index])
+                index += 1
+            if 2 != len(words):
+                logging.warning("Cannot parse external [%s] of [%s]", "{}".format(line), "{}".format(folder))
+                continue
+            # New format starts with the URL, old format with the path
+            if self.isUrl(words[0]):
+                url, path = words
+            else:
+                path, url = words
+            peg: re.Match = re.search(r"@(\d+)$", url)
+            if None != peg:
+                url = url[: peg.start()]
+                if None == revision:
+                    revision = int(peg.group(1))
+            path = posixpath.normpath(posixpath.join(folder, path)).strip("/")
+            if path.startswith(".."):
+                logging.warning("External [%s] of [%s] points outside of the repository URL", "{}".format(line), "{}".format(folder))
+                continue
+            definitions.append((path, self.urlResolve(folder, url), revision))
+        return definitions
+
+    def detect(self: object, pathCheckout: str, changedpaths: list[TS2GSVNchange]) -> None:
+        """Update definitions from the folders of the checkout changed by a revision
+
+        Args:
+            pathCheckout (str): Full os path of SVN checkout
+            changedpaths (list[TS2GSVNchange]): Changed paths of revision, None to read all definitions
+        """
+        folders: list[tuple[str, str]] = []
+        if None == changedpaths or any("" == change.path and "M" != change.action for change in changedpaths):
+            self.definitions = {}
+            folders.append(("", "infinity"))
+        else:
+            added: list[str] = []
+            for change in sorted(changedpaths, key=lambda change: change.path):
+                if change.action in ("D", "R"):
+                    self.definitionsDelete(change.path)
+                if "D" == change.action or any(change.path.startswith(path + "/") for path in added):
+                    continue
+                pathFolder: str = os.path.join(pathCheckout, change.path)
+                if not os.path.isdir(pathFolder) or os.path.islink(pathFolder):
+                    continue
+                if "M" == change.action:
+                    self.definitions.pop(change.path, None)
+                    folders.append((change.path, "empty"))
+                else:
+                    added.append(change.path)
+                    folders.append((change.path, "infinity"))
+        for folder, depth in folders:
+            for pathFolder, value in self.svnhandler.session.propget(self.PROPERTY, os.path.join(pathCheckout, folder), depth).items():
+                path: str = os.path.relpath(pathFolder, pathCheckout).replace(os.sep, "/")
+                path = "" if "." == path else path
+                definitions: list[tuple[str, str, int]] = self.definitionsParse(path, value)
+                if definitions:
+                    self.definitions[path] = definitions
+
+    def isActive(self: object) -> bool:
+        """Check if externals are recorded as submodules
+
+        Returns:
+            bool: True if externals become submodules, False if they are checked out
+        """
+        return self.active
+
+    def isCheckedOut(self: object) -> bool:
+        """Check if the checkout contains externals, their changes are not part of the changed paths
+
+        Returns:
+            bool: True if externals are checked out and defined, otherwise False
+        """
+        return not self.active and 0 < len(self.definitions)
+
+    def isUrl(self: object, word: str) -> bool:
+        """Check if a word of a definition is an absolute or relative URL
+
+        Args:
+            word (str): Word of definition
+
+        Returns:
+            bool: True for URLs, otherwise False
+        """
+        return "://" in word or word.startswith(("^/", "/", "../"))
+
+    def logStatistics(self: object) -> None:
+        """Log number of externals and of lookups served from the cache"""
+        if not self.active:
+            return
+        logging.info("Summary: [%s] externals converted, [%s] commit lookups, [%s] from cache", "{}".format(len(self.repositories)), "{}".format(self.hits + self.misses), "{}".format(self.hits))
+
+    def nameGet(self: object, url: str) -> str:
+        """Determine name of the repository of an external, it stays the same across runs
+
+        Args:
+            url (str): URL of external
+
+        Returns:
+            str: Name of repository
+        """
+        if url in self.names:
+            return self.names[url]
+        parts: list[str] = [part for part in urllib.parse.unquote(urllib.parse.urlparse(url).path).split("/") if part]
+        if 1 < len(parts) and "trunk" == parts[-1]:
+            parts.pop()
+        name: str = re.sub(r"[^A-Za-z0-9._-]", "_", parts[-1] if parts else "external")
+        candidate: str = name
+        while candidate in self.names.values():
+            candidate = "{}-{}".format(name, len(self.names))
+        self.names[url] = candidate
+        return candidate
+
+    def pending(self: object) -> list[str]:
+        """Determine URLs defined as externals which are not converted in this cycle
+
+        Returns:
+            list[str]: URLs of externals
+        """
+        urls: set[str] = {url for definitions in self.definitions.values() for _, url, _ in definitions}
+        return sorted(urls - set(self.repositories))
+
+    def repositoryAdd(self: object, url: str, gitDirectory: str, revmapFile: str) -> None:
+        """Record converted repository of an external
+
+        Args:
+            url (str): URL of external
+            gitDirectory (str): Full os path of .git folder of its repository
+            revmapFile (str): Full os path of its rev-map
+        """
+        self.repositories[url] = (gitDirectory, TS2GREVMAP(revmapFile))
+
+    def reset(self: object) -> None:
+        """Convert externals again in the next cycle, e.g. to pick up new revisions in mirror mode"""
+        self.repositories = {}
+        self.commits = {}
+        self.resolved = {}
+
+    def resolve(self: object, commitInfo: TS2GSVNinfo) -> dict[str, tuple[str, str]]:
+        """Look up the commits the externals of a revision refer to
+
+        Args:
+            commitInfo (TS2GSVNinfo): SVN Commit info object of parent revision
+
+        Returns:
+            dict[str, tuple[str, str]]: URL of submodule and SHA of commit by path
+        """
+        submodules: dict[str, tuple[str, str]] = {}
+        for definitions in self.definitions.values():
+            for path, url, revision in definitions:
+                if self.svnhandler.pathfilter.isExcluded(path, True):
+                    continue
+                sha: str = self.shaGet(url, revision, commitInfo)
+                if None == sha:
+                    logging.warning("External [%s] at [%s] has no commit for revision [%s], left out", "{}".format(url), "{}".format(path), "{}".format(commitInfo.revision))
+                    continue
+                submodules[path] = (self.urlTemplate.format(name=self.nameGet(url), url=url), sha)
+        return submodules
+
+    def save(self: object) -> None:
+        """Write names of the repositories of the externals atomically"""
+        try:
+            namesTemp: str = self.namesFile + ".tmp"
+            with open(namesTemp, "w", encoding="utf-8") as names:
+                json.dump(self.names, names, indent=4)
+            os.replace(namesTemp, self.namesFile)
+        except Exception as ex:
+            logging.error("Exception [%s]", "{}".format(ex))
+
+    def shaGet(self: object, url: str, revision: int, commitInfo: TS2GSVNinfo) -> str:
+        """Look up commit of an external at a pinned revision or at the time of the parent revision
+
+        Args:
+            url (str): URL of external
+            revision (int): Pinned revision, None if not pinned
+            commitInfo (TS2GSVNinfo): SVN Commit info object of parent revision
+
+        Returns:
+            str: SHA of commit, None if the external has none at that time
+        """
+        # Revisions of the same repository are comparable, otherwise the date decides
+        if None == revision and url.startswith(self.svnhandler.getRepositoryRoot() + "/"):
+            revision = commitInfo.revision
+        key: tuple = (url, revision) if None != revision else (url, int(commitInfo.date.timestamp()))
+        if key in self.resolved:
+            self.hits += 1
+            return self.resolved[key]
+        self.misses += 1
+        gitDirectory, revmap = self.repositories[url]
+        if None != revision:
+            sha: str = revmap.sha(revision, False)
+        else:
+            if url not in self.commits:
+                repo: git.Repo = git.Repo(gitDirectory)
+                timestamps: list[int] = []
+                shas: list[str] = []
+                for line in repo.git.log("--first-parent", "--reverse", "--format=%ct %H").splitlines():
+                    timestamp, sha = line.split()
+                    timestamps.append(int(timestamp))
+                    shas.append(sha)
+                repo.close()
+                self.commits[url] = (timestamps, shas)
+            timestamps, shas = self.commits[url]
+            index: int = bisect.bisect_right(timestamps, key[1])
+            sha: str = shas[index - 1] if 0 < index else None
+        self.resolved[key] = sha
+        return sha
+
+    def urlResolve(self: object, folder: str, url: str) -> str:
+        """Make URL of a definition absolute
+
+        Args:
+            folder (str): Folder having the property, relative to repository URL
+            url (str): Absolute URL or relative to the folder (../), the repository root (^/), the scheme (//) or the server (/)
+
+        Returns:
+            str: Absolute URL without trailing slash
+        """
+        if "://" in url:
+            return url.rstrip("/")
+        base: str = "/".join(filter(None, [self.svnhandler.getRepositoryUrl(), urllib.parse.quote(folder)]))
+        if url.startswith("^/"):
+            base = self.svnhandler.getRepositoryRoot()
+            url = url[2:]
+        elif url.startswith("//"):
+            return (urllib.parse.urlparse(base).scheme + ":" + url).rstrip("/")
+        elif url.startswith("/"):
+            parts = urllib.parse.urlparse(base)
+            return (parts.scheme + "://" + parts.netloc + url).rstrip("/")
+        parts = urllib.parse.urlparse(base)
+        path: str = posixpath.normpath(posixpath.join(parts.path or "/", url))
+        return urllib.parse.urlunparse(parts._replace(path=path)).rstrip("/")
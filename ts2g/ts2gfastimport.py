@@ -0,0 +1,242 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import os
+import subprocess
+
+from ts2g.ts2gcmd import TS2GCMD
+
+
+class TS2GFASTIMPORT:
+    """
+    Class to feed a git fast-import process
+    """
+
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self: object, gitDirectory: str, cmd: TS2GCMD) -> None:
+        """Default constructor
+
+        Args:
+            gitDirectory (str): Full os path of the .git folder to import into
+            cmd (TS2GCMD): Runner of git commands
+        """
+        self.gitDirectory: str = gitDirectory
+        self.cmd: TS2GCMD = cmd
+        self.process: subprocess.Popen = None
+        self.markLast: int = 0
+        self.marksFile: str = os.path.join(gitDirectory, "ts2g-marks")
+
+    def blob(self: object, length: int, chunks) -> int:
+        """Write blob whose content is streamed in chunks
+
+        Args:
+            length (int): Total length of content
+            chunks: Iterable providing the content as bytes
+
+        Returns:
+            int: Mark of blob
+        """
+        mark: int = self.markNext()
+        self.write("blob\nmark :{}\ndata {}\n".format(mark, length).encode("utf-8"))
+        for chunk in chunks:
+            self.process.stdin.write(chunk)
+        self.write(b"\n")
+        return mark
+
+    def blobData(self: object, data: bytes) -> int:
+        """Write blob with content in memory
+
+        Args:
+            data (bytes): Content of blob
+
+        Returns:
+            int: Mark of blob
+        """
+        return self.blob(len(data), [data])
+
+    def catBlobChunks(self: object, dataref: str):
+        """Read content of existing blob in chunks of bounded size
+
+        The content must be consumed completely before the next command is written.
+
+        Args:
+            dataref (str): Mark or SHA of blob
+
+        Yields:
+            bytes: Next chunk of content
+        """
+        self.write("cat-blob {}\n".format(dataref).encode("utf-8"))
+        self.process.stdin.flush()
+        header: list[str] = self.process.stdout.readline().decode("utf-8").split()
+        if 3 != len(header) or "blob" != header[1]:
+            raise ValueError("Unexpected cat-blob response [{}]".format(" ".join(header)))
+        remaining: int = int(header[2])
+        while 0 < remaining:
+            chunk: bytes = self.process.stdout.read(min(self.CHUNK_SIZE, remaining))
+            if not chunk:
+                raise EOFError("Unexpected end of cat-blob response, [{}] bytes missing".format(remaining))
+            remaining -= len(chunk)
+            yield chunk
+        self.process.stdout.read(1)
+
+    def commit(self: object, ref: str, author: str, date: int, message: str, commands: list[bytes], parent: str = None) -> int:
+        """Write commit with given file commands
+
+        Args:
+            ref (str): Name of ref to commit on, e.g. refs/heads/master
+            author (str): Author in format "name <email>"
+            date (int): Seconds since epoch
+            message (str): Commit message
+            commands (list[bytes]): File commands created by fileModify and fileDelete
+            parent (str, optional): Dataref of parent commit, None to continue ref. Defaults to None.
+
+        Returns:
+            int: Mark of commit
+        """
+        mark: int = self.markNext()
+        messageRaw: bytes = message.encode("utf-8")
+        self.write("commit {}\nmark :{}\n".format(ref, mark).encode("utf-8"))
+        self.write("author {} {} +0000\ncommitter {} {} +0000\n".format(author, date, author, date).encode("utf-8"))
+        self.write("data {}\n".format(len(messageRaw)).encode("utf-8") + messageRaw + b"\n")
+        if None != parent:
+            self.write("from {}\n".format(parent).encode("utf-8"))
+        for command in commands:
+            self.write(command)
+        self.write(b"\n")
+        return mark
+
+    def fileDelete(self: object, path: str) -> bytes:
+        """Create file command to delete a path
+
+        Args:
+            path (str): Path to delete
+
+        Returns:
+            bytes: File command
+        """
+        return "D {}\n".format(self.quotePath(path)).encode("utf-8")
+
+    def fileModify(self: object, mode: str, dataref: str, path: str) -> bytes:
+        """Create file command to set content of a path
+
+        Args:
+            mode (str): Git file mode like 100644
+            dataref (str): Mark or SHA of content
+            path (str): Path to modify
+
+        Returns:
+            bytes: File command
+        """
+        return "M {} {} {}\n".format(mode, dataref, self.quotePath(path)).encode("utf-8")
+
+    def finish(self: object) -> bool:
+        """Finish import and wait for git fast-import
+
+        Returns:
+            bool: False on any failure, otherwise True
+        """
+        self.write(b"done\n")
+        self.process.stdin.close()
+        self.process.stdout.close()
+        return 0 == self.cmd.reap(self.process)
+
+    def ls(self: object, dataref: str, path: str) -> tuple[str, str, str]:
+        """Determine mode, type and SHA of a path in an existing commit or tree
+
+        Args:
+            dataref (str): Mark or SHA of commit or tree
+            path (str): Path to look up
+
+        Returns:
+            tuple[str, str, str]: Mode, type and SHA of path, None if path is missing
+        """
+        self.write("ls {} {}\n".format(dataref, self.quotePath(path)).encode("utf-8"))
+        self.process.stdin.flush()
+        response: str = self.process.stdout.readline().decode("utf-8")
+        if response.startswith("missing "):
+            return None
+        mode, kind, sha = response.partition("\t")[0].split()
+        return mode, kind, sha
+
+    def marks(self: object) -> dict[int, str]:
+        """Read SHAs of all marks exported by the finished import, the marks file is removed
+
+        Returns:
+            dict[int, str]: SHA per mark
+        """
+        marks: dict[int, str] = {}
+        with open(self.marksFile, "r", encoding="ascii") as marksFile:
+            for line in marksFile:
+                mark, sha = line.split()
+                marks[int(mark[1:])] = sha
+        os.remove(self.marksFile)
+        return marks
+
+    def markNext(self: object) -> int:
+        """Create next unused mark
+
+        Returns:
+            int: Mark number
+        """
+        self.markLast += 1
+        return self.markLast
+
+    def quotePath(self: object, path: str) -> str:
+        """Quote path in C style as accepted by git fast-import
+
+        Args:
+            path (str): Path to quote
+
+        Returns:
+            str: Quoted path
+        """
+        return '"' + path.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+
+    def reset(self: object, ref: str, parent: str = None) -> None:
+        """Create, move or delete a ref without a commit
+
+        Args:
+            ref (str): Name of ref, e.g. refs/heads/branch
+            parent (str, optional): Dataref of commit the ref points to, None to delete the ref. Defaults to None.
+        """
+        self.write("reset {}\n".format(ref).encode("utf-8"))
+        if None != parent:
+            self.write("from {}\n".format(parent).encode("utf-8"))
+        self.write(b"\n")
+
+    def start(self: object) -> None:
+        """Start git fast-import process"""
+        cmdArgs: list[str] = ["git", "--git-dir", self.gitDirectory, "fast-import", "--quiet", "--done", "--export-marks={}".format(self.marksFile)]
+        self.process = self.cmd.start(cmdArgs, "fast-import", stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def write(self: object, data: bytes) -> None:
+        """Write raw data to git fast-import
+
+        Args:
+            data (bytes): Data to write
+        """
+        self.process.stdin.write(data)
@@ -0,0 +1,221 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import re
+
+
+class TS2GFILTER:
+    """
+    Class to decide by include and exclude glob patterns which paths are converted
+
+    Paths and patterns are relative to the repository URL and use / as separator.
+    Like in .gitignore a pattern without / matches a name in any folder. A * or ?
+    never matches a /, a segment ** matches any number of folders. A pattern
+    matching a folder matches all of its content as well. A pattern whose last
+    segment is a wildcard name with an extension like *.bin is taken for files, it
+    leaves no folder out of the sparse checkout, the files are filtered by the sync.
+    """
+
+    def __init__(self: object, include: list[str], exclude: list[str]) -> None:
+        """Default constructor
+
+        Args:
+            include (list[str]): Glob patterns of converted paths, empty for all paths
+            exclude (list[str]): Glob patterns of paths never converted
+        """
+        self.include: list[str] = [self.patternNormalize(pattern) for pattern in include if pattern.strip("/")]
+        self.exclude: list[str] = [self.patternNormalize(pattern) for pattern in exclude if pattern.strip("/")]
+        self.includeRegex: re.Pattern = self.compile([self.globRegex(pattern) for pattern in self.include], True)
+        self.includeParents: re.Pattern = self.compile([regex for pattern in self.include for regex in self.globParents(pattern)], False)
+        self.excludeRegex: re.Pattern = self.compile([self.globRegex(pattern) for pattern in self.exclude], True)
+        self.excludeFolders: list[str] = [pattern for pattern in self.exclude if not self.isFileOnly(pattern)]
+        self.excludeParents: re.Pattern = self.compile([regex for pattern in self.excludeFolders for regex in self.globParents(pattern)], False)
+        self.includeDepth: int = max([len(pattern.split("/")) for pattern in self.include], default=0) + 1
+
+    def compile(self: object, regexes: list[str], content: bool) -> re.Pattern:
+        """Combine regular expressions of paths into one
+
+        Args:
+            regexes (list[str]): Regular expressions of paths
+            content (bool): True to match the content of matching folders too
+
+        Returns:
+            re.Pattern: Compiled expression, None without any expression
+        """
+        if 0 == len(regexes):
+            return None
+        return re.compile("(?:{}){}".format("|".join(regexes), "(?:/.*)?" if content else ""), re.DOTALL)
+
+    def globParents(self: object, pattern: str) -> list[str]:
+        """Translate glob pattern into regular expressions of the folders leading to it
+
+        Args:
+            pattern (str): Glob pattern
+
+        Returns:
+            list[str]: Regular expressions of parent folders
+        """
+        segments: list[str] = pattern.split("/")
+        return [self.globRegex("/".join(segments[:index])) for index in range(1, len(segments))]
+
+    def globRegex(self: object, pattern: str) -> str:
+        """Translate glob pattern into regular expression of a path
+
+        Args:
+            pattern (str): Glob pattern
+
+        Returns:
+            str: Regular expression
+        """
+        segments: list[str] = pattern.split("/")
+        regex: str = ""
+        separator: str = ""
+        for index, segment in enumerate(segments):
+            if "**" == segment and index == len(segments) - 1:
+                regex += "(?:/.*)?" if separator else ".*"
+            elif "**" == segment:
+                regex += separator + "(?:[^/]+/)*"
+                separator = ""
+                continue
+            else:
+                regex += separator + self.segmentRegex(segment)
+            separator = "/"
+        return regex
+
+    def isActive(self: object) -> bool:
+        """Check if any pattern is configured
+
+        Returns:
+            bool: True if paths are filtered, otherwise False
+        """
+        return None != self.includeRegex or None != self.excludeRegex
+
+    def isExcluded(self: object, path: str, folder: bool) -> bool:
+        """Check if path is not converted
+
+        Folders leading to an included path are not excluded themselves.
+
+        Args:
+            path (str): Path relative to repository URL, empty for the URL itself
+            folder (bool): True if path is a folder or its kind is unknown
+
+        Returns:
+            bool: True if path is filtered, otherwise False
+        """
+        if not path:
+            return False
+        if None != self.excludeRegex and self.excludeRegex.fullmatch(path):
+            return True
+        if None == self.includeRegex or self.includeRegex.fullmatch(path):
+            return False
+        return not folder or None == self.includeParents or None == self.includeParents.fullmatch(path)
+
+    def isFileOnly(self: object, pattern: str) -> bool:
+        """Check if a pattern is meant for files like *.bin
+
+        Args:
+            pattern (str): Glob pattern relative to repository URL
+
+        Returns:
+            bool: True if the last segment is a wildcard name with an extension, otherwise False
+        """
+        return None != re.fullmatch(r"[^/]*[*?][^/]*\.\w+", pattern.rpartition("/")[2])
+
+    def isIncluded(self: object, path: str) -> bool:
+        """Check if path matches an include pattern
+
+        Args:
+            path (str): Path relative to repository URL
+
+        Returns:
+            bool: True if an include pattern matches path, False without include patterns
+        """
+        return None != self.includeRegex and None != self.includeRegex.fullmatch(path)
+
+    def isPartial(self: object, path: str) -> bool:
+        """Check if a folder which is not excluded might contain excluded folders
+
+        Excluded files are left to the sync, so only folders are considered. False
+        is always safe, the folder is checked out completely then.
+
+        Args:
+            path (str): Path of folder relative to repository URL, empty for the URL itself
+
+        Returns:
+            bool: True if folders below folder may be excluded, otherwise False
+        """
+        if self.excludeFolders and (not path or (None != self.excludeParents and self.excludeParents.fullmatch(path))):
+            return True
+        if None == self.includeRegex or (path and self.includeRegex.fullmatch(path)):
+            return False
+        # No literal segment matches the name of the probe, a wildcard covering it covers all names
+        for depth in range(1, self.includeDepth + 1):
+            probe: str = "/".join(filter(None, [path] + ["\0"] * depth))
+            if None == self.includeRegex.fullmatch(probe) and (None == self.includeParents or None == self.includeParents.fullmatch(probe)):
+                return True
+        return False
+
+    def patternNormalize(self: object, pattern: str) -> str:
+        """Anchor pattern at the repository URL, a pattern without / matches in any folder
+
+        Args:
+            pattern (str): Glob pattern as configured
+
+        Returns:
+            str: Glob pattern relative to repository URL
+        """
+        if "/" in pattern.rstrip("/"):
+            return pattern.strip("/")
+        return "**/" + pattern.strip("/")
+
+    def segmentRegex(self: object, segment: str) -> str:
+        """Translate one segment of a glob pattern into a regular expression
+
+        Args:
+            segment (str): Segment without /
+
+        Returns:
+            str: Regular expression
+        """
+        regex: str = ""
+        index: int = 0
+        while index < len(segment):
+            char: str = segment[index]
+            index += 1
+            if "*" == char:
+                regex += "[^/]*"
+            elif "?" == char:
+                regex += "[^/]"
+            elif "[" == char and "]" in segment[index + 1 :]:
+                end: int = segment.index("]", index + 1)
+                chars: str = segment[index:end].replace("\\", "\\\\")
+                if chars.startswith("!"):
+                    chars = "^" + chars[1:]
+                regex += "[" + chars + "]"
+                index = end + 1
+            else:
+                regex += re.escape(char)
+        return regex
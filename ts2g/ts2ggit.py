@@ -25,14 +25,24 @@ SOFTWARE.
 """
 
 import glob
+import io
 import logging
 import os
+import time
 
 import git
 import git.util
+from gitdb import IStream
 
+from ts2g.ts2gcmd import TS2GCMD
 from ts2g.ts2gconfig import TS2GConfig
+from ts2g.ts2ggittree import TS2GGITTREE
+from ts2g.ts2ghashcache import TS2GHASHCACHE
+from ts2g.ts2glfs import TS2GLFS
+from ts2g.ts2gmaintenance import TS2GMAINTENANCE
+from ts2g.ts2gmetrics import TS2GMETRICS
 from ts2g.ts2gos import TS2GOS
+from ts2g.ts2gsvnchange import TS2GSVNchange
 from ts2g.ts2gsvninfo import TS2GSVNinfo
 
 # https://www.devdungeon.com/content/working-git-repositories-python#toc-11
@@ -44,18 +54,95 @@ class TS2GGIT:
     """
 
     FOLDER_GIT = ".git"
+    GITMODULES = ".gitmodules"
 
-    def __init__(self: object, config: TS2GConfig, oshandler: TS2GOS) -> None:
+    def __init__(self: object, config: TS2GConfig, oshandler: TS2GOS, metrics: TS2GMETRICS = None) -> None:
         """Default constructor
 
         Args:
             config (TS2GConfig): Config options
             oshandler (TS2GOS): Encapsulated file system operations
+            metrics (TS2GMETRICS, optional): Collector for the duration of add, commit and maintenance. Defaults to None.
         """
         self.config: TS2GConfig = config
         self.oshandler: TS2GOS = oshandler
-        self.projectFolder: str = self.oshandler.workspaceFolderGet(self.config.value_get("GIT", "project"))
+        self.projectFolder: str = self.oshandler.workspaceRoleGet("worktree", self.config.value_get("GIT", "project"))
+        self.separateGitDir: bool = "separate" == self.config.value_get("GIT", "layout").lower()
+        self.commitBuilderTree: bool = "tree" == self.config.value_get("GIT", "commit_builder").lower()
+        self.projectRepo: git.Repo = None
+        self.treeBuilder: TS2GGITTREE = None
+        self.metrics: TS2GMETRICS = metrics
+        self.hashCache: TS2GHASHCACHE = None
+        hashCacheSize: int = int(self.config.value_get("GIT", "hash_cache_size"))
+        if self.commitBuilderTree and 0 < hashCacheSize:
+            self.hashCache = TS2GHASHCACHE(self.oshandler.workspaceFolderGet(self.config.value_get("GIT", "project") + ".hashcache.json"), hashCacheSize)
+            self.hashCache.load()
+        self.lfs: TS2GLFS = TS2GLFS(self.config, self.gitDirectoryPath())
+        self.lfsAttributes: bytes = None
+        self.submodules: dict[str, tuple[str, str]] = None
+        self.cmd: TS2GCMD = TS2GCMD(self.config, "git")
+        self.maintenance: TS2GMAINTENANCE = TS2GMAINTENANCE(self.gitDirectoryPath(), int(self.config.value_get("GIT", "maintenance_loose_objects")), int(self.config.value_get("GIT", "maintenance_loose_bytes")), self.cmd)
+        if not self.separateGitDir and "" != self.config.value_get("TS2G", "workspace_gitdir"):
+            logging.warning("Folder of role [gitdir] requires [layout] [separate], .git is kept in the work tree")
+        if self.lfs.isActive() and not self.commitBuilderTree:
+            logging.warning("Git LFS requires [commit_builder] [tree], large files are committed as usual")
+        if "submodule" == self.config.value_get("SVN", "externals").lower() and not self.commitBuilderTree:
+            logging.warning("Submodules require [commit_builder] [tree], externals are left out")
         logging.debug("projectFolder [%s]", "{}".format(self.projectFolder))
+        logging.debug("separateGitDir [%s]", "{}".format(self.separateGitDir))
+
+    def gitCheckoutHead(self: object) -> None:
+        """Populate work tree and index with the content of the current HEAD commit"""
+        try:
+            projectRepo = self.gitRepositoryGet()
+            projectRepo.git.reset("--hard")
+        except Exception as ex:
+            logging.error("Exception [%s]", "{}".format(ex))
+
+    def gitDirectoryPath(self: object) -> str:
+        """Get full qualified path name of the special folder .git of the GIT repo
+
+        With the separate layout the folder is located next to the work tree or in
+        the folder of role gitdir until the conversion is finished.
+
+        Returns:
+            str: Full os path name of .git folder
+        """
+        if self.separateGitDir:
+            return self.oshandler.workspaceRoleGet("gitdir", self.config.value_get("GIT", "project") + self.FOLDER_GIT)
+        return os.path.join(self.projectFolder, self.FOLDER_GIT)
+
+    def gitFinalize(self: object) -> None:
+        """Bring repo into its final shape
+
+        The index is refreshed if commits were created without it. With the separate
+        layout the .git folder is moved into the work tree, afterwards the repo has the
+        usual layout.
+        """
+        gitDirectory: str = self.gitDirectoryPath()
+        if not self.oshandler.workspaceFolderExists(gitDirectory):
+            return
+        try:
+            projectRepo = self.gitRepositoryGet()
+            if None != self.treeBuilder and projectRepo.head.is_valid():
+                projectRepo.git.read_tree("HEAD")
+                if None != self.lfsAttributes:
+                    projectRepo.git.checkout("HEAD", "--", self.lfs.ATTRIBUTES)
+                if self.submodules:
+                    projectRepo.git.checkout("HEAD", "--", self.GITMODULES)
+                    # Submodules which are not initialized have an empty folder
+                    for path in self.submodules:
+                        os.makedirs(os.path.join(self.projectFolder, path), exist_ok=True)
+            self.gitRepositoryClose()
+            if not self.separateGitDir:
+                return
+            projectRepo = git.Repo(gitDirectory)
+            with projectRepo.config_writer() as configWriter:
+                configWriter.remove_option("core", "worktree")
+            projectRepo.close()
+            self.oshandler.workspaceFolderRename(gitDirectory, os.path.join(self.projectFolder, self.FOLDER_GIT))
+        except Exception as ex:
+            logging.error("Exception [%s]", "{}".format(ex))
 
     def gitGetActor(self: object, name: str) -> git.Actor:
         """Create actor object used in git commit based on configured usermap
@@ -76,6 +163,48 @@ class TS2GGIT:
                 break
         return rval
 
+    def gitHeadRef(self: object) -> str:
+        """Determine ref the symbolic ref HEAD points to, also if it has no commit yet
+
+        Returns:
+            str: Full name of ref like refs/heads/main, refs/heads/master if HEAD is detached
+        """
+        try:
+            projectRepo = self.gitRepositoryGet()
+            return projectRepo.git.symbolic_ref("HEAD")
+        except Exception as ex:
+            logging.warning("Cannot resolve HEAD [%s], use [refs/heads/master]", "{}".format(ex))
+        return "refs/heads/master"
+
+    def gitHeadSha(self: object) -> str:
+        """Determine SHA of current HEAD commit
+
+        Returns:
+            str: SHA of HEAD, empty if there is no commit yet
+        """
+        projectRepo = self.gitRepositoryGet()
+        if not projectRepo.head.is_valid():
+            return ""
+        return projectRepo.head.commit.hexsha
+
+    def gitHistoryRevision(self: object, revisionOf) -> tuple[int, str]:
+        """Find the latest commit of the first parent history with a SVN revision in its message
+
+        Args:
+            revisionOf (callable): Extracts the SVN revision from a commit message, 0 if there is none
+
+        Returns:
+            tuple[int, str]: SVN revision and SHA of commit, 0 and an empty SHA if none is found
+        """
+        projectRepo = self.gitRepositoryGet()
+        if not projectRepo.head.is_valid():
+            return 0, ""
+        for commit in projectRepo.iter_commits("HEAD", first_parent=True):
+            revision: int = revisionOf(commit.message)
+            if 0 < revision:
+                return revision, commit.hexsha
+        return 0, ""
+
     def gitInitProjectRepository(self: object) -> bool:
         """Create empty GIT repo
 
@@ -86,37 +215,123 @@ class TS2GGIT:
             logging.error("Git project [%s] already exists in workspace [%s]", "{}".format(self.config.value_get("GIT", "project")), "{}".format(self.oshandler.workspaceBaseGet()))
             return False
 
-        if not self.oshandler.workspaceFolderCreate(self.config.value_get("GIT", "project")):
+        if not self.oshandler.workspaceFolderCreate(self.projectFolder):
             return False
 
         projectFolder: str = self.gitRepositoryPath()
-        projectRepo = git.Repo.init(projectFolder)
+        if self.separateGitDir:
+            gitDirectory: str = self.gitDirectoryPath()
+            if self.oshandler.workspaceFolderExists(gitDirectory):
+                logging.error("Git directory [%s] already exists", "{}".format(gitDirectory))
+                return False
+            projectRepo = git.Repo.init(gitDirectory, bare=True)
+            if projectRepo:
+                with projectRepo.config_writer() as configWriter:
+                    configWriter.set_value("core", "bare", "false")
+                    configWriter.set_value("core", "worktree", self.projectFolder)
+        else:
+            projectRepo = git.Repo.init(projectFolder)
         if not projectRepo:
             logging.error("Cannot create bare repo [%s]", "{}".format(projectFolder))
             return False
 
+        # Blobs of a previous repository do not exist in the new one
+        if None != self.hashCache:
+            self.hashCache.delete()
         return True
 
-    def gitRepositoryAdd(self: object, commitInfo: TS2GSVNinfo):
+    def gitMaintenance(self: object, revision: int) -> None:
+        """Start a background repack if too many loose objects have been written
+
+        Args:
+            revision (int): Revision just committed
+        """
+        process_maintenance_start: float = time.time()
+        self.maintenance.schedule()
+        if None != self.metrics:
+            self.metrics.record(revision, "git_maintenance", time.time() - process_maintenance_start)
+
+    def gitRepositoryAdd(self: object, commitInfo: TS2GSVNinfo, changedpaths: list[TS2GSVNchange] = None) -> bool:
         """Perform git add . and a git commit
 
+        If the tree builder is configured, no git add is required. With known changed
+        paths only these are written to the object database, otherwise the complete
+        work tree is read except the files known to the hash cache.
+
         Args:
             commitInfo (TS2GSVNinfo): Information about SVN commit like message, committer, revision
+            changedpaths (list[TS2GSVNchange], optional): Paths changed in work tree, None if unknown. Defaults to None.
+
+        Returns:
+            bool: False on any failure, otherwise True
         """
         try:
-            projectFolder: str = self.gitRepositoryPath()
-            projectRepo = git.Repo(projectFolder)
-            logging.debug("Add changes to repository")
-            projectRepo.git.add(all=True)
-            logging.debug("Perform git commit")
+            process_add_start: float = time.time()
+            projectRepo = self.gitRepositoryGet()
+            tree: git.Tree = None
+            if self.commitBuilderTree and None != changedpaths:
+                tree = self.gitTreeBuild(changedpaths, commitInfo.externals)
+            if self.commitBuilderTree and None == tree:
+                tree = self.gitTreeBuildFull(commitInfo.externals)
             commitmsg: str = commitInfo.commitmsg
             if not commitmsg:
                 commitmsg = ""
             actor: git.Actor = self.gitGetActor(commitInfo.author)
-            projectRepo.index.commit(message=commitmsg, author=actor, committer=actor, author_date=commitInfo.date, commit_date=commitInfo.date)
+            if None == tree:
+                logging.debug("Add changes to repository")
+                projectRepo.git.add(all=True)
+            process_commit_start: float = time.time()
+            if None == tree:
+                logging.debug("Perform git commit")
+                projectRepo.index.commit(message=commitmsg, author=actor, committer=actor, author_date=commitInfo.date, commit_date=commitInfo.date)
+                self.treeBuilder = None
+                self.submodules = None
+            else:
+                logging.debug("Perform git commit of tree [%s]", "{}".format(tree.hexsha))
+                git.Commit.create_from_tree(projectRepo, tree, commitmsg, head=True, author=actor, committer=actor, author_date=commitInfo.date, commit_date=commitInfo.date)
+            process_commit_end: float = time.time()
+            if None != self.metrics:
+                self.metrics.record(commitInfo.revision, "git_add", process_commit_start - process_add_start)
+                self.metrics.record(commitInfo.revision, "git_commit", process_commit_end - process_commit_start)
             logging.debug("Git commit done")
+            self.gitMaintenance(commitInfo.revision)
         except Exception as ex:
             logging.error("Exception [%s]", "{}".format(ex))
+            return False
+        return True
+
+    def gitRepositoryClose(self: object) -> None:
+        """Release long living repo object, a running repack is awaited"""
+        self.maintenance.wait()
+        self.maintenance.logStatistics()
+        if None != self.projectRepo:
+            self.projectRepo.close()
+            if None != self.hashCache:
+                self.hashCache.save()
+                self.hashCache.logStatistics()
+            self.lfs.logStatistics()
+        self.projectRepo = None
+        self.treeBuilder = None
+        self.lfsAttributes = None
+        self.submodules = None
+
+    def gitRepositoryExists(self: object) -> bool:
+        """Check if the GIT repo was created before, e.g. by a previous mirror run
+
+        Returns:
+            bool: True if project folder exists, otherwise False
+        """
+        return self.oshandler.workspaceFolderExists(self.projectFolder)
+
+    def gitRepositoryGet(self: object) -> git.Repo:
+        """Get repo object which is kept open for the whole conversion
+
+        Returns:
+            git.Repo: Repo object with work tree
+        """
+        if None == self.projectRepo:
+            self.projectRepo = self.gitRepositoryOpen()
+        return self.projectRepo
 
     def gitRepositoryName(self: object) -> str:
         """Retrieve name of GIT destination repo from config options
@@ -126,6 +341,19 @@ class TS2GGIT:
         """
         return self.config.value_get("GIT", "project")
 
+    def gitRepositoryOpen(self: object) -> git.Repo:
+        """Open GIT repo, independent of the location of the .git folder
+
+        Returns:
+            git.Repo: Repo object with work tree
+        """
+        if not self.separateGitDir:
+            return git.Repo(self.gitRepositoryPath())
+        gitDirectory: str = self.gitDirectoryPath()
+        projectRepo = git.Repo(gitDirectory)
+        projectRepo.git.update_environment(GIT_DIR=gitDirectory, GIT_WORK_TREE=self.projectFolder)
+        return projectRepo
+
     def gitRepositoryPath(self: object) -> str:
         """Get full qualified path name (=> location) of GIT repo
 
@@ -134,15 +362,94 @@ class TS2GGIT:
         """
         return os.path.join(self.projectFolder, "")
 
+    def gitRepositoryResume(self: object, sha: str = None) -> bool:
+        """Prepare existing repo for continuing an interrupted or finished conversion
+
+        An interrupted move of the .git folder is repaired, the .git folder of a
+        finished conversion is moved back to its location while converting. HEAD is
+        reset to the commit recorded in the journal.
+
+        Args:
+            sha (str, optional): SHA of last commit recorded in journal, None to keep HEAD. Defaults to None.
+
+        Returns:
+            bool: False on any failure, otherwise True
+        """
+        gitDirectory: str = self.gitDirectoryPath()
+        gitDirectoryMoved: str = self.oshandler.workspaceRoleGet("worktree", self.FOLDER_GIT)
+        if self.separateGitDir:
+            gitDirectoryMoved = os.path.join(self.projectFolder, self.FOLDER_GIT)
+        if not self.oshandler.workspaceFolderExists(gitDirectory) and self.oshandler.workspaceFolderExists(gitDirectoryMoved):
+            logging.warning("Move special dir [%s] back to [%s]", "{}".format(gitDirectoryMoved), "{}".format(gitDirectory))
+            self.oshandler.workspaceFolderRename(gitDirectoryMoved, gitDirectory)
+            if self.separateGitDir:
+                with git.Repo(gitDirectory).config_writer() as configWriter:
+                    configWriter.set_value("core", "bare", "false")
+                    configWriter.set_value("core", "worktree", self.projectFolder)
+        if not self.oshandler.workspaceFolderExists(gitDirectory):
+            logging.error("Git directory [%s] not found", "{}".format(gitDirectory))
+            return False
+
+        try:
+            self.gitRepositoryClose()
+            projectRepo = self.gitRepositoryGet()
+            head: str = self.gitHeadSha()
+            if None != sha and head != sha:
+                logging.warning("HEAD [%s] differs from journal, reset to [%s]", "{}".format(head), "{}".format(sha))
+                projectRepo.head.reset(commit=projectRepo.commit(sha), index=True, working_tree=False)
+        except Exception as ex:
+            logging.error("Exception [%s]", "{}".format(ex))
+            return False
+        return True
+
+    def gitSegmentsStitch(self: object, gitDirectories: list[str], shaMap: dict[str, str] = None) -> bool:
+        """Append the histories of segment repositories to the history of this repo
+
+        The commits are copied with identical content, only the parent of the first
+        commit of each segment is replaced by the last commit of the previous one.
+
+        Args:
+            gitDirectories (list[str]): Full os paths of .git folders of segments in revision order
+            shaMap (dict[str, str], optional): Receives the SHA in this repo per SHA in a segment. Defaults to None.
+
+        Returns:
+            bool: False on any failure, otherwise True
+        """
+        try:
+            projectRepo = self.gitRepositoryGet()
+            parent: str = self.gitHeadSha()
+            for index, gitDirectory in enumerate(gitDirectories):
+                ref: str = "refs/ts2g/segment{}".format(index)
+                projectRepo.git.fetch("--no-tags", gitDirectory, "+HEAD:{}".format(ref))
+                self.lfs.objectsImport(gitDirectory)
+                for sha in projectRepo.git.rev_list("--reverse", "--first-parent", ref).split():
+                    raw: bytes = projectRepo.odb.stream(bytes.fromhex(sha)).read()
+                    header, separator, message = raw.partition(b"\n\n")
+                    lines: list[bytes] = [line for line in header.split(b"\n") if not line.startswith(b"parent ")]
+                    if parent:
+                        lines.insert(1, b"parent " + parent.encode("ascii"))
+                    data: bytes = b"\n".join(lines) + separator + message
+                    parent = projectRepo.odb.store(IStream(b"commit", len(data), io.BytesIO(data))).binsha.hex()
+                    if None != shaMap:
+                        shaMap[sha] = parent
+                projectRepo.git.update_ref("-d", ref)
+                logging.info("Stitched segment [%s] from [%s]", "{}".format(index), "{}".format(gitDirectory))
+            projectRepo.git.update_ref("HEAD", parent)
+        except Exception as ex:
+            logging.error("Exception [%s]", "{}".format(ex))
+            return False
+        return True
+
     def gitSpecialFolderBackup(self: object, repoName: str) -> None:
         """Move special folder .git outside of repository
 
         Args:
             repoName (str): Name of repository
         """
-        folder_git_src: str = self.oshandler.workspaceFolderGet(os.path.join(repoName, self.FOLDER_GIT))
-        folder_git_dst: str = self.oshandler.workspaceFolderGet(self.FOLDER_GIT)
+        folder_git_src: str = self.oshandler.workspaceRoleGet("worktree", os.path.join(repoName, self.FOLDER_GIT))
+        folder_git_dst: str = self.oshandler.workspaceRoleGet("worktree", self.FOLDER_GIT)
 
+        self.maintenance.wait()
         self.oshandler.workspaceFolderRename(folder_git_src, folder_git_dst)
 
     def gitSpecialFolderRestore(self: object, repoName: str) -> None:
@@ -151,7 +458,120 @@ class TS2GGIT:
         Args:
             repoName (str): Name of repository
         """
-        folder_git_src: str = self.oshandler.workspaceFolderGet(os.path.join(repoName, self.FOLDER_GIT))
-        folder_git_dst: str = self.oshandler.workspaceFolderGet(self.FOLDER_GIT)
+        folder_git_src: str = self.oshandler.workspaceRoleGet("worktree", os.path.join(repoName, self.FOLDER_GIT))
+        folder_git_dst: str = self.oshandler.workspaceRoleGet("worktree", self.FOLDER_GIT)
 
         self.oshandler.workspaceFolderRename(folder_git_dst, folder_git_src)
+
+    def gitTreeAttributesLoad(self: object, tree: git.Tree) -> None:
+        """Take paths stored in LFS from .gitattributes of an existing tree
+
+        Args:
+            tree (git.Tree): Tree to read .gitattributes from, usually the tree of HEAD
+        """
+        if not self.lfs.isActive() or self.lfs.ATTRIBUTES not in tree:
+            return
+        self.lfsAttributes = tree[self.lfs.ATTRIBUTES].data_stream.read()
+        self.lfs.paths |= self.lfs.attributesLoad(self.lfsAttributes)
+
+    def gitTreeAttributesSet(self: object) -> None:
+        """Write .gitattributes tracking the LFS files into the next tree if it changed"""
+        if not self.lfs.isActive():
+            return
+        self.lfs.paths = {path for path in self.lfs.paths if self.treeBuilder.entryExists(path)}
+        attributes: bytes = self.lfs.attributes(self.lfs.paths)
+        if attributes != self.lfsAttributes:
+            self.treeBuilder.entrySet(self.lfs.ATTRIBUTES, TS2GGITTREE.MODE_FILE, self.treeBuilder.objectWrite(b"blob", attributes))
+            self.lfsAttributes = attributes
+
+    def gitTreeBuild(self: object, changedpaths: list[TS2GSVNchange], submodules: dict[str, tuple[str, str]] = None) -> git.Tree:
+        """Build tree of next commit based on the tree of HEAD and the changed paths
+
+        Args:
+            changedpaths (list[TS2GSVNchange]): Paths changed in work tree
+            submodules (dict[str, tuple[str, str]], optional): URL and commit SHA of all submodules by path, None to keep them as they are. Defaults to None.
+
+        Returns:
+            git.Tree: Root tree of next commit, None if the changes cannot be applied incrementally
+        """
+        if any("" == change.path for change in changedpaths):
+            return None
+        projectRepo = self.gitRepositoryGet()
+        if None == self.treeBuilder:
+            self.treeBuilder = TS2GGITTREE(projectRepo, self.hashCache, self.lfs)
+            self.submodules = None
+            if projectRepo.head.is_valid():
+                self.treeBuilder.load(projectRepo.head.commit.tree)
+                self.gitTreeAttributesLoad(projectRepo.head.commit.tree)
+
+        size: int = 0
+        for change in changedpaths:
+            if change.action in ("D", "R"):
+                self.treeBuilder.entryDelete(change.path)
+        for change in sorted(changedpaths, key=lambda change: change.path):
+            if "D" == change.action:
+                continue
+            filename: str = os.path.join(self.projectFolder, change.path)
+            if not os.path.lexists(filename):
+                continue
+            if os.path.isdir(filename) and not os.path.islink(filename):
+                if "M" == change.action:
+                    continue
+                self.treeBuilder.entryDelete(change.path)
+                size += self.treeBuilder.folderAdd(change.path, filename, [self.FOLDER_GIT])
+            else:
+                size += self.treeBuilder.blobAdd(change.path, filename)
+        logging.debug("Wrote [%s] bytes of changed content", "{}".format(size))
+        self.gitTreeAttributesSet()
+        self.gitTreeSubmodulesSet(submodules)
+        return self.treeBuilder.write()
+
+    def gitTreeBuildFull(self: object, submodules: dict[str, tuple[str, str]] = None) -> git.Tree:
+        """Build tree of next commit from the complete work tree
+
+        Files known to the hash cache with unchanged path, size, mtime and inode are
+        not read again.
+
+        Args:
+            submodules (dict[str, tuple[str, str]], optional): URL and commit SHA of all submodules by path, None if there are none. Defaults to None.
+
+        Returns:
+            git.Tree: Root tree of next commit
+        """
+        projectRepo = self.gitRepositoryGet()
+        self.treeBuilder = TS2GGITTREE(projectRepo, self.hashCache, self.lfs)
+        if projectRepo.head.is_valid():
+            self.gitTreeAttributesLoad(projectRepo.head.commit.tree)
+        self.lfsAttributes = None
+        self.submodules = {}
+        size: int = self.treeBuilder.folderAdd("", self.projectFolder, [self.FOLDER_GIT])
+        logging.debug("Read [%s] bytes of work tree", "{}".format(size))
+        self.gitTreeAttributesSet()
+        self.gitTreeSubmodulesSet(submodules)
+        return self.treeBuilder.write()
+
+    def gitTreeSubmodulesSet(self: object, submodules: dict[str, tuple[str, str]]) -> None:
+        """Write gitlinks of the submodules and .gitmodules into the next tree if they changed
+
+        Args:
+            submodules (dict[str, tuple[str, str]]): URL and commit SHA of all submodules by path, None to keep them as they are
+        """
+        if None == submodules:
+            return
+        if None == self.submodules:
+            # Tree of HEAD was loaded, the URLs of its submodules are unknown
+            self.submodules = {path: (None, None) for path in self.treeBuilder.gitlinks()}
+        for path in self.submodules:
+            if path not in submodules:
+                self.treeBuilder.entryDelete(path)
+        for path, (url, sha) in submodules.items():
+            binsha: bytes = bytes.fromhex(sha)
+            if (TS2GGITTREE.MODE_COMMIT, binsha) != self.treeBuilder.entryGet(path):
+                self.treeBuilder.entrySet(path, TS2GGITTREE.MODE_COMMIT, binsha)
+        if {path: url for path, (url, _) in submodules.items()} != {path: url for path, (url, _) in self.submodules.items()}:
+            if submodules:
+                content: str = "".join('[submodule "{0}"]\n\tpath = {0}\n\turl = {1}\n'.format(path, url) for path, (url, _) in sorted(submodules.items()))
+                self.treeBuilder.entrySet(self.GITMODULES, TS2GGITTREE.MODE_FILE, self.treeBuilder.objectWrite(b"blob", content.encode("utf-8")))
+            else:
+                self.treeBuilder.entryDelete(self.GITMODULES)
+        self.submodules = dict(submodules)
@@ -0,0 +1,302 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import io
+import logging
+import os
+import stat
+
+import git
+from gitdb import IStream
+
+from ts2g.ts2ghashcache import TS2GHASHCACHE
+from ts2g.ts2glfs import TS2GLFS
+
+
+class TS2GGITTREE:
+    """
+    Class to build git trees incrementally, only trees containing changed paths are written again
+    """
+
+    MODE_COMMIT = 0o160000
+    MODE_EXECUTABLE = 0o100755
+    MODE_FILE = 0o100644
+    MODE_SYMLINK = 0o120000
+    MODE_TREE = 0o040000
+
+    def __init__(self: object, repo: git.Repo, hashCache: TS2GHASHCACHE = None, lfs: TS2GLFS = None) -> None:
+        """Default constructor
+
+        Args:
+            repo (git.Repo): Repository the objects are written to
+            hashCache (TS2GHASHCACHE, optional): Blob SHAs of files hashed before. Defaults to None.
+            lfs (TS2GLFS, optional): LFS object store for large files. Defaults to None.
+        """
+        self.repo: git.Repo = repo
+        self.hashCache: TS2GHASHCACHE = hashCache
+        self.lfs: TS2GLFS = lfs
+        self.trees: dict[str, dict[str, tuple[int, bytes]]] = {"": {}}
+        self.dirty: set[str] = {""}
+
+    def blobAdd(self: object, path: str, filename: str, lookup: bool = False) -> int:
+        """Write content of file as blob and set it for path
+
+        Args:
+            path (str): Path relative to repository root, separated by /
+            filename (str): Full os path of file in work tree
+            lookup (bool, optional): Take blob SHA from hash cache if file is unchanged. Defaults to False.
+
+        Returns:
+            int: Size of blob read, 0 if taken from hash cache
+        """
+        fileStat: os.stat_result = os.lstat(filename)
+        if stat.S_ISLNK(fileStat.st_mode):
+            target: bytes = os.fsencode(os.readlink(filename))
+            self.entrySet(path, self.MODE_SYMLINK, self.objectWrite(b"blob", target))
+            return len(target)
+        mode: int = self.MODE_EXECUTABLE if fileStat.st_mode & stat.S_IXUSR else self.MODE_FILE
+        if lookup and None != self.hashCache:
+            binsha: bytes = self.hashCache.get(path, fileStat)
+            if None != binsha:
+                self.entrySet(path, mode, binsha)
+                return 0
+        if None != self.lfs and self.lfs.isLfs(path, fileStat.st_size):
+            binsha: bytes = self.objectWrite(b"blob", self.lfs.objectStore(filename))
+            self.lfs.paths.add(path)
+        else:
+            with open(filename, "rb") as stream:
+                binsha: bytes = self.repo.odb.store(IStream(b"blob", fileStat.st_size, stream)).binsha
+            if None != self.lfs:
+                self.lfs.paths.discard(path)
+        if None != self.hashCache:
+            self.hashCache.put(path, fileStat, binsha)
+        self.entrySet(path, mode, binsha)
+        return fileStat.st_size
+
+    def entryDelete(self: object, path: str) -> None:
+        """Delete file or folder including content
+
+        Args:
+            path (str): Path relative to repository root, separated by /
+        """
+        parent, _, name = path.rpartition("/")
+        entries: dict[str, tuple[int, bytes]] = self.trees.get(parent)
+        if None == entries or name not in entries:
+            return
+        if self.MODE_TREE == entries[name][0]:
+            for folder in [folder for folder in self.trees if folder == path or folder.startswith(path + "/")]:
+                del self.trees[folder]
+                self.dirty.discard(folder)
+        del entries[name]
+        self.markDirty(parent)
+
+    def entryExists(self: object, path: str) -> bool:
+        """Check if path exists
+
+        Args:
+            path (str): Path relative to repository root, separated by /
+
+        Returns:
+            bool: True if path exists, otherwise False
+        """
+        parent, _, name = path.rpartition("/")
+        return name in self.trees.get(parent, {})
+
+    def entryGet(self: object, path: str) -> tuple[int, bytes]:
+        """Get mode and object of a path
+
+        Args:
+            path (str): Path relative to repository root, separated by /
+
+        Returns:
+            tuple[int, bytes]: Git file mode and binary SHA of object, None if path does not exist
+        """
+        parent, _, name = path.rpartition("/")
+        return self.trees.get(parent, {}).get(name)
+
+    def entrySet(self: object, path: str, mode: int, binsha: bytes) -> None:
+        """Set mode and object of a path, missing parent folders are created
+
+        Args:
+            path (str): Path relative to repository root, separated by /
+            mode (int): Git file mode
+            binsha (bytes): Binary SHA of object
+        """
+        parent, _, name = path.rpartition("/")
+        entries: dict[str, tuple[int, bytes]] = self.folderGet(parent)
+        existing: tuple[int, bytes] = entries.get(name)
+        if None != existing and self.MODE_TREE == existing[0]:
+            self.entryDelete(path)
+            entries = self.folderGet(parent)
+        entries[name] = (mode, binsha)
+        self.markDirty(parent)
+
+    def folderAdd(self: object, path: str, folder: str, exclude: list[str]) -> int:
+        """Add all files of a folder of the work tree, unchanged files are taken from the hash cache
+
+        Args:
+            path (str): Path of folder relative to repository root, separated by /
+            folder (str): Full os path of folder in work tree
+            exclude (list[str]): Names of entries to skip
+
+        Returns:
+            int: Total size of blobs
+        """
+        size: int = 0
+        for entry in os.scandir(folder):
+            if entry.name in exclude:
+                continue
+            entryPath: str = entry.name if not path else path + "/" + entry.name
+            if entry.is_dir(follow_symlinks=False):
+                size += self.folderAdd(entryPath, entry.path, exclude)
+            else:
+                size += self.blobAdd(entryPath, entry.path, True)
+        return size
+
+    def folderGet(self: object, path: str) -> dict[str, tuple[int, bytes]]:
+        """Get entries of folder, the folder and its parents are created if missing
+
+        Args:
+            path (str): Path of folder relative to repository root, separated by /
+
+        Returns:
+            dict[str, tuple[int, bytes]]: Entries of folder by name
+        """
+        entries: dict[str, tuple[int, bytes]] = self.trees.get(path)
+        if None != entries:
+            return entries
+        parent, _, name = path.rpartition("/")
+        parentEntries: dict[str, tuple[int, bytes]] = self.folderGet(parent)
+        existing: tuple[int, bytes] = parentEntries.get(name)
+        if None != existing and self.MODE_TREE != existing[0]:
+            del parentEntries[name]
+        entries = {}
+        self.trees[path] = entries
+        parentEntries[name] = (self.MODE_TREE, None)
+        self.markDirty(parent)
+        return entries
+
+    def gitlinks(self: object) -> list[str]:
+        """Find all submodules, i.e. entries referring to a commit
+
+        Returns:
+            list[str]: Paths of submodules relative to repository root
+        """
+        paths: list[str] = []
+        for folder, entries in self.trees.items():
+            for name, entry in entries.items():
+                if self.MODE_COMMIT == entry[0]:
+                    paths.append(name if not folder else folder + "/" + name)
+        return paths
+
+    def load(self: object, tree: git.Tree) -> None:
+        """Replace current state with content of an existing tree
+
+        Args:
+            tree (git.Tree): Tree to load, usually the tree of HEAD
+        """
+        self.trees = {}
+        self.dirty = set()
+        self.loadTree("", tree)
+        logging.debug("Loaded [%s] folders from tree [%s]", "{}".format(len(self.trees)), "{}".format(tree.hexsha))
+
+    def loadTree(self: object, path: str, tree: git.Tree) -> None:
+        """Load folder and all sub folders from existing tree
+
+        Args:
+            path (str): Path of folder relative to repository root, separated by /
+            tree (git.Tree): Tree of folder
+        """
+        entries: dict[str, tuple[int, bytes]] = {}
+        self.trees[path] = entries
+        for item in tree:
+            # The name of a submodule is only known from .gitmodules, its path is always set
+            name: str = item.path.rpartition("/")[2]
+            entries[name] = (item.mode, item.binsha)
+            if self.MODE_TREE == item.mode:
+                self.loadTree(item.path, item)
+
+    def markDirty(self: object, path: str) -> None:
+        """Mark folder and all parents as changed
+
+        Args:
+            path (str): Path of folder relative to repository root, separated by /
+        """
+        while path not in self.dirty:
+            self.dirty.add(path)
+            if not path:
+                break
+            path = path.rpartition("/")[0]
+
+    def objectWrite(self: object, kind: bytes, data: bytes) -> bytes:
+        """Write object to object database
+
+        Args:
+            kind (bytes): Type of object like b"blob" or b"tree"
+            data (bytes): Content of object
+
+        Returns:
+            bytes: Binary SHA of object
+        """
+        return self.repo.odb.store(IStream(kind, len(data), io.BytesIO(data))).binsha
+
+    def write(self: object) -> git.Tree:
+        """Write all changed trees, unchanged trees are reused
+
+        Returns:
+            git.Tree: Root tree
+        """
+        binsha: bytes = self.writeTree("")
+        self.dirty = set()
+        return git.Tree(self.repo, binsha)
+
+    def writeTree(self: object, path: str) -> bytes:
+        """Write tree of folder if changed, empty sub folders are omitted
+
+        Args:
+            path (str): Path of folder relative to repository root, separated by /
+
+        Returns:
+            bytes: Binary SHA of tree, None if folder is empty
+        """
+        entries: dict[str, tuple[int, bytes]] = self.trees[path]
+        for name in [name for name, entry in entries.items() if self.MODE_TREE == entry[0]]:
+            folder: str = name if not path else path + "/" + name
+            if folder in self.dirty:
+                binsha: bytes = self.writeTree(folder)
+                if None == binsha:
+                    del entries[name]
+                    del self.trees[folder]
+                else:
+                    entries[name] = (self.MODE_TREE, binsha)
+        if not entries and path:
+            return None
+        names: list[str] = sorted(entries, key=lambda name: name + "/" if self.MODE_TREE == entries[name][0] else name)
+        data: bytearray = bytearray()
+        for name in names:
+            mode, binsha = entries[name]
+            data += b"%o %s\0" % (mode, name.encode("utf-8")) + binsha
+        return self.objectWrite(b"tree", bytes(data))
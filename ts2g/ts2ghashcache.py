@@ -0,0 +1,127 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import collections
+import json
+import logging
+import os
+import time
+
+
+class TS2GHASHCACHE:
+    """
+    Class to remember the git blob SHA of files by path, size, mtime and inode, so
+    unchanged files are not read again
+    """
+
+    RACY_NS = 2000000000
+
+    def __init__(self: object, filename: str, capacity: int) -> None:
+        """Default constructor
+
+        Args:
+            filename (str): Full os path of file the cache is kept in between runs
+            capacity (int): Maximum number of entries, the least recently used are evicted
+        """
+        self.filename: str = filename
+        self.capacity: int = capacity
+        self.entries: collections.OrderedDict[tuple, bytes] = collections.OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        logging.debug("filename [%s], capacity [%s]", "{}".format(self.filename), "{}".format(self.capacity))
+
+    def delete(self: object) -> None:
+        """Forget all entries and delete the file, e.g. for a new repository"""
+        self.entries.clear()
+        if os.path.isfile(self.filename):
+            os.remove(self.filename)
+
+    def get(self: object, path: str, fileStat: os.stat_result) -> bytes:
+        """Get blob SHA of file if it is unchanged since it was hashed
+
+        Args:
+            path (str): Path of file relative to repository root
+            fileStat (os.stat_result): Current status of file
+
+        Returns:
+            bytes: Binary SHA of blob, None if unknown
+        """
+        key: tuple = (path, fileStat.st_size, fileStat.st_mtime_ns, fileStat.st_ino)
+        binsha: bytes = self.entries.get(key)
+        if None == binsha:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return binsha
+
+    def load(self: object) -> None:
+        """Read entries written by a previous run, a broken file is ignored"""
+        if not os.path.isfile(self.filename):
+            return
+        try:
+            with open(self.filename, "r", encoding="utf-8") as cache:
+                for path, size, mtime, inode, hexsha in json.load(cache):
+                    self.entries[(path, size, mtime, inode)] = bytes.fromhex(hexsha)
+            logging.info("Loaded [%s] entries of hash cache [%s]", "{}".format(len(self.entries)), "{}".format(self.filename))
+        except Exception as ex:
+            logging.warning("Ignore hash cache [%s] [%s]", "{}".format(self.filename), "{}".format(ex))
+            self.entries.clear()
+
+    def logStatistics(self: object) -> None:
+        """Log number of hits and misses"""
+        lookups: int = self.hits + self.misses
+        rate: float = 100.0 * self.hits / lookups if 0 < lookups else 0.0
+        logging.info(f"Hash cache [{self.hits}] hits, [{self.misses}] misses, hit rate [{rate:.1f}] %, [{len(self.entries)}] entries")
+
+    def put(self: object, path: str, fileStat: os.stat_result, binsha: bytes) -> None:
+        """Remember blob SHA of file
+
+        Files modified within the last two seconds are not remembered, a further
+        change within the resolution of the mtime would not be noticed.
+
+        Args:
+            path (str): Path of file relative to repository root
+            fileStat (os.stat_result): Status of file when it was hashed
+            binsha (bytes): Binary SHA of blob
+        """
+        if fileStat.st_mtime_ns > time.time_ns() - TS2GHASHCACHE.RACY_NS:
+            return
+        key: tuple = (path, fileStat.st_size, fileStat.st_mtime_ns, fileStat.st_ino)
+        self.entries[key] = binsha
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def save(self: object) -> None:
+        """Write entries atomically in order of their last use"""
+        try:
+            cacheTemp: str = self.filename + ".tmp"
+            with open(cacheTemp, "w", encoding="utf-8") as cache:
+                json.dump([[path, size, mtime, inode, binsha.hex()] for (path, size, mtime, inode), binsha in self.entries.items()], cache)
+            os.replace(cacheTemp, self.filename)
+        except Exception as ex:
+            logging.error("Exception [%s]", "{}".format(ex))
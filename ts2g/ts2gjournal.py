@@ -0,0 +1,97 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import json
+import logging
+import os
+import time
+
+from ts2g.ts2gos import TS2GOS
+
+
+class TS2GJOURNAL:
+    """
+    Class to write and read the checkpoint journal of a conversion
+    """
+
+    def __init__(self: object, oshandler: TS2GOS, project: str) -> None:
+        """Default constructor
+
+        Args:
+            oshandler (TS2GOS): Encapsulated file system operations
+            project (str): Name of GIT project
+        """
+        self.oshandler: TS2GOS = oshandler
+        self.journalFile: str = self.oshandler.workspaceFolderGet(project + ".journal.json")
+        logging.debug("journalFile [%s]", "{}".format(self.journalFile))
+
+    def exists(self: object) -> bool:
+        """Check if a journal was written before
+
+        Returns:
+            bool: True if journal exists, otherwise False
+        """
+        return os.path.isfile(self.journalFile)
+
+    def read(self: object) -> dict:
+        """Read last checkpoint
+
+        Returns:
+            dict: Checkpoint with keys revision, sha, gitdir, svncheckout and finished, None on any failure
+        """
+        try:
+            with open(self.journalFile, "r", encoding="utf-8") as journal:
+                checkpoint: dict = json.load(journal)
+            logging.debug("checkpoint [%s]", "{}".format(checkpoint))
+            return checkpoint
+        except Exception as ex:
+            logging.error("Exception [%s]", "{}".format(ex))
+        return None
+
+    def write(self: object, revision: int, sha: str, gitdir: str, svncheckout: str, finished: bool = False) -> None:
+        """Write checkpoint atomically, an interrupted write keeps the previous checkpoint
+
+        Args:
+            revision (int): Last SVN revision converted
+            sha (str): SHA of git commit of revision
+            gitdir (str): Full os path of .git folder
+            svncheckout (str): Name of SVN checkout folder
+            finished (bool, optional): True if the conversion is complete. Defaults to False.
+        """
+        checkpoint: dict = {
+            "revision": revision,
+            "sha": sha,
+            "gitdir": gitdir,
+            "svncheckout": svncheckout,
+            "finished": finished,
+            "timestamp": time.time(),
+        }
+        journalTemp: str = self.journalFile + ".tmp"
+        with open(journalTemp, "w", encoding="utf-8") as journal:
+            json.dump(checkpoint, journal, indent=4)
+            journal.flush()
+            os.fsync(journal.fileno())
+        os.replace(journalTemp, self.journalFile)
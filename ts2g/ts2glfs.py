@@ -0,0 +1,277 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+
+from ts2g.ts2gconfig import TS2GConfig
+from ts2g.ts2gfilter import TS2GFILTER
+
+
+class TS2GLFS:
+    """
+    Class to store large files in the Git LFS object store and to create the pointer files committed instead
+
+    Objects are stored as <git dir>/lfs/objects/<oid[0:2]>/<oid[2:4]>/<oid> like
+    git lfs does, so git lfs checkout and push find them. Content is streamed in
+    chunks of CHUNK_SIZE bytes and each object is written once.
+    """
+
+    ATTRIBUTES = ".gitattributes"
+    ATTRIBUTES_LFS = "filter=lfs diff=lfs merge=lfs -text"
+    CHUNK_SIZE = 1024 * 1024
+    POINTER_VERSION = b"version https://git-lfs.github.com/spec/v1\n"
+    POINTER_MAX_SIZE = 1024
+
+    def __init__(self: object, config: TS2GConfig, gitDirectory: str) -> None:
+        """Default constructor
+
+        Args:
+            config (TS2GConfig): Config options
+            gitDirectory (str): Full os path of the .git folder containing the LFS object store
+        """
+        self.patterns: list[str] = [pattern for pattern in config.list_get("GIT", "lfs_patterns") if pattern.strip("/")]
+        self.patternFilter: TS2GFILTER = TS2GFILTER(self.patterns, [])
+        self.threshold: int = int(config.value_get("GIT", "lfs_threshold"))
+        self.gitDirectory: str = gitDirectory
+        self.paths: set[str] = set()
+        self.objects: int = 0
+        self.objectsDeduplicated: int = 0
+        self.bytesStored: int = 0
+
+    def attributes(self: object, paths: set[str]) -> bytes:
+        """Create content of .gitattributes tracking all patterns and all paths stored in LFS because of their size
+
+        Args:
+            paths (set[str]): Paths stored in LFS
+
+        Returns:
+            bytes: Content of .gitattributes
+        """
+        lines: list[str] = self.attributesPatterns()
+        for path in sorted(paths):
+            if self.patternFilter.isIncluded(path):
+                continue
+            lines.append("/{} {}".format(self.attributesEscape(re.sub(r"([*?\[\\])", r"\\\1", path)), self.ATTRIBUTES_LFS))
+        return "".join(line + "\n" for line in lines).encode("utf-8")
+
+    def attributesEscape(self: object, pattern: str) -> str:
+        """Escape white space of pattern like git lfs track does
+
+        Args:
+            pattern (str): Pattern or path
+
+        Returns:
+            str: Pattern usable in .gitattributes
+        """
+        return re.sub(r"\s", "[[:space:]]", pattern)
+
+    def attributesLoad(self: object, data: bytes) -> set[str]:
+        """Read paths stored in LFS because of their size from an existing .gitattributes, e.g. when resuming
+
+        Args:
+            data (bytes): Content of .gitattributes
+
+        Returns:
+            set[str]: Paths stored in LFS
+        """
+        paths: set[str] = set()
+        patterns: list[str] = self.attributesPatterns()
+        for line in data.decode("utf-8").splitlines():
+            if line in patterns or not line.startswith("/") or not line.endswith(" " + self.ATTRIBUTES_LFS):
+                continue
+            path: str = line[1 : -len(self.ATTRIBUTES_LFS) - 1].replace("[[:space:]]", " ")
+            paths.add(re.sub(r"\\(.)", r"\1", path))
+        return paths
+
+    def attributesPatterns(self: object) -> list[str]:
+        """Create lines of .gitattributes for the configured patterns, a pattern matching a folder covers its content
+
+        Returns:
+            list[str]: Lines without line break
+        """
+        lines: list[str] = []
+        for pattern in self.patternFilter.include:
+            if not pattern.startswith("**/"):
+                pattern = "/" + pattern
+            lines.append("{} {}".format(self.attributesEscape(pattern), self.ATTRIBUTES_LFS))
+            if not pattern.endswith("/**"):
+                lines.append("{}/** {}".format(self.attributesEscape(pattern), self.ATTRIBUTES_LFS))
+        return lines
+
+    def isActive(self: object) -> bool:
+        """Check if any file is stored in LFS
+
+        Returns:
+            bool: True if a pattern or a size threshold is configured, otherwise False
+        """
+        return 0 < len(self.patterns) or 0 < self.threshold
+
+    def isLfs(self: object, path: str, size: int) -> bool:
+        """Check if file is stored in LFS, empty files never are
+
+        Args:
+            path (str): Path relative to repository root, separated by /
+            size (int): Size of file
+
+        Returns:
+            bool: True if file is stored in LFS, otherwise False
+        """
+        if 0 == size:
+            return False
+        return self.patternFilter.isIncluded(path) or (0 < self.threshold and size >= self.threshold)
+
+    def logStatistics(self: object) -> None:
+        """Log number of objects and bytes stored"""
+        if self.isActive():
+            logging.info("LFS [%s] objects with [%s] bytes stored, [%s] duplicates skipped", "{}".format(self.objects), "{}".format(self.bytesStored), "{}".format(self.objectsDeduplicated))
+
+    def objectPath(self: object, oid: str) -> str:
+        """Determine full os path of object in LFS object store
+
+        Args:
+            oid (str): SHA256 of content as hex string
+
+        Returns:
+            str: Full os path of object
+        """
+        return os.path.join(self.gitDirectory, "lfs", "objects", oid[0:2], oid[2:4], oid)
+
+    def objectsImport(self: object, gitDirectory: str) -> None:
+        """Move all objects of another LFS object store into this one, e.g. of a segment repository
+
+        Args:
+            gitDirectory (str): Full os path of the .git folder to take the objects from
+        """
+        folder: str = os.path.join(gitDirectory, "lfs", "objects")
+        for current, _, files in os.walk(folder):
+            for oid in files:
+                target: str = self.objectPath(oid)
+                if os.path.exists(target):
+                    continue
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(os.path.join(current, oid), target)
+
+    def objectStore(self: object, filename: str) -> bytes:
+        """Store content of file in LFS, the file is hashed first and only copied if the object is new
+
+        Args:
+            filename (str): Full os path of file
+
+        Returns:
+            bytes: Content of pointer file
+        """
+        digest = hashlib.sha256()
+        with open(filename, "rb") as stream:
+            for chunk in iter(lambda: stream.read(self.CHUNK_SIZE), b""):
+                digest.update(chunk)
+        oid: str = digest.hexdigest()
+        size: int = os.path.getsize(filename)
+        if not os.path.exists(self.objectPath(oid)):
+            with open(filename, "rb") as stream:
+                self.objectWrite(iter(lambda: stream.read(self.CHUNK_SIZE), b""))
+        else:
+            self.objectsDeduplicated += 1
+        return self.pointer(oid, size)
+
+    def objectStoreChunks(self: object, chunks) -> bytes:
+        """Store content streamed in chunks in LFS
+
+        Args:
+            chunks: Iterable providing the content as bytes
+
+        Returns:
+            bytes: Content of pointer file
+        """
+        oid, size = self.objectWrite(chunks)
+        return self.pointer(oid, size)
+
+    def objectWrite(self: object, chunks) -> tuple[str, int]:
+        """Write content into a temporary file of the object store and move it to its final name
+
+        Args:
+            chunks: Iterable providing the content as bytes
+
+        Returns:
+            tuple[str, int]: SHA256 of content as hex string and size
+        """
+        folder: str = os.path.join(self.gitDirectory, "lfs", "tmp")
+        os.makedirs(folder, exist_ok=True)
+        digest = hashlib.sha256()
+        size: int = 0
+        handle, temporary = tempfile.mkstemp(dir=folder)
+        try:
+            with os.fdopen(handle, "wb") as stream:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    stream.write(chunk)
+                    size += len(chunk)
+            oid: str = digest.hexdigest()
+            target: str = self.objectPath(oid)
+            if os.path.exists(target):
+                self.objectsDeduplicated += 1
+                os.remove(temporary)
+            else:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(temporary, target)
+                self.objects += 1
+                self.bytesStored += size
+        except Exception:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        return oid, size
+
+    def pointer(self: object, oid: str, size: int) -> bytes:
+        """Create content of pointer file
+
+        Args:
+            oid (str): SHA256 of content as hex string
+            size (int): Size of content
+
+        Returns:
+            bytes: Content of pointer file
+        """
+        return self.POINTER_VERSION + "oid sha256:{}\nsize {}\n".format(oid, size).encode("ascii")
+
+    def pointerObject(self: object, data: bytes) -> str:
+        """Determine object a pointer file points to
+
+        Args:
+            data (bytes): Content of a blob
+
+        Returns:
+            str: Full os path of LFS object if data is a pointer to a stored object, otherwise empty
+        """
+        if len(data) > self.POINTER_MAX_SIZE or not data.startswith(self.POINTER_VERSION):
+            return ""
+        match = re.search(rb"^oid sha256:([0-9a-f]{64})$", data, re.MULTILINE)
+        if None == match or not os.path.exists(self.objectPath(match.group(1).decode("ascii"))):
+            return ""
+        return self.objectPath(match.group(1).decode("ascii"))
@@ -0,0 +1,159 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import glob
+import logging
+import os
+import subprocess
+import time
+
+from ts2g.ts2gcmd import TS2GCMD
+
+
+class TS2GMAINTENANCE:
+    """
+    Class to pack loose objects in the background while the conversion continues
+
+    The number and size of loose objects is estimated from a single object folder
+    like git gc --auto does. When a threshold is exceeded, git repack runs in the
+    background. With --geometric the number of packs grows only logarithmically,
+    so earlier packs are rarely rewritten.
+    """
+
+    SAMPLE_FOLDER = "17"
+
+    def __init__(self: object, gitDirectory: str, looseObjects: int, looseBytes: int, cmd: TS2GCMD) -> None:
+        """Default constructor
+
+        Args:
+            gitDirectory (str): Full os path of the .git folder
+            looseObjects (int): Number of loose objects starting a repack, 0 to ignore the number
+            looseBytes (int): Size of loose objects starting a repack, 0 to ignore the size
+            cmd (TS2GCMD): Runner of git commands
+        """
+        self.gitDirectory: str = gitDirectory
+        self.looseObjects: int = looseObjects
+        self.looseBytes: int = looseBytes
+        self.cmd: TS2GCMD = cmd
+        self.process: subprocess.Popen = None
+        self.started: float = 0.0
+        self.repacks: int = 0
+        self.durationBackground: float = 0.0
+        self.durationWait: float = 0.0
+
+    def finish(self: object, returncode: int) -> None:
+        """Collect result of a finished repack, a failure is logged by the command runner
+
+        Args:
+            returncode (int): Exit code of git repack
+        """
+        duration: float = time.time() - self.started
+        self.durationBackground += duration
+        self.repacks += 1
+        self.process = None
+        if 0 == returncode:
+            logging.info(f"Background repack took [{duration:.2f}] seconds")
+
+    def isActive(self: object) -> bool:
+        """Check if any threshold is configured
+
+        Returns:
+            bool: True if repacks are scheduled, otherwise False
+        """
+        return 0 < self.looseObjects or 0 < self.looseBytes
+
+    def isDue(self: object) -> bool:
+        """Check if the estimated loose objects exceed a threshold
+
+        Returns:
+            bool: True if a repack is due, otherwise False
+        """
+        objects, size = self.looseEstimate()
+        if 0 < self.looseObjects and objects >= self.looseObjects:
+            return True
+        return 0 < self.looseBytes and size >= self.looseBytes
+
+    def looseEstimate(self: object) -> tuple[int, int]:
+        """Estimate number and size of loose objects from one of the 256 object folders
+
+        Returns:
+            tuple[int, int]: Estimated number and size of loose objects
+        """
+        objects: int = 0
+        size: int = 0
+        try:
+            for entry in os.scandir(os.path.join(self.gitDirectory, "objects", self.SAMPLE_FOLDER)):
+                if 38 == len(entry.name):
+                    objects += 1
+                    size += entry.stat().st_size if 0 < self.looseBytes else 0
+        except FileNotFoundError:
+            pass
+        return objects * 256, size * 256
+
+    def logStatistics(self: object) -> None:
+        """Log number of repacks and their duration"""
+        if 0 < self.repacks:
+            logging.info(f"Maintenance [{self.repacks}] repacks took [{self.durationBackground:.2f}] seconds in background, waited [{self.durationWait:.2f}] seconds, [{self.packCount()}] packs")
+
+    def packCount(self: object) -> int:
+        """Determine number of packs
+
+        Returns:
+            int: Number of packs
+        """
+        return len(glob.glob(os.path.join(self.gitDirectory, "objects", "pack", "*.pack")))
+
+    def poll(self: object) -> bool:
+        """Check if a repack is running
+
+        Returns:
+            bool: True if a repack is still running, otherwise False
+        """
+        if None == self.process:
+            return False
+        returncode: int = self.cmd.reap(self.process, False)
+        if None == returncode:
+            return True
+        self.finish(returncode)
+        return False
+
+    def schedule(self: object) -> None:
+        """Start a repack in the background if a threshold is exceeded and no repack is running"""
+        if not self.isActive() or self.poll() or not self.isDue():
+            return
+        cmdArgs: list[str] = ["git", "--git-dir", self.gitDirectory, "repack", "-d", "-q", "--geometric=2"]
+        logging.info("Start background repack of [%s]", "{}".format(self.gitDirectory))
+        self.started = time.time()
+        self.process = self.cmd.start(cmdArgs, "repack")
+
+    def wait(self: object) -> None:
+        """Wait for a running repack, e.g. before the .git folder is moved"""
+        if None == self.process:
+            return
+        start: float = time.time()
+        returncode: int = self.cmd.reap(self.process)
+        self.durationWait += time.time() - start
+        self.finish(returncode)
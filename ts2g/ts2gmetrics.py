@@ -0,0 +1,212 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import array
+import csv
+import json
+import logging
+import threading
+import time
+
+from ts2g.ts2gos import TS2GOS
+
+
+class TS2GMETRICS:
+    """
+    Class to collect the duration of every stage per revision and to write the performance report
+    """
+
+    STAGES: tuple = ("svn_update", "svn_log", "svn_externals", "staging", "git_backup", "sync", "git_restore", "git_add", "git_commit", "git_maintenance", "total")
+    PERCENTILES: tuple = (50, 95, 99)
+    SLOWEST: int = 10
+
+    def __init__(self: object, oshandler: TS2GOS, project: str) -> None:
+        """Default constructor
+
+        Args:
+            oshandler (TS2GOS): Encapsulated file system operations
+            project (str): Name of GIT project
+        """
+        self.reportFile: str = oshandler.workspaceFolderGet(project + ".metrics")
+        self.lock: threading.Lock = threading.Lock()
+        self.rows: dict[int, int] = {}
+        self.revisions: array.array = array.array("L")
+        self.bytes: array.array = array.array("Q")
+        self.durations: dict[str, array.array] = {stage: array.array("d") for stage in TS2GMETRICS.STAGES}
+        self.started: float = time.time()
+        self.finished: float = 0.0
+
+    def __getstate__(self: object) -> dict:
+        """Drop the lock when pickled, e.g. as result of a segment process
+
+        Returns:
+            dict: State of object without lock
+        """
+        state: dict = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self: object, state: dict) -> None:
+        """Restore pickled object with a new lock
+
+        Args:
+            state (dict): State of object without lock
+        """
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def addBytes(self: object, revision: int, size: int) -> None:
+        """Add number of bytes transferred for a revision
+
+        Args:
+            revision (int): SVN revision
+            size (int): Number of bytes
+        """
+        with self.lock:
+            self.bytes[self.row(revision)] += size
+
+    def finish(self: object) -> None:
+        """Stop the wall clock of the run"""
+        self.finished = time.time()
+
+    def merge(self: object, other: "TS2GMETRICS") -> None:
+        """Add all revisions of another collector, e.g. of a segment process
+
+        Args:
+            other (TS2GMETRICS): Collector to take the revisions from
+        """
+        with self.lock:
+            for index, revision in enumerate(other.revisions):
+                row: int = self.row(revision)
+                self.bytes[row] += other.bytes[index]
+                for stage in TS2GMETRICS.STAGES:
+                    self.durations[stage][row] += other.durations[stage][index]
+
+    def percentile(self: object, values: list[float], percent: int) -> float:
+        """Determine percentile of sorted values using the nearest rank
+
+        Args:
+            values (list[float]): Ascending values
+            percent (int): Percentile like 95
+
+        Returns:
+            float: Value of percentile, 0 without values
+        """
+        if 0 == len(values):
+            return 0.0
+        rank: int = max(1, -(-len(values) * percent // 100))
+        return values[rank - 1]
+
+    def record(self: object, revision: int, stage: str, duration: float) -> None:
+        """Add duration of a stage of a revision
+
+        Args:
+            revision (int): SVN revision
+            stage (str): Name of stage, one of STAGES
+            duration (float): Duration in seconds
+        """
+        with self.lock:
+            self.durations[stage][self.row(revision)] += duration
+
+    def reportWrite(self: object, calls: dict[str, list] = None) -> dict:
+        """Write report as JSON with the summary and as CSV with one line per revision
+
+        Args:
+            calls (dict[str, list], optional): Number of calls, total and maximum latency per SVN operation. Defaults to None.
+
+        Returns:
+            dict: Summary of report, None on any failure
+        """
+        try:
+            summary: dict = self.summary()
+            if None != calls:
+                summary["svn_calls"] = {operation: {"calls": values[0], "total": values[1], "max": values[2]} for operation, values in sorted(calls.items())}
+            with open(self.reportFile + ".json", "w", encoding="utf-8") as report:
+                json.dump(summary, report, indent=4)
+            with open(self.reportFile + ".csv", "w", encoding="utf-8", newline="") as report:
+                writer = csv.writer(report)
+                writer.writerow(("revision", "bytes") + TS2GMETRICS.STAGES)
+                for row in sorted(range(len(self.revisions)), key=lambda row: self.revisions[row]):
+                    writer.writerow([self.revisions[row], self.bytes[row]] + ["{:.4f}".format(self.durations[stage][row]) for stage in TS2GMETRICS.STAGES])
+            logging.info("Performance report written to [%s.json] and [%s.csv]", "{}".format(self.reportFile), "{}".format(self.reportFile))
+            return summary
+        except Exception as ex:
+            logging.error("Exception [%s]", "{}".format(ex))
+        return None
+
+    def reset(self: object) -> None:
+        """Drop all revisions and restart the wall clock, e.g. for the next mirror sync"""
+        with self.lock:
+            self.rows = {}
+            self.revisions = array.array("L")
+            self.bytes = array.array("Q")
+            self.durations = {stage: array.array("d") for stage in TS2GMETRICS.STAGES}
+        self.started = time.time()
+        self.finished = 0.0
+
+    def row(self: object, revision: int) -> int:
+        """Get index of revision in the arrays, a new row is added for a new revision
+
+        Args:
+            revision (int): SVN revision
+
+        Returns:
+            int: Index of revision
+        """
+        row: int = self.rows.get(revision)
+        if None == row:
+            row = len(self.revisions)
+            self.rows[revision] = row
+            self.revisions.append(revision)
+            self.bytes.append(0)
+            for stage in TS2GMETRICS.STAGES:
+                self.durations[stage].append(0.0)
+        return row
+
+    def summary(self: object) -> dict:
+        """Determine totals, percentiles per stage, slowest revisions and throughput
+
+        Returns:
+            dict: Summary of all revisions
+        """
+        elapsed: float = (self.finished or time.time()) - self.started
+        total: int = sum(self.bytes)
+        stages: dict = {}
+        for stage in TS2GMETRICS.STAGES:
+            values: list[float] = sorted(self.durations[stage])
+            stages[stage] = {"total": sum(values), "max": values[-1] if values else 0.0}
+            for percent in TS2GMETRICS.PERCENTILES:
+                stages[stage]["p{}".format(percent)] = self.percentile(values, percent)
+        slowest: list[int] = sorted(range(len(self.revisions)), key=lambda row: self.durations["total"][row], reverse=True)[: TS2GMETRICS.SLOWEST]
+        return {
+            "revisions": len(self.revisions),
+            "bytes": total,
+            "elapsed": elapsed,
+            "revisions_per_second": len(self.revisions) / elapsed if 0 < elapsed else 0.0,
+            "bytes_per_second": total / elapsed if 0 < elapsed else 0.0,
+            "stages": stages,
+            "slowest": [{"revision": self.revisions[row], "seconds": self.durations["total"][row], "bytes": self.bytes[row]} for row in slowest],
+        }
@@ -24,10 +24,16 @@ SOFTWARE.
 ******************************************************************************
 """
 
+import errno
 import logging
 import os
 import shutil
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 
 def onerror(func, path, exc_info):
     """
@@ -55,14 +61,33 @@ class TS2GOS:
     Class to control OS operations
     """
 
-    def __init__(self, workspace: str) -> None:
+    # ioctl request to share the blocks of a file, _IOW(0x94, 9, int) of linux/fs.h
+    FICLONE = 0x40049409
+    # Errors telling the file system or kernel does not support the request
+    UNSUPPORTED = (errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.ENOTTY, errno.EOPNOTSUPP, errno.EBADF)
+
+    # Roles of folders which can be placed outside of the workspace
+    ROLES = ("gitdir", "staging", "svn", "worktree")
+
+    def __init__(self, workspace: str, roles: dict[str, str] = None, nested: str = "") -> None:
         """Default constructor
 
         Args:
             workspace (str): Name of workspace folder
+            roles (dict[str, str], optional): Name of folder by role, an empty name places the role in the workspace. Defaults to None.
+            nested (str, optional): Folder below workspace and role folders used instead of them, e.g. for a segment. Defaults to "".
         """
-        self.workspaceBase: str = self.determineWorkspaceBase(workspace)
+        self.workspaceBase: str = os.path.join(self.determineWorkspaceBase(workspace), nested)
+        self.roleBases: dict[str, str] = {}
+        for role, folder in (roles or {}).items():
+            if "" != folder:
+                self.roleBases[role] = os.path.join(self.determineWorkspaceBase(folder), nested)
+        self.cloneSupported: bool = None != fcntl
+        self.rangeSupported: bool = hasattr(os, "copy_file_range")
+        self.copies: dict[str, int] = {"clone": 0, "range": 0, "copy": 0}
         logging.info("workspaceBase [%s]", "{}".format(self.workspaceBase))
+        for role, roleBase in self.roleBases.items():
+            logging.info("Workspace of role [%s] [%s]", "{}".format(role), "{}".format(roleBase))
 
     def determineWorkspaceBase(self: object, foldername: str) -> str:
         """Determine full os path to workspace folder in relation script path
@@ -77,6 +102,62 @@ class TS2GOS:
         workspacePath: str = os.path.realpath(os.path.join(scriptpath, foldername))
         return workspacePath
 
+    def fileClone(self: object, filesrc, filedst) -> bool:
+        """Share the blocks of the source file with the destination file, e.g. on btrfs and XFS
+
+        Args:
+            filesrc (file): Source file opened for reading
+            filedst (file): Empty destination file opened for writing
+
+        Returns:
+            bool: True if the content was cloned, otherwise False
+        """
+        if not self.cloneSupported:
+            return False
+        try:
+            fcntl.ioctl(filedst.fileno(), TS2GOS.FICLONE, filesrc.fileno())
+            return True
+        except OSError as ex:
+            if ex.errno in TS2GOS.UNSUPPORTED:
+                logging.debug("File clone not supported [%s]", "{}".format(ex))
+                self.cloneSupported = False
+                return False
+            raise
+
+    def fileCopyRange(self: object, filesrc, filedst) -> bool:
+        """Copy the content in the kernel, which may share the blocks or copy on the server side
+
+        Args:
+            filesrc (file): Source file opened for reading
+            filedst (file): Empty destination file opened for writing
+
+        Returns:
+            bool: True if the content was copied, otherwise False
+        """
+        if not self.rangeSupported:
+            return False
+        remaining: int = os.fstat(filesrc.fileno()).st_size
+        try:
+            while 0 < remaining:
+                copied: int = os.copy_file_range(filesrc.fileno(), filedst.fileno(), remaining)
+                if 0 == copied:
+                    break
+                remaining -= copied
+            return True
+        except OSError as ex:
+            if ex.errno in TS2GOS.UNSUPPORTED:
+                logging.debug("Copy file range not supported [%s]", "{}".format(ex))
+                self.rangeSupported = False
+                filesrc.seek(0)
+                filedst.seek(0)
+                filedst.truncate()
+                return False
+            raise
+
+    def logStatistics(self: object) -> None:
+        """Log number of files cloned, copied in the kernel and copied by reading them"""
+        logging.info(f"File copies [{self.copies['clone']}] cloned, [{self.copies['range']}] copied in kernel, [{self.copies['copy']}] copied")
+
     def workspaceBaseGet(self: object) -> str:
         """Full os path name of workspace in relation to script
 
@@ -85,6 +166,58 @@ class TS2GOS:
         """
         return self.workspaceBase
 
+    def workspaceCheck(self: object, minFree: int) -> bool:
+        """Create the workspace and the folders of all roles and check the free space of their file systems
+
+        Args:
+            minFree (int): Minimum free space of each file system in MB, 0 to skip the check
+
+        Returns:
+            bool: False if a folder cannot be created or has not enough free space, otherwise True
+        """
+        result: bool = True
+        devices: set[int] = set()
+        for role, base in [("workspace", self.workspaceBase)] + sorted(self.roleBases.items()):
+            try:
+                os.makedirs(base, exist_ok=True)
+            except OSError as ex:
+                logging.error("Cannot create folder [%s] of role [%s] [%s]", "{}".format(base), "{}".format(role), "{}".format(ex))
+                result = False
+                continue
+            if not os.access(base, os.W_OK):
+                logging.error("Folder [%s] of role [%s] is not writable", "{}".format(base), "{}".format(role))
+                result = False
+                continue
+            device: int = os.stat(base).st_dev
+            if device in devices:
+                continue
+            devices.add(device)
+            free: int = shutil.disk_usage(base).free // (1024 * 1024)
+            logging.info("Free space of role [%s] [%s] MB", "{}".format(role), "{}".format(free))
+            if free < minFree:
+                logging.error("Folder [%s] of role [%s] has [%s] MB free, at least [%s] MB required", "{}".format(base), "{}".format(role), "{}".format(free), "{}".format(minFree))
+                result = False
+        return result
+
+    def workspaceFileCopy(self: object, pathsrc: str, pathdst: str) -> None:
+        """Copy content and status of a file, the blocks are shared if the file system supports it
+
+        Args:
+            pathsrc (str): Path of source file
+            pathdst (str): Path of destination file, must not exist
+        """
+        src: str = self.workspaceFolderGet(pathsrc)
+        dst: str = self.workspaceFolderGet(pathdst)
+        with open(src, "rb") as filesrc, open(dst, "xb") as filedst:
+            if self.fileClone(filesrc, filedst):
+                self.copies["clone"] += 1
+            elif self.fileCopyRange(filesrc, filedst):
+                self.copies["range"] += 1
+            else:
+                shutil.copyfileobj(filesrc, filedst)
+                self.copies["copy"] += 1
+        shutil.copystat(src, dst)
+
     def workspaceFolderCopy(self: object, foldersrc: str, folderdst: str):
         """Copy folder src to folder dst in workspace
 
@@ -167,3 +300,71 @@ class TS2GOS:
         dst: str = self.workspaceFolderGet(folderdst)
         logging.debug("Rename [%s] to [%s]", "{}".format(src), "{}".format(dst))
         shutil.move(src, dst)
+
+    def workspacePathCopy(self: object, pathsrc: str, pathdst: str, skip=None) -> int:
+        """Copy file or folder including content, existing destination files are overwritten
+
+        Args:
+            pathsrc (str): Path of source
+            pathdst (str): Path of destination
+            skip (callable, optional): Called with the full os path of each entry inside a folder, True to leave it out. Defaults to None.
+
+        Returns:
+            int: Number of bytes copied
+        """
+        src: str = self.workspaceFolderGet(pathsrc)
+        dst: str = self.workspaceFolderGet(pathdst)
+        logging.debug("Copy [%s] to [%s]", "{}".format(src), "{}".format(dst))
+        if os.path.isdir(src) and not os.path.islink(src):
+            size: int = 0
+            os.makedirs(dst, exist_ok=True)
+            for entry in os.scandir(src):
+                if None == skip or not skip(entry.path):
+                    size += self.workspacePathCopy(entry.path, os.path.join(dst, entry.name), skip)
+            return size
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        if os.path.isdir(dst) and not os.path.islink(dst):
+            self.workspaceFolderDelete(dst)
+        elif os.path.lexists(dst):
+            os.remove(dst)
+        if os.path.islink(src):
+            shutil.copy2(src, dst, follow_symlinks=False)
+        else:
+            self.workspaceFileCopy(src, dst)
+        return os.lstat(dst).st_size
+
+    def workspacePathDelete(self: object, path: str) -> None:
+        """Delete file or folder including content, missing paths are ignored
+
+        Args:
+            path (str): Path to delete
+        """
+        target: str = self.workspaceFolderGet(path)
+        logging.debug("Delete [%s]", "{}".format(target))
+        if os.path.isdir(target) and not os.path.islink(target):
+            self.workspaceFolderDelete(target)
+        elif os.path.lexists(target):
+            os.remove(target)
+
+    def workspaceRoleGet(self: object, role: str, folder: str) -> str:
+        """Get full os path of folder in the folder of a role, which defaults to the workspace
+
+        Args:
+            role (str): Role of folder, one of ROLES
+            folder (str): Name of folder
+
+        Returns:
+            str: Full os path to folder
+        """
+        return os.path.join(self.roleBases.get(role, self.workspaceBase), folder)
+
+    def workspaceRolesDelete(self: object, folder: str) -> None:
+        """Delete folder including content in the workspace and in the folders of all roles
+
+        Args:
+            folder (str): Name of folder to delete
+        """
+        for base in set([self.workspaceBase] + list(self.roleBases.values())):
+            path: str = os.path.join(base, folder)
+            if os.path.isdir(path):
+                self.workspaceFolderDelete(path)
@@ -0,0 +1,212 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import bisect
+import csv
+import json
+import logging
+import os
+import time
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import quoteattr
+
+from ts2g.ts2ggit import TS2GGIT
+from ts2g.ts2gos import TS2GOS
+from ts2g.ts2gsvn import TS2GSVN
+from ts2g.ts2gsvninfo import TS2GSVNinfo
+
+
+class TS2GPLAN:
+    """
+    Class to read the history of the repository once and to estimate the cost of its conversion
+    """
+
+    LARGEST: int = 10
+    STAGE_BYTES: str = "sync"
+
+    def __init__(self: object, oshandler: TS2GOS, svnhandler: TS2GSVN, githandler: TS2GGIT) -> None:
+        """Default constructor
+
+        Args:
+            oshandler (TS2GOS): Encapsulated file system operations
+            svnhandler (TS2GSVN): Access to SVN repository
+            githandler (TS2GGIT): Access to GIT repository, used for the usermap
+        """
+        self.svnhandler: TS2GSVN = svnhandler
+        self.githandler: TS2GGIT = githandler
+        self.planFile: str = oshandler.workspaceFolderGet(githandler.gitRepositoryName() + ".plan")
+        self.revisionHead: int = 0
+        self.revisions: list[int] = []
+        self.rows: list[tuple] = []
+        self.authors: dict[str, int] = {}
+        self.largest: list[tuple] = []
+        self.treeBytes: int = 0
+        self.paths: list[str] = []
+        self.sizes: dict[str, int] = {}
+        self.offsets: list[int] = []
+        self.calibration: dict = None
+        logging.debug("planFile [%s]", "{}".format(self.planFile))
+
+    def collect(self: object) -> bool:
+        """Read file sizes of the latest revision and the complete log, the log is saved for the conversion
+
+        Returns:
+            bool: False on any failure, otherwise True
+        """
+        try:
+            self.revisionHead = self.svnhandler.getMaxRevisionNumber()
+            if 0 == self.revisionHead:
+                logging.error("Cannot read head revision of [%s]", "{}".format(self.svnhandler.getRepositoryUrl()))
+                return False
+            self.sizesRead()
+            logTemp: str = self.logFile() + ".tmp"
+            with open(logTemp, "w", encoding="utf-8") as planLog:
+                planLog.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+                planLog.write("<log url={} head=\"{}\">\n".format(quoteattr(self.svnhandler.getRepositoryUrl()), self.revisionHead))
+                for element in self.svnhandler.session.log(self.svnhandler.getRepositoryUrl(), 1, self.revisionHead, True):
+                    planLog.write(ET.tostring(element, encoding="unicode") + "\n")
+                    revision: int = int(element.get("revision"))
+                    self.revisionAdd(self.svnhandler.createCommitInfo(element, revision))
+                planLog.write("</log>\n")
+            os.replace(logTemp, self.logFile())
+        except Exception as ex:
+            logging.error("Exception [%s]", "{}".format(ex))
+            return False
+        logging.info("Log of [%s] revisions saved to [%s]", "{}".format(len(self.revisions)), "{}".format(self.logFile()))
+        return True
+
+    def estimate(self: object, summary: dict) -> None:
+        """Project the duration of the conversion from the metrics of the calibration run
+
+        The duration of the sync stage is projected by the bytes to copy, all other
+        stages by the number of revisions.
+
+        Args:
+            summary (dict): Summary of metrics of the calibration run
+        """
+        revisions: int = summary["revisions"]
+        if 0 == revisions:
+            return
+        elapsed: float = summary["elapsed"]
+        secondsBytes: float = summary["stages"][TS2GPLAN.STAGE_BYTES]["total"]
+        secondsPerRevision: float = (elapsed - secondsBytes) / revisions
+        secondsPerByte: float = secondsBytes / summary["bytes"] if 0 < summary["bytes"] else 0.0
+        totalBytes: int = sum(row[3] for row in self.rows)
+        self.calibration = {
+            "revisions": revisions,
+            "bytes": summary["bytes"],
+            "elapsed": elapsed,
+            "seconds_per_revision": {stage: values["total"] / revisions for stage, values in summary["stages"].items()},
+            "projected_seconds": secondsPerRevision * len(self.revisions) + secondsPerByte * totalBytes,
+        }
+
+    def logFile(self: object) -> str:
+        """Get full os path of saved log, reused by the conversion
+
+        Returns:
+            str: Full os path of saved log
+        """
+        return self.planFile + ".xml"
+
+    def reportWrite(self: object) -> dict:
+        """Write plan as JSON with the summary and as CSV with one line per revision
+
+        Returns:
+            dict: Summary of plan, None on any failure
+        """
+        try:
+            summary: dict = {
+                "url": self.svnhandler.getRepositoryUrl(),
+                "head": self.revisionHead,
+                "revisions": len(self.revisions),
+                "revisions_skipped": self.revisionHead - len(self.revisions),
+                "bytes": sum(row[3] for row in self.rows),
+                "tree_bytes": self.treeBytes,
+                "largest_files": [{"path": path, "bytes": size} for size, path in self.largest],
+                "unmapped_authors": {author: count for author, count in sorted(self.authors.items()) if "" == self.githandler.gitGetActor(author).email},
+                "calibration": self.calibration,
+                "timestamp": time.time(),
+            }
+            with open(self.planFile + ".json", "w", encoding="utf-8") as report:
+                json.dump(summary, report, indent=4)
+            with open(self.planFile + ".csv", "w", encoding="utf-8", newline="") as report:
+                writer = csv.writer(report)
+                writer.writerow(("revision", "author", "paths", "bytes"))
+                writer.writerows(self.rows)
+            logging.info("Plan written to [%s.json] and [%s.csv]", "{}".format(self.planFile), "{}".format(self.planFile))
+            return summary
+        except Exception as ex:
+            logging.error("Exception [%s]", "{}".format(ex))
+        return None
+
+    def revisionAdd(self: object, commitInfo: TS2GSVNinfo) -> None:
+        """Account revision with the bytes its changed paths have in the latest revision
+
+        Args:
+            commitInfo (TS2GSVNinfo): SVN Commit info object
+        """
+        size: int = 0
+        changedpaths: list = commitInfo.changedpaths
+        if None == changedpaths:
+            size = self.treeBytes
+        else:
+            for change in changedpaths:
+                if "D" == change.action or ("M" == change.action and "dir" == change.kind):
+                    continue
+                size += self.sizeBelow(change.path)
+        self.revisions.append(commitInfo.revision)
+        self.rows.append((commitInfo.revision, commitInfo.author, -1 if None == changedpaths else len(changedpaths), size))
+        self.authors[commitInfo.author] = self.authors.get(commitInfo.author, 0) + 1
+
+    def sizeBelow(self: object, path: str) -> int:
+        """Determine size of a file or of all files below a folder in the latest revision
+
+        Args:
+            path (str): Path relative to repository URL, empty for all files
+
+        Returns:
+            int: Number of bytes, 0 for paths deleted later
+        """
+        if path in self.sizes:
+            return self.sizes[path]
+        if "" == path:
+            return self.treeBytes
+        first: int = bisect.bisect_left(self.paths, path + "/")
+        last: int = bisect.bisect_left(self.paths, path + "0")
+        return self.offsets[last] - self.offsets[first]
+
+    def sizesRead(self: object) -> None:
+        """Read sizes of the files of the latest revision left by the path filter"""
+        for path, kind, size in self.svnhandler.session.list(self.svnhandler.getRepositoryUrl(), self.revisionHead):
+            if "file" == kind and not self.svnhandler.pathfilter.isExcluded(path, False):
+                self.sizes[path] = size
+        self.paths = sorted(self.sizes)
+        self.offsets = [0]
+        for path in self.paths:
+            self.offsets.append(self.offsets[-1] + self.sizes[path])
+        self.treeBytes = self.offsets[-1]
+        self.largest = sorted(((size, path) for path, size in self.sizes.items()), reverse=True)[: TS2GPLAN.LARGEST]
+        logging.info("[%s] files with [%s] bytes in revision [%s]", "{}".format(len(self.paths)), "{}".format(self.treeBytes), "{}".format(self.revisionHead))
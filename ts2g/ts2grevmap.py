@@ -0,0 +1,228 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import logging
+import mmap
+import os
+import string
+import struct
+
+
+class TS2GREVMAP:
+    """
+    Class to map SVN revisions to git commits and back
+
+    The map file holds fixed-width records of revision and SHA sorted by revision,
+    the index file the same records sorted by SHA. Both are searched by bisection
+    on the raw bytes, so a lookup reads O(log n) records and never walks the history.
+    Revisions are stored big endian, so the byte order of records is their numeric order.
+    """
+
+    RECORD: struct.Struct = struct.Struct(">I20s")
+    INDEX: struct.Struct = struct.Struct(">20sI")
+    INDEX_SUFFIX = ".idx"
+
+    def __init__(self: object, filename: str) -> None:
+        """Default constructor
+
+        Args:
+            filename (str): Full os path of map file, the index is written next to it
+        """
+        self.filename: str = filename
+        self.indexFilename: str = filename + self.INDEX_SUFFIX
+        self.writer = None
+        self.revisionLast: int = 0
+
+    def append(self: object, revision: int, sha: str) -> None:
+        """Add commit of a revision, records of this or later revisions are replaced
+
+        Args:
+            revision (int): SVN revision
+            sha (str): SHA of git commit
+        """
+        if None == self.writer:
+            self.writer = open(self.filename, "a+b")
+            self.revisionLast = self.revisionAt(self.count() - 1) if 0 < self.count() else 0
+        if revision <= self.revisionLast:
+            self.writer.flush()
+            with open(self.filename, "rb") as reader:
+                data: bytes = reader.read()
+            self.writer.truncate(self.bisect(data, self.RECORD.size, struct.pack(">I", revision)) * self.RECORD.size)
+        self.writer.seek(0, os.SEEK_END)
+        self.writer.write(self.RECORD.pack(revision, bytes.fromhex(sha)))
+        self.writer.flush()
+        self.revisionLast = revision
+
+    def bisect(self: object, data: bytes, size: int, key: bytes) -> int:
+        """Find first record whose leading bytes are not less than key
+
+        Args:
+            data (bytes): Records of fixed size, sorted by their leading bytes
+            size (int): Size of a record
+            key (bytes): Leading bytes to search
+
+        Returns:
+            int: Index of record, number of records if all are less
+        """
+        low: int = 0
+        high: int = len(data) // size
+        while low < high:
+            middle: int = (low + high) // 2
+            if data[middle * size : middle * size + len(key)] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def close(self: object) -> None:
+        """Finish map file and write index sorted by SHA"""
+        if None != self.writer:
+            self.writer.close()
+            self.writer = None
+        if not os.path.isfile(self.filename):
+            return
+        with open(self.filename, "rb") as reader:
+            data: bytes = reader.read()
+        records: list[bytes] = sorted(self.INDEX.pack(binsha, revision) for revision, binsha in self.RECORD.iter_unpack(data))
+        indexTemp: str = self.indexFilename + ".tmp"
+        with open(indexTemp, "wb") as index:
+            index.write(b"".join(records))
+        os.replace(indexTemp, self.indexFilename)
+        logging.info("Rev-map with [%s] commits written to [%s]", "{}".format(len(records)), "{}".format(self.filename))
+
+    def count(self: object) -> int:
+        """Determine number of records in map file
+
+        Returns:
+            int: Number of records
+        """
+        if not os.path.isfile(self.filename):
+            return 0
+        return os.path.getsize(self.filename) // self.RECORD.size
+
+    def delete(self: object) -> None:
+        """Remove map and index, e.g. when a new repository is created"""
+        self.close()
+        for filename in (self.filename, self.indexFilename):
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+    def mapped(self: object, filename: str):
+        """Map file into memory for reading
+
+        Args:
+            filename (str): Full os path of file
+
+        Returns:
+            mmap.mmap: Mapped content, None if the file is missing or empty
+        """
+        if not os.path.isfile(filename) or 0 == os.path.getsize(filename):
+            return None
+        with open(filename, "rb") as reader:
+            return mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def revision(self: object, sha: str) -> int:
+        """Look up SVN revision of a commit
+
+        Args:
+            sha (str): SHA of commit, an abbreviation of at least 4 hex digits is accepted
+
+        Returns:
+            int: SVN revision, None if the commit is unknown or the abbreviation is ambiguous
+        """
+        if len(sha) < 4 or 40 < len(sha) or not all(digit in string.hexdigits for digit in sha):
+            return None
+        data = self.mapped(self.indexFilename)
+        if None == data:
+            return None
+        try:
+            prefix: bytes = bytes.fromhex(sha[: len(sha) - len(sha) % 2])
+            index: int = self.bisect(data, self.INDEX.size, prefix)
+            matches: list[tuple[bytes, int]] = []
+            while index < len(data) // self.INDEX.size and len(matches) < 2:
+                binsha, revision = self.INDEX.unpack_from(data, index * self.INDEX.size)
+                if not binsha.hex().startswith(sha.lower()):
+                    if not binsha.startswith(prefix):
+                        break
+                else:
+                    matches.append((binsha, revision))
+                index += 1
+            return matches[0][1] if 1 == len(matches) else None
+        finally:
+            data.close()
+
+    def revisionAt(self: object, index: int) -> int:
+        """Read revision of a record of the map file
+
+        Args:
+            index (int): Index of record
+
+        Returns:
+            int: SVN revision
+        """
+        with open(self.filename, "rb") as reader:
+            reader.seek(index * self.RECORD.size)
+            return self.RECORD.unpack(reader.read(self.RECORD.size))[0]
+
+    def records(self: object):
+        """Iterate over all records in revision order
+
+        Yields:
+            tuple[int, str]: SVN revision and SHA of commit
+        """
+        data = self.mapped(self.filename)
+        if None == data:
+            return
+        try:
+            for revision, binsha in self.RECORD.iter_unpack(data):
+                yield revision, binsha.hex()
+        finally:
+            data.close()
+
+    def sha(self: object, revision: int, exact: bool = True) -> str:
+        """Look up commit of a SVN revision
+
+        Args:
+            revision (int): SVN revision
+            exact (bool, optional): False to get the commit of the latest converted revision at or before, e.g. for revisions not touching the converted path. Defaults to True.
+
+        Returns:
+            str: SHA of commit, None if there is none
+        """
+        data = self.mapped(self.filename)
+        if None == data:
+            return None
+        try:
+            index: int = self.bisect(data, self.RECORD.size, struct.pack(">I", revision))
+            if index < len(data) // self.RECORD.size:
+                found, binsha = self.RECORD.unpack_from(data, index * self.RECORD.size)
+                if found == revision:
+                    return binsha.hex()
+            if exact or 0 == index:
+                return None
+            return self.RECORD.unpack_from(data, (index - 1) * self.RECORD.size)[1].hex()
+        finally:
+            data.close()
@@ -24,19 +24,22 @@ SOFTWARE.
 ******************************************************************************
 """
 
+import array
+import datetime
 import logging
-import subprocess
+import os
+import re
 import urllib.parse
 import xml.etree.ElementTree as ET
-import datetime
 
-import svn.local
-import svn.remote
 from dateutil import parser
 
 from ts2g.ts2gconfig import TS2GConfig
+from ts2g.ts2gfilter import TS2GFILTER
 from ts2g.ts2gos import TS2GOS
+from ts2g.ts2gsvnchange import TS2GSVNchange
 from ts2g.ts2gsvninfo import TS2GSVNinfo
+from ts2g.ts2gsvnsession import TS2GSVNSESSION
 
 
 class TS2GSVN:
@@ -45,6 +48,7 @@ class TS2GSVN:
     """
 
     FOLDER_SVN = ".svn"
+    TRAILER = "SVN-Revision"
 
     def __init__(self: object, config: TS2GConfig, oshandler: TS2GOS) -> None:
         """Default constructor
@@ -55,9 +59,25 @@ class TS2GSVN:
         """
         self.config: TS2GConfig = config
         self.oshandler: TS2GOS = oshandler
-        self.repositoryurl: str = self.config.value_get("SVN", "repositoryurl")
+        self.standardLayout: bool = "standard" == self.config.value_get("SVN", "layout").lower()
+        self.repositoryurl: str = self.determineRepositoryUrl()
         self.repositoryname: str = self.determineRepositoryName()
         self.prefixmsg: bool = self.determinePrefixFlag()
+        self.trailermsg: bool = self.config.flag_get("GIT", "commit_msg_svn_trailer")
+        self.logChunkSize: int = int(self.config.value_get("SVN", "log_chunk_size"))
+        self.commitInfoCache: dict[int, TS2GSVNinfo] = {}
+        self.commitInfoFirst: int = 0
+        self.commitInfoLast: int = -1
+        self.revisionHead: int = 0
+        self.planFile: str = None
+        self.planHead: int = 0
+        self.planCursor = None
+        self.planPending: tuple = None
+        self.planPosition: int = 0
+        self.repositoryroot: str = ""
+        self.repositoryprefix: str = ""
+        self.session: TS2GSVNSESSION = TS2GSVNSESSION(self.config)
+        self.pathfilter: TS2GFILTER = TS2GFILTER(self.config.list_get("SVN", "include"), self.config.list_get("SVN", "exclude"))
         logging.debug("repositoryurl [%s]", "{}".format(self.repositoryurl))
         logging.debug("repositoryname [%s]", "{}".format(self.repositoryname))
 
@@ -70,17 +90,76 @@ class TS2GSVN:
         Returns:
             str: Name of checkout folder
         """
-        revisionName: str = "svn_" + self.repositoryname
+        revisionName: str = self.getCheckoutName()
         pathCheckout: str = self.oshandler.workspaceFolderGet(revisionName)
         logging.debug("Checkout revision [%s] to [%s]", "{}".format(revision), "{}".format(pathCheckout))
-        reopClient = svn.remote.RemoteClient(
-            self.repositoryurl,
-            username=self.config.value_get("SVN", "user"),
-            password=self.config.value_get("SVN", "password"),
-        )
-        reopClient.checkout(pathCheckout, revision)
+        if not self.pathfilter.isPartial(""):
+            self.session.checkout(self.repositoryurl, pathCheckout, revision)
+            return revisionName
+        self.session.checkout(self.repositoryurl, pathCheckout, revision, "immediates")
+        self.sparseRefineChildren(pathCheckout, "", revision)
         return revisionName
 
+    def createCommitInfo(self: object, element: ET.Element, revision: int) -> TS2GSVNinfo:
+        """Create commit information object from a single SVN log entry
+
+        Args:
+            element (ET.Element): XML element <logentry> of svn log output
+            revision (int): Revision number of log entry
+
+        Returns:
+            TS2GSVNinfo: Object containing SVN commit info
+        """
+        changedpaths: list[TS2GSVNchange] = None
+        paths: ET.Element = element.find("paths")
+        if None != paths:
+            changedpaths = []
+            filtered: int = 0
+            for pathElement in paths.findall("path"):
+                path: str = self.relativePath(pathElement.text)
+                if None == path:
+                    continue
+                if self.pathfilter.isExcluded(path, "file" != pathElement.get("kind")):
+                    filtered += 1
+                    continue
+                copyfrompath: str = pathElement.get("copyfrom-path")
+                if None != copyfrompath:
+                    copyfrompath = self.relativePath(copyfrompath)
+                copyfromrev: int = int(pathElement.get("copyfrom-rev", "0"))
+                changedpaths.append(TS2GSVNchange(pathElement.get("action"), path, pathElement.get("kind", ""), copyfrompath, copyfromrev))
+            if not changedpaths and 0 == filtered and 0 < len(paths):
+                # Path scoped log follows copies, before the copy the paths are located elsewhere
+                changedpaths = None
+        return self.createCommitInfoFromValues(element.findtext("author"), element.findtext("date"), element.findtext("msg"), revision, changedpaths)
+
+    def createCommitInfoFromValues(self: object, author: str, date: str, commitmsg_raw: str, revision: int, changedpaths: list[TS2GSVNchange] = None) -> TS2GSVNinfo:
+        """Create commit information object from raw SVN revision properties
+
+        Args:
+            author (str): Value of svn:author, might be None
+            date (str): Value of svn:date
+            commitmsg_raw (str): Value of svn:log, might be None
+            revision (int): Revision number
+            changedpaths (list[TS2GSVNchange], optional): Changed paths of revision, None if unknown. Defaults to None.
+
+        Returns:
+            TS2GSVNinfo: Object containing SVN commit info
+        """
+        if None == author:
+            author = ""
+        commitdate: datetime.datetime = self.parseDate(date)
+        if None == commitmsg_raw:
+            commitmsg_raw = ""
+        commitmsg_raw = commitmsg_raw.strip()
+        commitmsg: str = ""
+        if self.prefixmsg:
+            commitmsg = "#{}: {}".format(revision, commitmsg_raw)
+        else:
+            commitmsg = commitmsg_raw
+        if self.trailermsg:
+            commitmsg = "{}\n\n{}: {}".format(commitmsg, self.TRAILER, revision).lstrip("\n")
+        return TS2GSVNinfo(author, commitmsg, commitdate, revision, changedpaths)
+
     def determinePrefixFlag(self: object) -> bool:
         """Determine if prefix for commit messages should be used or not
 
@@ -105,9 +184,243 @@ class TS2GSVN:
         path_parts = url_parts[2].rpartition("/")
         return path_parts[2]
 
+    def determineRepositoryUrl(self: object) -> str:
+        """Determine URL to convert, with the standard layout an URL of trunk, a branch or a tag is reduced to the project
+
+        Returns:
+            str: URL of repository
+        """
+        url: str = self.config.value_get("SVN", "repositoryurl").rstrip("/")
+        if not self.standardLayout:
+            return url
+        parts: list[str] = url.split("/")
+        if 2 < len(parts) and parts[-2] in ("branches", "tags"):
+            return "/".join(parts[:-2])
+        if "trunk" == parts[-1]:
+            return "/".join(parts[:-1])
+        return url
+
+    def getCheckoutName(self: object) -> str:
+        """Get name of SVN checkout folder, placed in the folder of role svn
+
+        Returns:
+            str: Full os path of checkout folder
+        """
+        return self.oshandler.workspaceRoleGet("svn", "svn_" + self.repositoryname)
+
     def getCommitInfo(self: object, checkout: str, revision: int) -> TS2GSVNinfo:
         """Determine SVN commit information for given revision number
 
+        The information is taken from the prefetched log window. If the revision is
+        outside of the current window, the next window is fetched first.
+
+        Args:
+            checkout (str): Name of SVN checkout folder
+            revision (int): Revision number to get info for
+
+        Returns:
+            TS2GSVNinfo: Object containing SVN commit info
+        """
+        if revision < self.commitInfoFirst or revision > self.commitInfoLast:
+            revisionLast: int = revision + max(1, self.logChunkSize) - 1
+            if 0 < self.revisionHead:
+                revisionLast = max(revision, min(revisionLast, self.revisionHead))
+            self.prefetchCommitInfo(revision, revisionLast)
+
+        info: TS2GSVNinfo = self.commitInfoCache.get(revision)
+        if None == info:
+            logging.debug("Revision [%s] not in prefetched log, query it directly", "{}".format(revision))
+            info = self.queryCommitInfo(checkout, revision)
+        logging.debug(info)
+        return info
+
+    def getMaxRevisionNumber(self: object) -> int:
+        """Determine maximum number of revisions
+
+        Returns:
+            int: Maximum revision number of repository
+        """
+        self.readRepositoryInfo()
+        return self.revisionHead
+
+    def getRevisionList(self: object, revisionFirst: int, revisionLast: int) -> array.array:
+        """Determine revisions of range changing something below the repository URL
+
+        A single path scoped svn log call is streamed, so revisions of other parts of
+        the repository are never checked out or committed.
+
+        Args:
+            revisionFirst (int): First revision of range
+            revisionLast (int): Last revision of range
+
+        Returns:
+            array.array: Ascending revision numbers
+        """
+        revisions: array.array = array.array("L")
+        if revisionFirst > revisionLast:
+            return revisions
+        try:
+            if revisionFirst <= self.planHead:
+                for revision, _ in self.planRead():
+                    if revisionFirst <= revision <= revisionLast:
+                        revisions.append(revision)
+                revisionFirst = self.planHead + 1
+            if revisionFirst <= revisionLast:
+                for element in self.session.log(self.repositoryurl, revisionFirst, revisionLast, False):
+                    revisions.append(int(element.get("revision")))
+        except Exception as ex:
+            logging.error("Exception [%s]", "{}".format(ex))
+        logging.debug("[%s] revisions of [%s:%s] change [%s]", "{}".format(len(revisions)), "{}".format(revisionFirst), "{}".format(revisionLast), "{}".format(self.repositoryurl))
+        return revisions
+
+    def getRepositoryPrefix(self: object) -> str:
+        """Determine path of repository URL relative to the repository root
+
+        Returns:
+            str: Path relative to root without leading slash, empty for the root itself
+        """
+        if not self.repositoryroot:
+            self.readRepositoryInfo()
+        return self.repositoryprefix
+
+    def getRepositoryRoot(self: object) -> str:
+        """Determine root URL of SVN repository
+
+        Returns:
+            str: Root URL of SVN repository
+        """
+        if not self.repositoryroot:
+            self.readRepositoryInfo()
+        return self.repositoryroot
+
+    def isStandardLayout(self: object) -> bool:
+        """Check if the URL contains trunk, branches and tags
+
+        Returns:
+            bool: True for the standard layout, otherwise False
+        """
+        return self.standardLayout
+
+    def parseDate(self: object, date: str) -> datetime.datetime:
+        """Convert SVN date string into datetime object
+
+        Args:
+            date (str): SVN date like 2020-01-31T12:34:56.123456Z
+
+        Returns:
+            datetime.datetime: Date as timezone aware object
+        """
+        try:
+            return datetime.datetime.strptime(date, "%Y-%m-%dT%H:%M:%S.%fZ").replace(tzinfo=datetime.timezone.utc)
+        except ValueError:
+            return parser.parse(date)
+
+    def planEntries(self: object, revisionFirst: int, revisionLast: int):
+        """Read log entries of a revision range from the log saved by the plan
+
+        The log is read forward only, the position is kept between the calls, so
+        ascending ranges read the log once.
+
+        Args:
+            revisionFirst (int): First revision of range
+            revisionLast (int): Last revision of range
+
+        Yields:
+            tuple: Revision and element <logentry>
+        """
+        if None == self.planCursor or revisionFirst <= self.planPosition:
+            self.planCursor = self.planRead()
+            self.planPending = None
+            self.planPosition = 0
+        while True:
+            if None == self.planPending:
+                self.planPending = next(self.planCursor, None)
+                if None == self.planPending:
+                    return
+            revision, element = self.planPending
+            if revision > revisionLast:
+                return
+            self.planPending = None
+            self.planPosition = revision
+            if revision >= revisionFirst:
+                yield revision, element
+
+    def planLoad(self: object, filename: str) -> bool:
+        """Use the log saved by the plan instead of reading it again, if it was saved for the same URL
+
+        Args:
+            filename (str): Full os path of log saved by the plan
+
+        Returns:
+            bool: True if the log is used, otherwise False
+        """
+        self.planFile = None
+        self.planHead = 0
+        self.planCursor = None
+        if not os.path.isfile(filename):
+            return False
+        try:
+            for _, element in ET.iterparse(filename, events=("start",)):
+                if self.repositoryurl != element.get("url"):
+                    logging.info("Ignore log of plan [%s] for URL [%s]", "{}".format(filename), "{}".format(element.get("url")))
+                    return False
+                self.planFile = filename
+                self.planHead = int(element.get("head"))
+                break
+        except Exception as ex:
+            logging.warning("Ignore log of plan [%s] [%s]", "{}".format(filename), "{}".format(ex))
+            return False
+        logging.info("Use log of plan [%s] up to revision [%s]", "{}".format(filename), "{}".format(self.planHead))
+        return True
+
+    def planRead(self: object):
+        """Read all log entries saved by the plan
+
+        Yields:
+            tuple: Revision and element <logentry>
+        """
+        root: ET.Element = None
+        for event, element in ET.iterparse(self.planFile, events=("start", "end")):
+            if "start" == event:
+                if None == root:
+                    root = element
+                continue
+            if "logentry" == element.tag:
+                yield int(element.get("revision")), element
+                root.clear()
+
+    def prefetchCommitInfo(self: object, revisionFirst: int, revisionLast: int) -> None:
+        """Read commit information of a whole revision range with a single svn log call
+
+        The XML output is parsed while it is streamed, so only the requested window
+        of revisions is kept in memory.
+
+        Args:
+            revisionFirst (int): First revision of window
+            revisionLast (int): Last revision of window
+        """
+        self.getRepositoryPrefix()
+        self.commitInfoCache = {}
+        self.commitInfoFirst = revisionFirst
+        self.commitInfoLast = revisionLast
+        logging.debug("Prefetch log of revisions [%s:%s]", "{}".format(revisionFirst), "{}".format(revisionLast))
+        try:
+            if revisionFirst <= self.planHead:
+                for revision, element in self.planEntries(revisionFirst, revisionLast):
+                    self.commitInfoCache[revision] = self.createCommitInfo(element, revision)
+                revisionFirst = self.planHead + 1
+            if revisionFirst > revisionLast:
+                return
+            for element in self.session.log(self.repositoryurl, revisionFirst, revisionLast, True):
+                revision: int = int(element.get("revision"))
+                self.commitInfoCache[revision] = self.createCommitInfo(element, revision)
+        except Exception as ex:
+            logging.error("Exception [%s]", "{}".format(ex))
+        logging.debug("Prefetched [%s] log entries", "{}".format(len(self.commitInfoCache)))
+
+    def queryCommitInfo(self: object, checkout: str, revision: int) -> TS2GSVNinfo:
+        """Determine SVN commit information of a single revision using the checkout folder
+
         Args:
             checkout (str): Name of SVN checkout folder
             revision (int): Revision number to get info for
@@ -115,64 +428,148 @@ class TS2GSVN:
         Returns:
             TS2GSVNinfo: Object containing SVN commit info
         """
+        info: TS2GSVNinfo = None
         try:
             pathCheckout: str = self.oshandler.workspaceFolderGet(checkout)
-            cmdString: str = "svn --non-interactive --no-auth-cache --username {} --password {} log -r{}:{} --xml {}".format(
-                self.config.value_get("SVN", "user"), self.config.value_get("SVN", "password"), revision, revision, pathCheckout
-            )
-            cmdArgs: [] = cmdString.split()
-            proc = subprocess.Popen(cmdArgs, stdout=subprocess.PIPE)
-            output = proc.stdout.read()
-            svnXml: str = output.decode("utf-8")
-            root = ET.fromstring(svnXml)
-            for element in root.findall("logentry"):
-                author: str = element.find("author").text
-                commitdate: datetime = parser.parse(element.find("date").text)
-                commitmsg_raw: str = element.find("msg").text
-                if None == commitmsg_raw:
-                    commitmsg_raw = ""
-                commitmsg_raw = commitmsg_raw.strip()
-                commitmsg: str = ""
-                if self.prefixmsg:
-                    commitmsg = "#{}: {}".format(revision, commitmsg_raw)
-                else:
-                    commitmsg = commitmsg_raw
-                info: TS2GSVNinfo = TS2GSVNinfo(author, commitmsg, commitdate, revision)
-            logging.debug(info)
+            for element in self.session.log(pathCheckout, revision, revision, True):
+                info = self.createCommitInfo(element, revision)
         except Exception as ex:
             logging.error("Exception [%s]", "{}".format(ex))
         return info
 
-    def getMaxRevisionNumber(self: object) -> int:
-        """Determine maximum number of revisions
+    def readRepositoryInfo(self: object) -> None:
+        """Read root URL, relative path and head revision of repository URL"""
+        try:
+            values: dict[str, str] = self.session.info(self.repositoryurl)
+            self.revisionHead = int(values["revision"])
+            self.repositoryroot = values["root"].rstrip("/")
+            url: str = values["url"].rstrip("/")
+            self.repositoryprefix = urllib.parse.unquote(url[len(self.repositoryroot) :]).strip("/")
+            logging.debug("repositoryroot [%s], repositoryprefix [%s]", "{}".format(self.repositoryroot), "{}".format(self.repositoryprefix))
+        except Exception as ex:
+            logging.error("Exception [%s]", "{}".format(ex))
+
+    def relativePath(self: object, path: str) -> str:
+        """Convert path relative to repository root into path relative to repository URL
+
+        Args:
+            path (str): Path relative to repository root like /project/trunk/file.txt
 
         Returns:
-            int: Maximum revision number of repository
+            str: Path relative to repository URL, empty for URL itself, None if outside of URL
         """
-        reopClient = svn.remote.RemoteClient(self.repositoryurl, username=self.config.value_get("SVN", "user"), password=self.config.value_get("SVN", "password"))
-        repoInfo = reopClient.info()
-        revision: int = repoInfo["entry_revision"]
-        return revision
+        path = path.strip("/")
+        if not self.repositoryprefix:
+            return path
+        if path == self.repositoryprefix:
+            return ""
+        if path.startswith(self.repositoryprefix + "/"):
+            return path[len(self.repositoryprefix) + 1 :]
+        return None
 
-    def svnUpdateToRevision(self: object, checkout: str, revision: int) -> None:
-        """Update SVN checkout to given revision
+    def sparseRefine(self: object, pathCheckout: str, path: str, revision: int) -> None:
+        """Set depth of a folder in the checkout according to the path filter
+
+        Excluded folders are removed from the checkout, folders with filtered content
+        are fetched level by level and all other folders are fetched completely.
+
+        Args:
+            pathCheckout (str): Full os path of checkout folder
+            path (str): Path of folder relative to repository URL
+            revision (int): Revision of checkout
+        """
+        pathFolder: str = os.path.join(pathCheckout, path)
+        if self.pathfilter.isExcluded(path, True):
+            logging.debug("Exclude [%s] from checkout", "{}".format(path))
+            self.session.update(pathFolder, revision, "exclude")
+        elif self.pathfilter.isPartial(path):
+            self.session.update(pathFolder, revision, "immediates")
+            self.sparseRefineChildren(pathCheckout, path, revision)
+        else:
+            self.session.update(pathFolder, revision, "infinity")
+
+    def sparseRefineChildren(self: object, pathCheckout: str, path: str, revision: int) -> None:
+        """Set depth of all sub folders of a folder fetched with depth immediates
+
+        Args:
+            pathCheckout (str): Full os path of checkout folder
+            path (str): Path of folder relative to repository URL, empty for the URL itself
+            revision (int): Revision of checkout
+        """
+        for entry in sorted(os.scandir(os.path.join(pathCheckout, path)), key=lambda entry: entry.name):
+            if entry.is_dir(follow_symlinks=False) and self.FOLDER_SVN != entry.name:
+                self.sparseRefine(pathCheckout, "/".join(filter(None, [path, entry.name])), revision)
+
+    def revisionFromMessage(self: object, message: str) -> int:
+        """Extract SVN revision from a commit message created by this program
+
+        Args:
+            message (str): Commit message with trailer or prefix
+
+        Returns:
+            int: SVN revision, 0 if the message contains none
+        """
+        match: re.Match = re.search(r"^{}: (\d+)\s*$".format(self.TRAILER), message, re.MULTILINE)
+        if None == match and self.prefixmsg:
+            match = re.match(r"#(\d+): ", message)
+        if None == match:
+            return 0
+        return int(match.group(1))
+
+    def svnCleanup(self: object, checkout: str) -> None:
+        """Release locks and finish interrupted operations of SVN checkout
+
+        A failure is raised, the checkout cannot be used any more.
 
         Args:
             checkout (str): Name of SVN checkout folder
-            revision (int): Revision to update to
         """
+        pathCheckout: str = self.oshandler.workspaceFolderGet(checkout)
+        self.session.cleanup(pathCheckout)
+
+    def svnSparseUpdate(self: object, checkout: str, revision: int, changedpaths: list[TS2GSVNchange]) -> None:
+        """Set depth of folders added by an update below folders with filtered content
+
+        Such folders are added empty by svn update, so filtered content is never fetched.
+
+        Args:
+            checkout (str): Name of SVN checkout folder
+            revision (int): Revision the checkout was updated to
+            changedpaths (list[TS2GSVNchange]): Changed paths of revision, None if unknown
+        """
+        if not self.pathfilter.isPartial(""):
+            return
         try:
             pathCheckout: str = self.oshandler.workspaceFolderGet(checkout)
-            cmdString: str = "svn --non-interactive --no-auth-cache --username {} --password {} update -r{} {}".format(
-                self.config.value_get("SVN", "user"), self.config.value_get("SVN", "password"), revision, pathCheckout
-            )
-            cmdArgs: [] = cmdString.split()
-            proc = subprocess.Popen(cmdArgs, stdout=subprocess.PIPE)
-            output = proc.stdout.read()
-            svnXml: str = output.decode("utf-8")
+            if None == changedpaths:
+                self.sparseRefineChildren(pathCheckout, "", revision)
+                return
+            added: list[str] = []
+            for change in sorted(changedpaths, key=lambda change: change.path):
+                if change.action not in ("A", "R") or not change.path:
+                    continue
+                if any(change.path.startswith(path + "/") for path in added):
+                    continue
+                pathFolder: str = os.path.join(pathCheckout, change.path)
+                if not os.path.isdir(pathFolder) or os.path.islink(pathFolder) or not self.pathfilter.isPartial(change.path.rpartition("/")[0]):
+                    continue
+                added.append(change.path)
+                self.sparseRefine(pathCheckout, change.path, revision)
         except Exception as ex:
             logging.error("Exception [%s]", "{}".format(ex))
 
+    def svnUpdateToRevision(self: object, checkout: str, revision: int) -> None:
+        """Update SVN checkout to given revision
+
+        A failure is raised, so the revision is neither committed nor recorded in the journal.
+
+        Args:
+            checkout (str): Name of SVN checkout folder
+            revision (int): Revision to update to
+        """
+        pathCheckout: str = self.oshandler.workspaceFolderGet(checkout)
+        self.session.update(pathCheckout, revision)
+
     def getRepositoryName(self: object) -> str:
         """Get name of SVN repository
 
@@ -0,0 +1,109 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+
+class TS2GSVNchange:
+    """
+    Data object containing information about a single changed path of a SVN revision
+    """
+
+    def __init__(self: object, action: str, path: str, kind: str, copyfrompath: str = None, copyfromrev: int = 0) -> None:
+        """Default constructor
+
+        Args:
+            action (str): Type of change, one of A, D, M, R
+            path (str): Changed path relative to repository URL
+            kind (str): Kind of changed node, either file, dir or empty if unknown
+            copyfrompath (str, optional): Source path of copy relative to repository URL. Defaults to None.
+            copyfromrev (int, optional): Source revision of copy. Defaults to 0.
+        """
+        self._action: str = action
+        self._path: str = path
+        self._kind: str = kind
+        self._copyfrompath: str = copyfrompath
+        self._copyfromrev: int = copyfromrev
+
+    def __str__(self) -> str:
+        """String representation of changed path
+
+        Returns:
+            str: Changed path as string
+        """
+        measstr: str = "action [{}], path [{}], kind [{}], copyfrompath [{}], copyfromrev [{}]".format(self._action, self._path, self._kind, self._copyfrompath, self._copyfromrev)
+        return measstr
+
+    def __repr__(self) -> str:
+        """String representation of changed path
+
+        Returns:
+            str: Changed path as string
+        """
+        return self.__str__()
+
+    @property
+    def action(self: object) -> str:
+        """Access to action
+
+        Returns:
+            str: Type of change, one of A, D, M, R
+        """
+        return self._action
+
+    @property
+    def copyfrompath(self: object) -> str:
+        """Access to copy source path
+
+        Returns:
+            str: Source path of copy, None if path is no copy
+        """
+        return self._copyfrompath
+
+    @property
+    def copyfromrev(self: object) -> int:
+        """Access to copy source revision
+
+        Returns:
+            int: Source revision of copy
+        """
+        return self._copyfromrev
+
+    @property
+    def kind(self: object) -> str:
+        """Access to kind
+
+        Returns:
+            str: Kind of changed node
+        """
+        return self._kind
+
+    @property
+    def path(self: object) -> str:
+        """Access to path
+
+        Returns:
+            str: Changed path relative to repository URL
+        """
+        return self._path
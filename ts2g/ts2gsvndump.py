@@ -0,0 +1,367 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import io
+import logging
+import zlib
+
+
+def svndiffReadNumber(data: bytes, offset: int) -> tuple[int, int]:
+    """Read variable length integer of svndiff format
+
+    Args:
+        data (bytes): Raw svndiff data
+        offset (int): Position of number in data
+
+    Returns:
+        tuple[int, int]: Number and position behind number
+    """
+    value: int = 0
+    while True:
+        byte: int = data[offset]
+        offset += 1
+        value = (value << 7) | (byte & 0x7F)
+        if 0 == (byte & 0x80):
+            return value, offset
+
+
+def svndiffReadSection(data: bytes, offset: int, length: int, version: int) -> bytes:
+    """Read instruction or new data section of a svndiff window, decompress if required
+
+    Args:
+        data (bytes): Raw svndiff data
+        offset (int): Position of section in data
+        length (int): Length of section in data
+        version (int): svndiff version
+
+    Returns:
+        bytes: Plain section data
+    """
+    section: bytes = data[offset : offset + length]
+    if 0 == version:
+        return section
+    original, position = svndiffReadNumber(section, 0)
+    section = section[position:]
+    if len(section) < original:
+        section = zlib.decompress(section)
+    return section
+
+
+def svndiffApply(delta: bytes, source: bytes) -> bytes:
+    """Apply svndiff delta to source data
+
+    Args:
+        delta (bytes): Delta in svndiff format version 0 or 1
+        source (bytes): Data the delta is based on
+
+    Returns:
+        bytes: Target data
+    """
+    target: io.BytesIO = io.BytesIO()
+    svndiffApplyStream(io.BytesIO(delta).read, len(delta), io.BytesIO(source), target)
+    return target.getvalue()
+
+
+def svndiffApplyStream(read, length: int, source, target) -> int:
+    """Apply svndiff delta to source data window by window
+
+    Only one window of the delta, its source view and its target are held in
+    memory, so the memory usage does not depend on the file size.
+
+    Args:
+        read (callable): Returns the given number of bytes of the delta
+        length (int): Length of delta
+        source: Seekable binary stream the delta is based on
+        target: Binary stream the target data is written to
+
+    Returns:
+        int: Length of target data
+    """
+    if 0 == length:
+        return target.write(source.read())
+    header: bytes = read(4)
+    if b"SVN" != header[0:3] or header[3] not in (0, 1):
+        raise ValueError("Unsupported svndiff format [{}]".format(header))
+    version: int = header[3]
+    targetTotal: int = 0
+    remaining: int = length - 4
+    while 0 < remaining:
+        numbers: list[int] = []
+        while 5 > len(numbers):
+            value: int = 0
+            while True:
+                byte: int = read(1)[0]
+                remaining -= 1
+                value = (value << 7) | (byte & 0x7F)
+                if 0 == (byte & 0x80):
+                    break
+            numbers.append(value)
+        sourceOffset, sourceLength, targetLength, instructionLength, newDataLength = numbers
+        instructions: bytes = svndiffReadSection(read(instructionLength), 0, instructionLength, version)
+        newData: bytes = svndiffReadSection(read(newDataLength), 0, newDataLength, version)
+        remaining -= instructionLength + newDataLength
+        source.seek(sourceOffset)
+        window: bytes = svndiffApplyWindow(instructions, newData, source.read(sourceLength))
+        if len(window) != targetLength:
+            raise ValueError("svndiff window length [{}] does not match expected length [{}]".format(len(window), targetLength))
+        target.write(window)
+        targetTotal += targetLength
+    return targetTotal
+
+
+def svndiffApplyWindow(instructions: bytes, newData: bytes, view: bytes) -> bytes:
+    """Apply instructions of one svndiff window
+
+    Args:
+        instructions (bytes): Plain instruction section
+        newData (bytes): Plain new data section
+        view (bytes): Source view of window
+
+    Returns:
+        bytes: Target data of window
+    """
+    window: bytearray = bytearray()
+    position: int = 0
+    newPosition: int = 0
+    while position < len(instructions):
+        opcode: int = instructions[position] >> 6
+        length: int = instructions[position] & 0x3F
+        position += 1
+        if 0 == length:
+            length, position = svndiffReadNumber(instructions, position)
+        if 2 == opcode:
+            window += newData[newPosition : newPosition + length]
+            newPosition += length
+            continue
+        copyOffset, position = svndiffReadNumber(instructions, position)
+        if 0 == opcode:
+            window += view[copyOffset : copyOffset + length]
+        else:
+            # Copy from target may overlap with the data written by itself
+            for index in range(length):
+                window.append(window[copyOffset + index])
+    return bytes(window)
+
+
+class TS2GSVNDUMPRecord:
+    """
+    Data object containing one record of a SVN dump stream
+    """
+
+    def __init__(self: object, headers: dict[str, str], properties: dict[str, str], propertiesDeleted: list[str], textLength: int) -> None:
+        """Default constructor
+
+        Args:
+            headers (dict[str, str]): Header lines of record
+            properties (dict[str, str]): Properties of record, None if record has no property block
+            propertiesDeleted (list[str]): Properties deleted by a property delta
+            textLength (int): Length of text content, -1 if record has no text content
+        """
+        self.headers: dict[str, str] = headers
+        self.properties: dict[str, str] = properties
+        self.propertiesDeleted: list[str] = propertiesDeleted
+        self.textLength: int = textLength
+
+    def __str__(self) -> str:
+        """String representation of dump record
+
+        Returns:
+            str: Dump record as string
+        """
+        return "headers [{}], properties [{}], textLength [{}]".format(self.headers, self.properties, self.textLength)
+
+    def header(self: object, name: str, default: str = None) -> str:
+        """Access to single header value
+
+        Args:
+            name (str): Name of header
+            default (str, optional): Value used if header is missing. Defaults to None.
+
+        Returns:
+            str: Value of header
+        """
+        return self.headers.get(name, default)
+
+    def isTextDelta(self: object) -> bool:
+        """Check if text content is a svndiff delta
+
+        Returns:
+            bool: True if text content is a delta, otherwise False
+        """
+        return "true" == self.header("Text-delta", "false")
+
+    def isPropertyDelta(self: object) -> bool:
+        """Check if properties are a delta to the previous properties
+
+        Returns:
+            bool: True if properties are a delta, otherwise False
+        """
+        return "true" == self.header("Prop-delta", "false")
+
+
+class TS2GSVNDUMP:
+    """
+    Class to read a SVN dump stream as produced by svnadmin dump or svnrdump dump
+    """
+
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self: object, stream) -> None:
+        """Default constructor
+
+        Args:
+            stream: Binary stream containing the dump
+        """
+        self.stream = stream
+        self.textRemaining: int = 0
+
+    def readHeaders(self: object) -> dict[str, str]:
+        """Read header block of next record
+
+        Returns:
+            dict[str, str]: Headers of record, None at end of stream
+        """
+        headers: dict[str, str] = {}
+        while True:
+            line: bytes = self.stream.readline()
+            if not line:
+                return headers if headers else None
+            line = line.rstrip(b"\n")
+            if not line:
+                if headers:
+                    return headers
+                continue
+            key, _, value = line.decode("utf-8").partition(": ")
+            headers[key] = value
+
+    def readProperties(self: object, length: int) -> tuple[dict[str, str], list[str]]:
+        """Read property block of record
+
+        Args:
+            length (int): Length of property block
+
+        Returns:
+            tuple[dict[str, str], list[str]]: Properties set and names of properties deleted
+        """
+        block: bytes = self.readExact(length)
+        properties: dict[str, str] = {}
+        deleted: list[str] = []
+        offset: int = 0
+        while offset < len(block):
+            end: int = block.index(b"\n", offset)
+            line: bytes = block[offset:end]
+            offset = end + 1
+            if b"PROPS-END" == line:
+                break
+            kind, _, size = line.partition(b" ")
+            key: str = block[offset : offset + int(size)].decode("utf-8")
+            offset += int(size) + 1
+            if b"D" == kind:
+                deleted.append(key)
+                continue
+            end = block.index(b"\n", offset)
+            size = block[offset + 2 : end]
+            offset = end + 1
+            properties[key] = block[offset : offset + int(size)].decode("utf-8", "replace")
+            offset += int(size) + 1
+        return properties, deleted
+
+    def readExact(self: object, length: int) -> bytes:
+        """Read given number of bytes from stream
+
+        Args:
+            length (int): Number of bytes to read
+
+        Returns:
+            bytes: Data read
+        """
+        data: bytes = self.stream.read(length)
+        if len(data) != length:
+            raise EOFError("Unexpected end of dump stream, expected [{}] bytes, got [{}]".format(length, len(data)))
+        return data
+
+    def readText(self: object) -> bytes:
+        """Read complete text content of current record into memory
+
+        Returns:
+            bytes: Text content
+        """
+        data: bytes = self.readExact(self.textRemaining)
+        self.textRemaining = 0
+        return data
+
+    def readTextChunks(self: object):
+        """Read text content of current record in chunks of bounded size
+
+        Yields:
+            bytes: Next chunk of text content
+        """
+        while 0 < self.textRemaining:
+            chunk: bytes = self.readExact(min(self.CHUNK_SIZE, self.textRemaining))
+            self.textRemaining -= len(chunk)
+            yield chunk
+
+    def readTextPart(self: object, length: int) -> bytes:
+        """Read given number of bytes of text content of current record
+
+        Args:
+            length (int): Number of bytes to read
+
+        Returns:
+            bytes: Data read
+        """
+        if length > self.textRemaining:
+            raise EOFError("Unexpected end of text content, expected [{}] bytes, got [{}]".format(length, self.textRemaining))
+        data: bytes = self.readExact(length)
+        self.textRemaining -= length
+        return data
+
+    def records(self: object):
+        """Iterate over all records of dump stream
+
+        The text content of a record must be consumed with readText or readTextChunks
+        before the next record is requested, otherwise it is skipped.
+
+        Yields:
+            TS2GSVNDUMPRecord: Next record of stream
+        """
+        while True:
+            headers: dict[str, str] = self.readHeaders()
+            if None == headers:
+                return
+            properties: dict[str, str] = None
+            propertiesDeleted: list[str] = []
+            if "Prop-content-length" in headers:
+                properties, propertiesDeleted = self.readProperties(int(headers["Prop-content-length"]))
+            textLength: int = -1
+            if "Text-content-length" in headers:
+                textLength = int(headers["Text-content-length"])
+            self.textRemaining = max(0, textLength)
+            record: TS2GSVNDUMPRecord = TS2GSVNDUMPRecord(headers, properties, propertiesDeleted, textLength)
+            logging.debug(record)
+            yield record
+            for _ in self.readTextChunks():
+                pass
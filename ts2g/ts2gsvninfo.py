@@ -26,13 +26,15 @@ SOFTWARE.
 
 import datetime
 
+from ts2g.ts2gsvnchange import TS2GSVNchange
+
 
 class TS2GSVNinfo:
     """
     Data object containing information about SVN commit/revision
     """
 
-    def __init__(self: object, author: str, commitmsg: str, date: datetime, revision: int) -> None:
+    def __init__(self: object, author: str, commitmsg: str, date: datetime, revision: int, changedpaths: list[TS2GSVNchange] = None) -> None:
         """Default constructor
 
         Args:
@@ -40,11 +42,14 @@ class TS2GSVNinfo:
             commitmsg (str): SVN commit message
             date (datetime): Date of SVN commit
             revision (int): SVN revision number
+            changedpaths (list[TS2GSVNchange], optional): Changed paths of revision, None if unknown. Defaults to None.
         """
         self._author: str = author
         self._commitmsg: str = commitmsg
         self._date: datetime = date
         self._revision: int = revision
+        self._changedpaths: list[TS2GSVNchange] = changedpaths
+        self._externals: dict[str, tuple[str, str]] = None
 
     def __str__(self) -> str:
         """String representation of SVN commit
@@ -72,6 +77,15 @@ class TS2GSVNinfo:
         """
         return self._author
 
+    @property
+    def changedpaths(self: object) -> list[TS2GSVNchange]:
+        """Access to changed paths
+
+        Returns:
+            list[TS2GSVNchange]: Changed paths of revision, None if unknown
+        """
+        return self._changedpaths
+
     @property
     def commitmsg(self: object) -> str:
         """Access to commit message
@@ -90,6 +104,24 @@ class TS2GSVNinfo:
         """
         return self._date
 
+    @property
+    def externals(self: object) -> dict[str, tuple[str, str]]:
+        """Access to externals recorded as submodules
+
+        Returns:
+            dict[str, tuple[str, str]]: URL of submodule and SHA of commit by path, None if externals are checked out
+        """
+        return self._externals
+
+    @externals.setter
+    def externals(self: object, externals: dict[str, tuple[str, str]]) -> None:
+        """Set externals recorded as submodules
+
+        Args:
+            externals (dict[str, tuple[str, str]]): URL of submodule and SHA of commit by path
+        """
+        self._externals = externals
+
     @property
     def revision(self: object) -> int:
         """Access to revision
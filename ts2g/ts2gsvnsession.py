@@ -0,0 +1,402 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import datetime
+import logging
+import time
+import xml.etree.ElementTree as ET
+
+from ts2g.ts2gcmd import TS2GCMD
+from ts2g.ts2gconfig import TS2GConfig
+
+try:
+    import pysvn
+except ImportError:
+    pysvn = None
+
+
+class TS2GSVNSESSION:
+    """
+    Class to access a Subversion repository, either with one pysvn client kept
+    open for the whole run or with the svn command line client
+    """
+
+    BACKEND_AUTO = "auto"
+    BACKEND_CLI = "cli"
+    BACKEND_PYSVN = "pysvn"
+
+    def __init__(self: object, config: TS2GConfig) -> None:
+        """Default constructor
+
+        Args:
+            config (TS2GConfig): Config options
+        """
+        self.config: TS2GConfig = config
+        self.user: str = self.config.value_get("SVN", "user")
+        self.password: str = self.config.value_get("SVN", "password")
+        self.backend: str = self.determineBackend()
+        self.ignoreExternals: bool = "submodule" == self.config.value_get("SVN", "externals").lower()
+        self.client = None
+        self.latency: dict[str, list] = {}
+        self.cmd: TS2GCMD = TS2GCMD(self.config, "svn")
+        if TS2GSVNSESSION.BACKEND_PYSVN == self.backend:
+            self.client = pysvn.Client()
+            self.client.exception_style = 1
+            self.client.set_auth_cache(False)
+            self.client.set_store_passwords(False)
+            self.client.set_interactive(False)
+            self.client.callback_get_login = self.pysvnLogin
+            self.client.callback_ssl_server_trust_prompt = self.pysvnTrust
+        logging.debug("SVN backend [%s]", "{}".format(self.backend))
+
+    def cat(self: object, url: str, revision: int) -> bytes:
+        """Retrieve content of a file
+
+        Args:
+            url (str): URL of file
+            revision (int): Revision of file
+
+        Returns:
+            bytes: Content of file
+        """
+        start: float = time.time()
+        if None != self.client:
+            content: bytes = self.client.cat(url, revision=self.pysvnRevision(revision), peg_revision=self.pysvnRevision(revision))
+        else:
+            content: bytes = self.run("cat", "-r{}".format(revision), "{}@{}".format(url, revision))
+        self.measure("cat", start)
+        return content
+
+    def checkout(self: object, url: str, path: str, revision: int, depth: str = None) -> None:
+        """Checkout URL at revision into path, externals are left out if they become submodules
+
+        Args:
+            url (str): URL to checkout
+            path (str): Full os path of checkout folder
+            revision (int): Revision to checkout
+            depth (str, optional): Depth of checkout like empty or immediates, None for infinity. Defaults to None.
+        """
+        start: float = time.time()
+        if None != self.client:
+            options: dict = {"revision": self.pysvnRevision(revision), "ignore_externals": self.ignoreExternals}
+            if None != depth:
+                options["depth"] = getattr(pysvn.depth, depth)
+            self.client.checkout(url, path, **options)
+        else:
+            args: list[str] = ["-r{}".format(revision), url, path]
+            if None != depth:
+                args = ["--depth", depth] + args
+            if self.ignoreExternals:
+                args.insert(0, "--ignore-externals")
+            self.run("checkout", *args, recover=lambda: self.run("cleanup", path), output=False)
+        self.measure("checkout", start)
+
+    def cleanup(self: object, path: str) -> None:
+        """Release locks and finish interrupted operations of a checkout
+
+        Args:
+            path (str): Full os path of checkout folder
+        """
+        start: float = time.time()
+        if None != self.client:
+            self.client.cleanup(path)
+        else:
+            self.run("cleanup", path)
+        self.measure("cleanup", start)
+
+    def commandArgs(self: object, command: str, *args: str) -> list[str]:
+        """Build argument vector for svn command line client including credentials
+
+        Args:
+            command (str): SVN sub command like log or update
+            args (str): Additional arguments of sub command
+
+        Returns:
+            list[str]: Argument vector
+        """
+        cmdArgs: list[str] = ["svn", "--non-interactive", "--no-auth-cache", "--username", self.user, "--password", self.password, command]
+        cmdArgs.extend(args)
+        return cmdArgs
+
+    def determineBackend(self: object) -> str:
+        """Determine backend to use from config, auto prefers pysvn if installed
+
+        Returns:
+            str: Name of backend
+        """
+        backend: str = self.config.value_get("SVN", "backend").lower()
+        if TS2GSVNSESSION.BACKEND_CLI == backend:
+            return backend
+        if None == pysvn:
+            if TS2GSVNSESSION.BACKEND_PYSVN == backend:
+                logging.warning("Module [pysvn] not installed, fall back to svn command line client")
+            return TS2GSVNSESSION.BACKEND_CLI
+        return TS2GSVNSESSION.BACKEND_PYSVN
+
+    def info(self: object, url: str) -> dict[str, str]:
+        """Read repository root, URL and revision of an URL
+
+        Args:
+            url (str): URL to get info for
+
+        Returns:
+            dict[str, str]: Values of keys root, url and revision
+        """
+        start: float = time.time()
+        if None != self.client:
+            entry = self.client.info2(url, recurse=False)[0][1]
+            values: dict[str, str] = {"root": entry.repos_root_URL, "url": entry.URL, "revision": "{}".format(entry.rev.number)}
+        else:
+            root = ET.fromstring(self.run("info", "--xml", url).decode("utf-8"))
+            values: dict[str, str] = {"root": root.findtext("entry/repository/root"), "url": root.findtext("entry/url"), "revision": root.find("entry").get("revision")}
+        self.measure("info", start)
+        return values
+
+    def list(self: object, url: str, revision: int):
+        """Read kind and size of all entries below an URL recursively
+
+        Args:
+            url (str): URL of folder
+            revision (int): Revision of folder
+
+        Yields:
+            tuple: Path relative to URL, kind file or dir and size, 0 for folders
+        """
+        start: float = time.time()
+        if None != self.client:
+            base: str = None
+            for entry, _ in self.client.list(url, peg_revision=self.pysvnRevision(revision), revision=self.pysvnRevision(revision), recurse=True, dirent_fields=pysvn.SVN_DIRENT_KIND | pysvn.SVN_DIRENT_SIZE):
+                if None == base:
+                    base = entry.repos_path
+                path: str = entry.repos_path[len(base) :].lstrip("/")
+                if "" != path:
+                    yield path, "{}".format(entry.kind), entry.size if pysvn.node_kind.file == entry.kind else 0
+        else:
+            parser: ET.XMLPullParser = ET.XMLPullParser(events=("start", "end"))
+            root: ET.Element = None
+            for line in self.cmd.lines(self.commandArgs("list", "--recursive", "--xml", "-r{}".format(revision), "{}@{}".format(url, revision)), "list"):
+                parser.feed(line)
+                for event, element in parser.read_events():
+                    if "start" == event:
+                        if None == root:
+                            root = element
+                        continue
+                    if "entry" == element.tag:
+                        yield element.findtext("name"), element.get("kind"), int(element.findtext("size", "0"))
+                        root.clear()
+            parser.close()
+        self.measure("list", start)
+
+    def log(self: object, url: str, revisionFirst: int, revisionLast: int, verbose: bool):
+        """Read log entries of a revision range
+
+        Both backends deliver the entries as <logentry> elements in the shape of
+        svn log --xml. The elements are released after the next one is read.
+
+        Args:
+            url (str): URL or checkout path to get log for
+            revisionFirst (int): First revision of range
+            revisionLast (int): Last revision of range
+            verbose (bool): True to include changed paths
+
+        Yields:
+            ET.Element: Element <logentry> per revision
+        """
+        start: float = time.time()
+        if None != self.client:
+            for entry in self.client.log(
+                url,
+                revision_start=self.pysvnRevision(revisionFirst),
+                revision_end=self.pysvnRevision(revisionLast),
+                discover_changed_paths=verbose,
+            ):
+                yield self.pysvnLogEntry(entry, verbose)
+        else:
+            args: list[str] = ["-r{}:{}".format(revisionFirst, revisionLast), "--xml", "--verbose" if verbose else "--quiet", url]
+            parser: ET.XMLPullParser = ET.XMLPullParser(events=("start", "end"))
+            root: ET.Element = None
+            for line in self.cmd.lines(self.commandArgs("log", *args), "log"):
+                parser.feed(line)
+                for event, element in parser.read_events():
+                    if "start" == event:
+                        if None == root:
+                            root = element
+                        continue
+                    if "logentry" == element.tag:
+                        yield element
+                        root.clear()
+            parser.close()
+        self.measure("log", start)
+
+    def logStatistics(self: object) -> None:
+        """Log number of calls and latency per operation"""
+        for operation in sorted(self.latency):
+            calls, total, maximum = self.latency[operation]
+            logging.info(f"SVN [{self.backend}] [{operation}] calls [{calls}] took [{total:.2f}] seconds, average [{total / calls:.3f}] max [{maximum:.3f}]")
+
+    def measure(self: object, operation: str, start: float) -> None:
+        """Add duration of a call to the latency counters of its operation
+
+        Args:
+            operation (str): Name of operation
+            start (float): Time the call started
+        """
+        duration: float = time.time() - start
+        counter: list = self.latency.setdefault(operation, [0, 0.0, 0.0])
+        counter[0] += 1
+        counter[1] += duration
+        counter[2] = max(counter[2], duration)
+
+    def propget(self: object, name: str, path: str, depth: str = "infinity", revision: int = None) -> dict[str, str]:
+        """Read a property of a checkout folder or an URL and the entries below
+
+        Args:
+            name (str): Name of property like svn:externals
+            path (str): Full os path of folder in checkout or URL
+            depth (str, optional): Depth like empty for the folder only. Defaults to "infinity".
+            revision (int, optional): Revision of URL, None for a checkout. Defaults to None.
+
+        Returns:
+            dict[str, str]: Value of property by full os path or URL of the entries having it
+        """
+        start: float = time.time()
+        if None != self.client:
+            options: dict = {"depth": getattr(pysvn.depth, depth)}
+            if None != revision:
+                options["revision"] = self.pysvnRevision(revision)
+                options["peg_revision"] = self.pysvnRevision(revision)
+            values: dict[str, str] = {key: value if isinstance(value, str) else value.decode("utf-8") for key, value in self.client.propget(name, path, **options).items()}
+        else:
+            args: list[str] = [name, "--depth", depth, "--xml", path]
+            if None != revision:
+                args[-1:] = ["-r{}".format(revision), "{}@{}".format(path, revision)]
+            root = ET.fromstring(self.run("propget", *args).decode("utf-8"))
+            values: dict[str, str] = {target.get("path"): target.findtext("property", "") for target in root.iter("target")}
+        self.measure("propget", start)
+        return values
+
+    def pysvnLogEntry(self: object, entry, verbose: bool) -> ET.Element:
+        """Convert pysvn log entry into <logentry> element of svn log --xml
+
+        Args:
+            entry (pysvn.PysvnLog): Log entry of pysvn
+            verbose (bool): True to include changed paths
+
+        Returns:
+            ET.Element: Element <logentry>
+        """
+        element: ET.Element = ET.Element("logentry", revision="{}".format(entry.revision.number))
+        if None != getattr(entry, "author", None):
+            ET.SubElement(element, "author").text = entry.author
+        if None != getattr(entry, "date", None):
+            date: datetime.datetime = datetime.datetime.fromtimestamp(entry.date, datetime.timezone.utc)
+            ET.SubElement(element, "date").text = date.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        if verbose:
+            paths: ET.Element = ET.SubElement(element, "paths")
+            for changed in entry.changed_paths:
+                path: ET.Element = ET.SubElement(paths, "path", action=changed.action)
+                path.text = changed.path
+                kind = getattr(changed, "node_kind", None)
+                if None != kind and kind in (pysvn.node_kind.file, pysvn.node_kind.dir):
+                    path.set("kind", "{}".format(kind))
+                if None != changed.copyfrom_path:
+                    path.set("copyfrom-path", changed.copyfrom_path)
+                    path.set("copyfrom-rev", "{}".format(changed.copyfrom_revision.number))
+        ET.SubElement(element, "msg").text = getattr(entry, "message", "")
+        return element
+
+    def pysvnLogin(self: object, realm: str, username: str, maySave: bool) -> tuple:
+        """Provide credentials of config to pysvn
+
+        Args:
+            realm (str): Authentication realm of server
+            username (str): Proposed user name
+            maySave (bool): Credentials may be saved
+
+        Returns:
+            tuple: Flag to retry, user, password and flag to save
+        """
+        return True, self.user, self.password, False
+
+    def pysvnRevision(self: object, revision: int):
+        """Create pysvn revision object
+
+        Args:
+            revision (int): Revision number
+
+        Returns:
+            pysvn.Revision: Revision object
+        """
+        return pysvn.Revision(pysvn.opt_revision_kind.number, revision)
+
+    def pysvnTrust(self: object, trustData: dict) -> tuple:
+        """Reject unknown server certificates like the non interactive command line client
+
+        Args:
+            trustData (dict): Certificate information
+
+        Returns:
+            tuple: Flag to trust, accepted failures and flag to save
+        """
+        return False, 0, False
+
+    def run(self: object, command: str, *args: str, recover=None, output: bool = True) -> bytes:
+        """Run svn command line client and return its output
+
+        Args:
+            command (str): SVN sub command
+            args (str): Additional arguments of sub command
+            recover (callable, optional): Called before a retry, e.g. to clean up a checkout. Defaults to None.
+            output (bool, optional): False to discard the output, e.g. progress lines. Defaults to True.
+
+        Returns:
+            bytes: Standard output of command
+        """
+        return self.cmd.run(self.commandArgs(command, *args), command, recover, output)
+
+    def update(self: object, path: str, revision: int, depth: str = None) -> None:
+        """Update checkout to revision, externals are left out if they become submodules
+
+        Args:
+            path (str): Full os path of checkout folder or a folder inside
+            revision (int): Revision to update to
+            depth (str, optional): New sticky depth like exclude, immediates or infinity, None to keep it. Defaults to None.
+        """
+        start: float = time.time()
+        if None != self.client:
+            options: dict = {"revision": self.pysvnRevision(revision), "ignore_externals": self.ignoreExternals}
+            if None != depth:
+                options["depth"] = getattr(pysvn.depth, depth)
+                options["depth_is_sticky"] = True
+            self.client.update(path, **options)
+        else:
+            args: list[str] = ["-r{}".format(revision), path]
+            if None != depth:
+                args = ["--set-depth", depth] + args
+            if self.ignoreExternals:
+                args.insert(0, "--ignore-externals")
+            self.run("update", *args, recover=lambda: self.run("cleanup", path), output=False)
+        self.measure("update" if None == depth else "depth", start)
@@ -0,0 +1,200 @@
+"""
+******************************************************************************
+Copyright 2020 ThirtySomething
+******************************************************************************
+This file is part of TRANSSVN-TO-GIT.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+******************************************************************************
+"""
+
+import json
+import logging
+import os
+import time
+
+from ts2g.ts2gos import TS2GOS
+
+
+class TS2GSYNC:
+    """
+    Class to mirror a folder into another one, only files changed since the last
+    sync are copied and paths missing in the source are purged
+    """
+
+    RACY_NS = 2000000000
+
+    def __init__(self: object, oshandler: TS2GOS, filename: str = None, hardlink: bool = False) -> None:
+        """Default constructor
+
+        Args:
+            oshandler (TS2GOS): Encapsulated file system operations
+            filename (str, optional): Full os path of file the index is kept in between runs, None for no index. Defaults to None.
+            hardlink (bool, optional): Link the files instead of copying them. Defaults to False.
+        """
+        self.oshandler: TS2GOS = oshandler
+        self.filename: str = filename
+        self.hardlink: bool = hardlink
+        self.index: dict[str, list[int]] = {}
+        self.copied: int = 0
+        self.linked: int = 0
+        self.purged: int = 0
+        self.unchanged: int = 0
+        self.racyLimit: int = 0
+        logging.debug("filename [%s], hardlink [%s]", "{}".format(self.filename), "{}".format(self.hardlink))
+        self.load()
+
+    def delete(self: object) -> None:
+        """Forget all entries and delete the file, e.g. after the destination was changed by other means"""
+        self.index.clear()
+        if None != self.filename and os.path.isfile(self.filename):
+            os.remove(self.filename)
+
+    def fileSync(self: object, entry: os.DirEntry, pathdst: str, exists: bool) -> int:
+        """Copy or link one file or symbolic link
+
+        Args:
+            entry (os.DirEntry): Source entry
+            pathdst (str): Full os path of destination
+            exists (bool): True if the destination exists and has to be replaced
+
+        Returns:
+            int: Number of bytes copied
+        """
+        if exists:
+            os.remove(pathdst)
+        if entry.is_symlink():
+            os.symlink(os.readlink(entry.path), pathdst)
+            self.copied += 1
+            return 0
+        if self.hardlink:
+            try:
+                os.link(entry.path, pathdst)
+                self.linked += 1
+                return 0
+            except OSError as ex:
+                logging.debug("Cannot link [%s] [%s]", "{}".format(entry.path), "{}".format(ex))
+        self.oshandler.workspaceFileCopy(entry.path, pathdst)
+        self.copied += 1
+        return entry.stat(follow_symlinks=False).st_size
+
+    def folderSync(self: object, foldersrc: str, folderdst: str, relpath: str, exclude: list[str], skip, index: dict[str, list[int]]) -> int:
+        """Mirror content of one folder, sub folders are mirrored recursively
+
+        Args:
+            foldersrc (str): Full os path of source folder
+            folderdst (str): Full os path of destination folder
+            relpath (str): Path of folder relative to the root of the sync
+            exclude (list[str]): Names of entries neither copied nor purged on any level
+            skip (callable): Called with the full os path of each source entry, True to leave it out
+            index (dict[str, list[int]]): Index of the current sync, filled with the entries found
+
+        Returns:
+            int: Number of bytes copied
+        """
+        size: int = 0
+        entries: dict[str, os.DirEntry] = {}
+        for entry in os.scandir(foldersrc):
+            if entry.name not in exclude and (None == skip or not skip(entry.path)):
+                entries[entry.name] = entry
+        present: set[str] = set()
+        for existing in os.scandir(folderdst):
+            if existing.name in exclude:
+                continue
+            entry: os.DirEntry = entries.get(existing.name)
+            if None == entry:
+                if None != skip and skip(os.path.join(foldersrc, existing.name)):
+                    continue
+            elif entry.is_dir(follow_symlinks=False) == existing.is_dir(follow_symlinks=False):
+                present.add(existing.name)
+                continue
+            self.oshandler.workspacePathDelete(existing.path)
+            self.purged += 1
+        for name, entry in entries.items():
+            path: str = relpath + name
+            pathdst: str = os.path.join(folderdst, name)
+            if entry.is_dir(follow_symlinks=False):
+                if name not in present:
+                    os.mkdir(pathdst)
+                size += self.folderSync(entry.path, pathdst, path + "/", exclude, skip, index)
+                continue
+            fileStat: os.stat_result = entry.stat(follow_symlinks=False)
+            key: list[int] = [fileStat.st_size, fileStat.st_mtime_ns, fileStat.st_ino]
+            if name in present and self.index.get(path) == key:
+                self.unchanged += 1
+            else:
+                size += self.fileSync(entry, pathdst, name in present)
+            # A further change within the resolution of the mtime would not be noticed
+            if fileStat.st_mtime_ns <= self.racyLimit:
+                index[path] = key
+        return size
+
+    def load(self: object) -> None:
+        """Read index written by a previous run, a broken file is ignored"""
+        if None == self.filename or not os.path.isfile(self.filename):
+            return
+        try:
+            with open(self.filename, "r", encoding="utf-8") as indexFile:
+                self.index = json.load(indexFile)
+            logging.info("Loaded [%s] entries of sync index [%s]", "{}".format(len(self.index)), "{}".format(self.filename))
+        except Exception as ex:
+            logging.warning("Ignore sync index [%s] [%s]", "{}".format(self.filename), "{}".format(ex))
+            self.index = {}
+
+    def logStatistics(self: object) -> None:
+        """Log number of files copied, linked, unchanged and purged"""
+        logging.info(f"Sync [{self.copied}] copied, [{self.linked}] linked, [{self.unchanged}] unchanged, [{self.purged}] purged, [{len(self.index)}] entries in index")
+        self.oshandler.logStatistics()
+
+    def save(self: object) -> None:
+        """Write index atomically"""
+        if None == self.filename:
+            return
+        try:
+            indexTemp: str = self.filename + ".tmp"
+            with open(indexTemp, "w", encoding="utf-8") as indexFile:
+                json.dump(self.index, indexFile)
+            os.replace(indexTemp, self.filename)
+        except Exception as ex:
+            logging.error("Exception [%s]", "{}".format(ex))
+
+    def sync(self: object, foldersrc: str, folderdst: str, exclude: list[str], skip=None) -> int:
+        """Mirror source folder into destination folder
+
+        Files whose size, mtime and inode in the source are the same as at the last
+        sync are not touched, the destination is only listed to find paths to purge.
+        So the destination must not be changed by other means than copying the
+        changed source paths, otherwise the index has to be deleted.
+
+        Args:
+            foldersrc (str): Full os path of source folder
+            folderdst (str): Full os path of destination folder
+            exclude (list[str]): Names of entries neither copied nor purged on any level, e.g. .svn and .git
+            skip (callable, optional): Called with the full os path of each source entry, True to leave it out. Defaults to None.
+
+        Returns:
+            int: Number of bytes copied
+        """
+        os.makedirs(folderdst, exist_ok=True)
+        self.racyLimit = time.time_ns() - TS2GSYNC.RACY_NS
+        index: dict[str, list[int]] = {}
+        size: int = self.folderSync(foldersrc, folderdst, "", exclude, skip, index)
+        self.index = index
+        self.save()
+        return size